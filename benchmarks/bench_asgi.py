@@ -0,0 +1,105 @@
+"""Сравнение синхронных (WSGI) и асинхронных (ASGI) страниц ленты.
+
+Медленное хранилище имитируется задержкой перед каждым SQL-запросом.
+Обоим режимам дано одинаковое число потоков: WSGI обслуживает запрос
+целиком в потоке воркера, асинхронные страницы занимают поток пула
+только на время запроса к базе и выполняют независимые запросы
+параллельно.
+
+    python benchmarks/bench_asgi.py --delay 0.005 --threads 8
+"""
+import argparse
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from utils import report, seeded_database, setup_django
+
+
+def slow_storage(delay):
+    from django.db.backends import utils
+
+    execute = utils.CursorWrapper.execute
+
+    def slow_execute(self, *args, **kwargs):
+        time.sleep(delay)
+        return execute(self, *args, **kwargs)
+
+    utils.CursorWrapper.execute = slow_execute
+
+
+def build_requests(paths, count):
+    from django.contrib.auth.models import AnonymousUser
+    from django.test import RequestFactory
+    from django.urls import resolve
+
+    factory = RequestFactory()
+    requests = []
+    for index in range(count):
+        path = paths[index % len(paths)]
+        request = factory.get(path)
+        request.user = AnonymousUser()
+        match = resolve(path)
+        requests.append((request, match.func.__name__, match.kwargs))
+    return requests
+
+
+def run_wsgi(requests, threads):
+    from posts import views
+
+    def handle(item):
+        request, name, kwargs = item
+        return getattr(views, name)(request, **kwargs)
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(handle, requests))
+
+
+def run_asgi(requests):
+    from posts import async_views
+
+    async def handle_all():
+        await asyncio.gather(*(
+            getattr(async_views, name)(request, **kwargs)
+            for request, name, kwargs in requests
+        ))
+
+    asyncio.run(handle_all())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--delay', type=float, default=0.005)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    setup_django(ASYNC_DB_WORKERS=str(args.threads))
+    from posts.models import Group, Post, User
+
+    with seeded_database(users=50, groups=5, posts=500, comments=2000,
+                         images=1):
+        post_id = Post.objects.values_list('pk', flat=True).first()
+        paths = [
+            '/',
+            f'/group/{Group.objects.first().slug}/',
+            f'/profile/{User.objects.first().username}/',
+            f'/posts/{post_id}/',
+        ]
+        requests = build_requests(paths, args.requests)
+        slow_storage(args.delay)
+        for name, func in (
+            ('WSGI, sync views', lambda: run_wsgi(requests, args.threads)),
+            ('ASGI, async views', lambda: run_asgi(requests)),
+        ):
+            timings = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                func()
+                timings.append(time.perf_counter() - start)
+            report(name, timings, count=len(requests))
+
+
+if __name__ == '__main__':
+    main()
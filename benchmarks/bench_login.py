@@ -0,0 +1,81 @@
+"""Пропускная способность входа для разных хешеров паролей.
+
+Для каждого алгоритма (если установлена его библиотека) измеряется
+authenticate() через ModelBackend в одном потоке — входов в секунду на
+ядро — и проверка паролей из --threads потоков через пул core.hashers
+размером --workers.
+
+    python benchmarks/bench_login.py --logins 50 --threads 8 --workers 2
+"""
+import argparse
+import os
+from concurrent.futures import ThreadPoolExecutor
+from importlib.util import find_spec
+
+from utils import report, setup_django, timeit
+
+HASHERS = (
+    ('argon2', 'argon2', 'core.hashers.Argon2PasswordHasher'),
+    ('bcrypt', 'bcrypt_sha256', 'core.hashers.BCryptSHA256PasswordHasher'),
+    ('pbkdf2', 'pbkdf2_sha256', 'core.hashers.PBKDF2PasswordHasher'),
+)
+PASSWORD = 'correct horse battery staple'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--logins', type=int, default=50)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+    from django.contrib.auth import authenticate
+    from django.contrib.auth.hashers import check_password
+    from django.contrib.auth.models import User
+    from django.db import connection
+    from django.test.utils import (override_settings, setup_test_environment,
+                                   teardown_test_environment)
+
+    from core import hashers
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    settings.PASSWORD_HASH_WORKERS = args.workers
+    try:
+        for module, algorithm, path in HASHERS:
+            if module != 'pbkdf2' and find_spec(module) is None:
+                print(f'{module}: библиотека не установлена')
+                continue
+            others = [other for _, _, other in HASHERS if other != path]
+            with override_settings(PASSWORD_HASHERS=[path] + others):
+                hashers._executor = None
+                user = User.objects.create_user(f'bench_{module}',
+                                                password=PASSWORD)
+                encoded = user.password
+
+                def sequential():
+                    for _ in range(args.logins):
+                        assert authenticate(username=user.username,
+                                            password=PASSWORD)
+
+                def concurrent():
+                    with ThreadPoolExecutor(args.threads) as pool:
+                        assert all(pool.map(
+                            lambda _: check_password(PASSWORD, encoded),
+                            range(args.logins)))
+
+                report(f'{module}: вход, 1 поток',
+                       timeit(sequential, args.repeat), count=args.logins)
+                report(f'{module}: {args.threads} потоков, пул '
+                       f'{args.workers}',
+                       timeit(concurrent, args.repeat), count=args.logins)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+if __name__ == '__main__':
+    main()
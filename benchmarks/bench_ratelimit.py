@@ -0,0 +1,53 @@
+"""Накладные расходы ограничителя запросов на один запрос.
+
+Пустое представление вызывается напрямую с декоратором ratelimit и без
+него. Лимит задан заведомо большим, чтобы каждый запрос проходил и
+измерялась только работа с корзинами в кеше.
+
+    python benchmarks/bench_ratelimit.py --requests 20000
+"""
+import argparse
+
+from utils import report, setup_django, timeit
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+    from django.contrib.auth.models import AnonymousUser, User
+    from django.http import HttpResponse
+    from django.test import RequestFactory
+
+    from core.ratelimit import ratelimit
+
+    settings.RATELIMITS = {'bench': (10 ** 9, 1)}
+
+    def view(request):
+        return HttpResponse()
+
+    factory = RequestFactory()
+    anonymous = factory.post('/')
+    anonymous.user = AnonymousUser()
+    member = factory.post('/')
+    member.user = User(pk=1, username='bench')
+    limited = ratelimit('bench')(view)
+
+    for name, func, request in (
+        ('без ограничителя', view, anonymous),
+        ('ratelimit, аноним (IP)', limited, anonymous),
+        ('ratelimit, пользователь (IP + id)', limited, member),
+    ):
+        def run():
+            for _ in range(args.requests):
+                func(request)
+
+        report(name, timeit(run, args.repeat), count=args.requests)
+
+
+if __name__ == '__main__':
+    main()
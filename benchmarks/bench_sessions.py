@@ -0,0 +1,59 @@
+"""Пропускная способность follow_index для вошедшего пользователя при
+разных хранилищах сессий.
+
+Запросы идут через полный стек middleware (тестовый клиент). Задержка
+--delay перед каждым SQL-запросом имитирует занятую записью SQLite.
+
+    python benchmarks/bench_sessions.py --requests 200 --delay 0.002
+"""
+import argparse
+
+from bench_asgi import slow_storage
+from utils import report, seeded_database, setup_django, timeit
+
+ENGINES = ('db', 'cached_db', 'signed_cookies')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--delay', type=float, default=0)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+    from django.db import connection
+    from django.db.models import Count
+    from django.test import Client
+    from django.test.utils import CaptureQueriesContext
+
+    with seeded_database(users=200, groups=10, posts=5000, comments=0,
+                         images=1):
+        from posts.models import User
+
+        user = User.objects.annotate(
+            follows=Count('follower')).order_by('-follows').first()
+        if args.delay:
+            slow_storage(args.delay)
+        for engine in ENGINES:
+            settings.SESSION_ENGINE = (
+                f'django.contrib.sessions.backends.{engine}')
+            client = Client()
+            client.force_login(user)
+            client.get('/follow/')
+            with CaptureQueriesContext(connection) as queries:
+                client.get('/follow/')
+            sessions = sum('django_session' in query['sql']
+                           for query in queries.captured_queries)
+
+            def run():
+                for _ in range(args.requests):
+                    client.get('/follow/')
+
+            report(f'{engine} ({sessions} запр. к сессиям)',
+                   timeit(run, args.repeat), count=args.requests)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+"""Время запуска воркера и самые дорогие импорты.
+
+Каждый замер — отдельный процесс `python -X importtime`, который, как
+воркер перед первым запросом, настраивает Django (get_wsgi_application)
+и загружает схему URL. Печатается время запуска, пакеты с наибольшим
+собственным временем импорта и самые дорогие импорты верхнего уровня
+по последнему замеру. С --output отчёт пишется в файл; отчёт для
+настроек по умолчанию лежит в benchmarks/reports/startup.txt.
+
+    python benchmarks/bench_startup.py --repeat 5 --top 20
+    DEBUG=True python benchmarks/bench_startup.py
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+from collections import Counter
+from contextlib import redirect_stdout
+from io import StringIO
+from time import perf_counter
+
+from utils import PROJECT_DIR, report
+
+BOOT = '''
+import os
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'traveltube.settings')
+from django.core.wsgi import get_wsgi_application
+get_wsgi_application()
+from django.urls import get_resolver
+get_resolver().url_patterns
+'''
+IMPORT_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)$')
+
+
+def boot():
+    """Запускает воркер, возвращает время и вывод -X importtime."""
+    start = perf_counter()
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', BOOT],
+        cwd=PROJECT_DIR, stderr=subprocess.PIPE, text=True, check=True)
+    return perf_counter() - start, result.stderr
+
+
+def parse_importtime(output):
+    """Строки (модуль, вложенность, своё время, общее время) в мкс."""
+    imports = []
+    for line in output.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match:
+            own, total, indent, name = match.groups()
+            imports.append((name, len(indent) // 2, int(own), int(total)))
+    return imports
+
+
+def print_imports(imports, top):
+    packages = Counter()
+    for name, _, own, _ in imports:
+        packages[name.split('.')[0]] += own
+    print(f'Всего импортов: {len(imports)}, '
+          f'{sum(packages.values()) / 1000:.1f} ms')
+    print('\nПакеты по собственному времени импорта:')
+    for package, own in packages.most_common(top):
+        print(f'  {own / 1000:9.1f} ms  {package}')
+    print('\nИмпорты верхнего уровня по общему времени:')
+    roots = sorted((total, name) for name, depth, _, total in imports
+                   if depth == 0)
+    for total, name in reversed(roots[-top:]):
+        print(f'  {total / 1000:9.1f} ms  {name}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--top', type=int, default=20)
+    parser.add_argument('--output', help='Файл для отчёта.')
+    args = parser.parse_args()
+
+    out = StringIO()
+    with redirect_stdout(out):
+        timings = []
+        for _ in range(args.repeat):
+            elapsed, output = boot()
+            timings.append(elapsed)
+        flags = ' '.join(f'{name}={os.environ[name]}'
+                         for name in ('DEBUG', 'LIVE_UPDATES')
+                         if name in os.environ)
+        print(f'Python {sys.version.split()[0]} {flags}'.rstrip())
+        report('запуск воркера', timings)
+        print()
+        print_imports(parse_importtime(output), args.top)
+    print(out.getvalue(), end='')
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            file.write(out.getvalue())
+
+
+if __name__ == '__main__':
+    main()
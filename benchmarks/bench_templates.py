@@ -0,0 +1,137 @@
+"""Время рендеринга страниц ленты при разных настройках шаблонов.
+
+Страницы рендерятся с тёплым кешем карточек, чтобы измерить работу самого
+шаблонизатора (загрузка, include, теги). Отдельно сравниваются карточки
+постов с холодным кешем в движках Django и Jinja2.
+
+    python benchmarks/bench_templates.py --sizes 5 50 500
+"""
+import argparse
+
+from utils import report, seeded_database, setup_django, timeit
+
+FILESYSTEM_LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+LOADERS = {
+    'без кеша': FILESYSTEM_LOADERS,
+    'cached': [('django.template.loaders.cached.Loader',
+                FILESYSTEM_LOADERS)],
+    'cached + inline': [('django.template.loaders.cached.Loader', [
+        ('core.template_loaders.Loader', FILESYSTEM_LOADERS),
+    ])],
+}
+
+
+def make_engine(name, loaders):
+    from django.conf import settings
+    from django.template.backends.django import DjangoTemplates
+
+    options = settings.TEMPLATES[0]
+    return DjangoTemplates({
+        'NAME': name,
+        'DIRS': options['DIRS'],
+        'APP_DIRS': False,
+        'OPTIONS': {
+            'context_processors': options['OPTIONS']['context_processors'],
+            'loaders': loaders,
+        },
+    })
+
+
+def build_pages(size):
+    """Контексты страниц с size постами (или комментариями)."""
+    from django.core.paginator import Paginator
+    from posts.forms import CommentForm
+    from posts.models import Comment, Group, Post
+
+    posts = Post.objects.select_related('author', 'group').order_by('-pk')
+    page_obj = Paginator(posts, size).get_page(1)
+    page_obj.object_list = list(page_obj.object_list)
+    post = page_obj.object_list[0]
+    comments = list(Comment.objects.select_related('author')[:size])
+    return {
+        'posts/index.html': {'page_obj': page_obj, 'index': True},
+        'posts/follow.html': {'page_obj': page_obj, 'follow': True},
+        'posts/popular.html': {'page_obj': page_obj},
+        'posts/group_list.html': {'page_obj': page_obj,
+                                  'group': Group.objects.first()},
+        'posts/profile.html': {'page_obj': page_obj, 'author': post.author,
+                               'posts_count': size, 'following': False},
+        'posts/post_detail.html': {
+            'post': post, 'form': CommentForm(), 'comments': comments,
+            'post_images': [], 'author_posts_count': size,
+        },
+    }
+
+
+def bench_pages(sizes, repeat, user):
+    from django.core.cache import cache
+    from django.core.cache.utils import make_template_fragment_key
+    from django.test import RequestFactory
+
+    request = RequestFactory().get('/')
+    request.user = user
+    for size in sizes:
+        pages = build_pages(size)
+        index_key = make_template_fragment_key(
+            'index_page', [pages['posts/index.html']['page_obj']])
+        for mode, loaders in LOADERS.items():
+            engine = make_engine(mode, loaders)
+            for name, context in pages.items():
+                def render():
+                    cache.delete(index_key)
+                    engine.get_template(name).render(context, request)
+
+                render()
+                report(f'{name} x{size} [{mode}]',
+                       timeit(render, repeat))
+
+
+def bench_cards(sizes, repeat, engines):
+    from django.conf import settings
+    from django.core.cache import cache
+    from posts.cards import render_cards
+    from posts.models import Post
+
+    for size in sizes:
+        posts = list(Post.objects.select_related('author', 'group')
+                     .order_by('-pk')[:size])
+        for engine in engines:
+            settings.FEED_TEMPLATE_ENGINE = engine
+            for name in ('includes/template_index.html',
+                         'includes/common.html'):
+                def render():
+                    cache.clear()
+                    render_cards(posts, name)
+
+                render()
+                report(f'{name} x{size} [{engine}]',
+                       timeit(render, repeat), count=size)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+',
+                        default=[5, 50, 500])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    setup_django(FEED_TEMPLATE_ENGINE='jinja2')
+    from django.conf import settings
+    from django.template import engines
+
+    engine_names = ['django'] + [
+        engine.name for engine in engines.all() if engine.name == 'jinja2']
+    with seeded_database(users=50, groups=5, posts=max(args.sizes) + 100,
+                         comments=max(args.sizes) * 2, images=1):
+        from posts.models import User
+
+        bench_pages(args.sizes, args.repeat, User.objects.first())
+        bench_cards(args.sizes, args.repeat, engine_names)
+        settings.FEED_TEMPLATE_ENGINE = 'django'
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+import os
+import statistics
+import sys
+import tempfile
+from contextlib import contextmanager
+from io import StringIO
+from time import perf_counter
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROJECT_DIR = os.path.join(ROOT_DIR, 'traveltube')
+
+
+def setup_django(**environ):
+    """Настраивает Django так же, как pytest.ini для тестов."""
+    sys.path.insert(0, PROJECT_DIR)
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'traveltube.settings')
+    for key, value in environ.items():
+        os.environ.setdefault(key, value)
+    import django
+    django.setup()
+
+
+@contextmanager
+def seeded_database(**seed_options):
+    """Временная тестовая база и MEDIA_ROOT, заполненные seed_data."""
+    from django.conf import settings
+    from django.core.management import call_command
+    from django.db import connection
+    from django.test.utils import (setup_test_environment,
+                                   teardown_test_environment)
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    old_media = settings.MEDIA_ROOT
+    with tempfile.TemporaryDirectory() as media_root:
+        settings.MEDIA_ROOT = media_root
+        call_command('seed_data', stdout=StringIO(), workers=1,
+                     **seed_options)
+        try:
+            yield
+        finally:
+            settings.MEDIA_ROOT = old_media
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+
+def timeit(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = perf_counter()
+        func()
+        timings.append(perf_counter() - start)
+    return timings
+
+
+def report(name, timings, count=1):
+    """Печатает строку с медианой и разбросом замеров в миллисекундах."""
+    median = statistics.median(timings)
+    print(
+        f'{name:<40} median {median * 1000:9.3f} ms  '
+        f'min {min(timings) * 1000:9.3f} ms  '
+        f'{count / median:10.1f} ops/s'
+    )
@@ -0,0 +1,58 @@
+"""Опция `--timings=путь` из addopts в pytest.ini.
+
+Корневой conftest загружается при любом пути к тестам (и для
+traveltube/*/tests), поэтому опция регистрируется здесь: время
+подготовки, выполнения и очистки каждого теста пишется в CSV, самые
+медленные тесты — первыми.
+"""
+import csv
+import os
+
+
+class TimingReport:
+    PHASES = ('setup', 'call', 'teardown')
+
+    def __init__(self, path):
+        self.path = path
+        self.tests = {}
+
+    def pytest_runtest_logreport(self, report):
+        # У отчётов от воркеров xdist есть node — их контроллер
+        node = getattr(report, 'node', None)
+        test = self.tests.setdefault(report.nodeid, {
+            'worker': node.gateway.id if node else 'master',
+            'outcome': 'passed',
+        })
+        test[report.when] = report.duration
+        if report.outcome != 'passed':
+            test['outcome'] = report.outcome
+
+    def pytest_sessionfinish(self):
+        rows = []
+        for nodeid, test in self.tests.items():
+            durations = [test.get(phase, 0) for phase in self.PHASES]
+            rows.append([nodeid, test['worker'], test['outcome'],
+                         *durations, sum(durations)])
+        rows.sort(key=lambda row: row[-1], reverse=True)
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, 'w', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(['test', 'worker', 'outcome', *self.PHASES,
+                             'total'])
+            for row in rows:
+                writer.writerow(row[:3] + [f'{value:.4f}'
+                                           for value in row[3:]])
+
+
+def pytest_addoption(parser):
+    parser.addoption('--timings', metavar='path',
+                     help='CSV с временем каждого теста')
+
+
+def pytest_configure(config):
+    path = config.getoption('timings')
+    # Отчёт пишет управляющий процесс: ему приходят отчёты всех воркеров
+    if path and not hasattr(config, 'workerinput'):
+        config.pluginmanager.register(TimingReport(path), 'timing-report')
@@ -1,13 +1,29 @@
 import tempfile
 
 import pytest
+from django.core.cache import cache
 from mixer.backend.django import mixer as _mixer
 from posts.models import Group, Post
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    # Кеш общий для всех тестов: счётчики лимитов запросов и карточки
+    # постов не должны переходить из теста в тест
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def enforce_query_budget(settings):
+    # Превышение бюджета запросов представлением роняет тест
+    settings.QUERY_BUDGET_ACTION = 'raise'
+
+
 @pytest.fixture()
-def mock_media(settings):
-    with tempfile.TemporaryDirectory() as temp_directory:
+def mock_media(settings, worker_dir):
+    with tempfile.TemporaryDirectory(dir=worker_dir) as temp_directory:
         settings.MEDIA_ROOT = temp_directory
         yield temp_directory
 
@@ -0,0 +1,71 @@
+"""Параллельный запуск тестов (pytest-xdist, `-n auto`).
+
+Схема создаётся один раз в файле-шаблоне (bootstrap_schema: из снимка
+схемы или миграциями), а каждый процесс копирует его в свою базу.
+Шаблон называется по отпечатку миграций, поэтому пересобирается только
+после их изменения. Базы и MEDIA_ROOT процессов
+лежат в tmpfs (/dev/shm), если он есть. Отчёт о времени тестов
+(`--timings`) — в корневом conftest.py.
+"""
+import os
+import shutil
+import tempfile
+
+import pytest
+from django.core.management import call_command
+from django.test.utils import override_settings
+
+from core.schema import database_file, migrations_digest
+
+SHARED_MEMORY = '/dev/shm'
+
+
+def scratch_root():
+    if os.path.isdir(SHARED_MEMORY):
+        base = SHARED_MEMORY
+    else:
+        base = tempfile.gettempdir()
+    path = os.path.join(base, 'traveltube-tests')
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def build_template(path):
+    """Создаёт шаблон, если его ещё нет.
+
+    Процессы, одновременно не нашедшие шаблон, соберут его каждый в свой
+    файл, а os.replace атомарно оставит один из одинаковых результатов.
+    """
+    if os.path.exists(path):
+        return
+    partial = f'{path}.{os.getpid()}'
+    with database_file(partial):
+        call_command('bootstrap_schema', verbosity=0)
+    os.replace(partial, path)
+
+
+@pytest.fixture(scope='session')
+def worker_dir(worker_id):
+    path = tempfile.mkdtemp(prefix=f'{worker_id}-', dir=scratch_root())
+    yield path
+    shutil.rmtree(path, ignore_errors=True)
+
+
+@pytest.fixture(scope='session')
+def django_db_setup(django_test_environment, django_db_blocker, worker_dir):
+    template = os.path.join(scratch_root(),
+                            f'template-{migrations_digest()}.sqlite3')
+    database = os.path.join(worker_dir, 'db.sqlite3')
+    with django_db_blocker.unblock():
+        build_template(template)
+    shutil.copyfile(template, database)
+    with database_file(database):
+        yield
+
+
+@pytest.fixture(scope='session', autouse=True)
+def worker_media_root(worker_dir):
+    media_root = os.path.join(worker_dir, 'media')
+    os.makedirs(media_root)
+    with override_settings(MEDIA_ROOT=media_root):
+        yield media_root
@@ -0,0 +1,66 @@
+import pytest
+from core.paginator import EstimatedCountPaginator, estimated_count
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from posts.models import Comment, Follow, Post
+
+
+@pytest.fixture
+def admin_client(client, django_user_model):
+    admin = django_user_model.objects.create_superuser(
+        'admin', 'admin@example.com', 'password')
+    client.force_login(admin)
+    return client
+
+
+def changelist_queries(client, url):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+    assert response.status_code == 200
+    return len(queries.captured_queries)
+
+
+@pytest.mark.django_db
+def test_changelists_do_not_query_per_row(admin_client, user, another_user,
+                                          mixer, mock_media):
+    for url, model, extra in (
+        ('/admin/posts/post/', Post, {}),
+        ('/admin/posts/comment/', Comment, {}),
+        ('/admin/posts/follow/', Follow, {'user': user}),
+    ):
+        mixer.cycle(2).blend(model, **extra)
+        changelist_queries(admin_client, url)
+        few = changelist_queries(admin_client, url)
+        if model is Follow:
+            mixer.cycle(8).blend(Follow, user=another_user)
+        else:
+            mixer.cycle(8).blend(model)
+        assert changelist_queries(admin_client, url) == few, url
+
+
+@pytest.mark.django_db
+def test_change_forms_use_raw_id_widgets(admin_client, user, another_user,
+                                         mixer):
+    comment = mixer.blend(Comment)
+    follow = mixer.blend(Follow, user=user, author=another_user)
+    for url in (f'/admin/posts/comment/{comment.pk}/change/',
+                f'/admin/posts/follow/{follow.pk}/change/'):
+        content = admin_client.get(url).content.decode()
+        assert 'vForeignKeyRawIdAdminField' in content
+        assert f'<option value="{user.pk}"' not in content
+
+
+@pytest.mark.django_db
+def test_paginator_uses_table_statistics(user, mixer, monkeypatch):
+    mixer.cycle(3).blend(Post, author=user)
+    assert estimated_count(Post) is None
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+    assert estimated_count(Post) == 3
+
+    monkeypatch.setattr(EstimatedCountPaginator, 'ESTIMATE_THRESHOLD', 2)
+    with CaptureQueriesContext(connection) as queries:
+        assert EstimatedCountPaginator(Post.all_objects.all(), 10).count == 3
+    assert 'COUNT' not in queries.captured_queries[-1]['sql']
+    assert EstimatedCountPaginator(
+        Post.objects.filter(pk=0), 10).count == 0
@@ -0,0 +1,89 @@
+import asyncio
+import importlib
+from threading import current_thread
+
+import pytest
+from asgiref.testing import ApplicationCommunicator
+from core import executor
+from django.urls import clear_url_caches, resolve
+from posts.models import Comment
+
+
+def reload_urls():
+    import posts.urls
+    import traveltube.urls
+    importlib.reload(posts.urls)
+    importlib.reload(traveltube.urls)
+    clear_url_caches()
+
+
+@pytest.fixture
+def asgi_app(settings):
+    settings.ASYNC_VIEWS = True
+    reload_urls()
+    from traveltube.asgi import application
+    yield application
+    settings.ASYNC_VIEWS = False
+    reload_urls()
+
+
+def asgi_get(app, path):
+    async def request():
+        communicator = ApplicationCommunicator(app, {
+            'type': 'http',
+            'method': 'GET',
+            'path': path,
+            'query_string': b'',
+            'headers': [(b'host', b'testserver')],
+        })
+        await communicator.send_input({'type': 'http.request'})
+        start = await communicator.receive_output(5)
+        body = b''
+        while True:
+            message = await communicator.receive_output(5)
+            body += message.get('body', b'')
+            if not message.get('more_body'):
+                break
+        return start['status'], body.decode()
+
+    return asyncio.run(request())
+
+
+# Асинхронные страницы читают базу из пула потоков, которым не видна
+# транзакция обычного django_db
+@pytest.mark.django_db(transaction=True)
+def test_async_views_through_asgi_app(asgi_app, post, group):
+    from posts import async_views
+    assert resolve('/').func is async_views.index
+
+    post.group = group
+    post.save()
+    Comment.objects.create(post=post, author=post.author, text='Ответ')
+    status, body = asgi_get(asgi_app, '/')
+    assert status == 200
+    assert post.text in body
+    status, body = asgi_get(asgi_app, f'/group/{group.slug}/')
+    assert status == 200
+    assert post.text in body
+    status, body = asgi_get(asgi_app, f'/profile/{post.author.username}/')
+    assert status == 200
+    assert post.text in body
+    status, body = asgi_get(asgi_app, f'/posts/{post.pk}/')
+    assert status == 200
+    assert 'Ответ' in body
+    status, _ = asgi_get(asgi_app, '/posts/0/')
+    assert status == 404
+
+
+def test_live_prefix_goes_to_sse_app(asgi_app):
+    status, body = asgi_get(asgi_app, '/live/unknown/')
+    assert (status, body) == (404, 'Not found')
+
+
+def test_pool_threads_close_old_connections(monkeypatch):
+    calls = []
+    monkeypatch.setattr(executor, 'close_old_connections',
+                        lambda: calls.append(current_thread().name))
+    name = asyncio.run(executor.run_sync(lambda: current_thread().name))
+    assert name.startswith('async-db')
+    assert calls == [name, name]
@@ -0,0 +1,71 @@
+import gzip
+
+import pytest
+from core import compression
+from core.compression import CompressionMiddleware
+from django.http import HttpResponse, StreamingHttpResponse
+from posts.models import Post
+
+
+@pytest.mark.django_db
+def test_pages_are_gzipped(client):
+    response = client.get('/', HTTP_ACCEPT_ENCODING='gzip, deflate')
+    assert response['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response['Vary']
+    assert b'</html>' in gzip.decompress(response.content)
+
+    response = client.get('/', HTTP_ACCEPT_ENCODING='gzip;q=0')
+    assert not response.has_header('Content-Encoding')
+
+
+def test_brotli_is_preferred(rf):
+    brotli = pytest.importorskip('brotli')
+    body = 'Горы и море. ' * 100
+    middleware = CompressionMiddleware(lambda request: HttpResponse(body))
+    response = middleware(rf.get('/', HTTP_ACCEPT_ENCODING='gzip, br'))
+    assert response['Content-Encoding'] == 'br'
+    assert brotli.decompress(response.content).decode() == body
+
+
+def test_streaming_and_skipped_types(rf):
+    chunks = [b'<p>chunk</p>' * 50] * 3
+    middleware = CompressionMiddleware(
+        lambda request: StreamingHttpResponse(iter(chunks)))
+    response = middleware(rf.get('/', HTTP_ACCEPT_ENCODING='gzip'))
+    assert response['Content-Encoding'] == 'gzip'
+    parts = list(response.streaming_content)
+    assert len(parts) == 4
+    assert gzip.decompress(b''.join(parts)) == b''.join(chunks)
+
+    middleware = CompressionMiddleware(
+        lambda request: HttpResponse(b'x' * 1000, content_type='image/jpeg'))
+    response = middleware(rf.get('/', HTTP_ACCEPT_ENCODING='gzip'))
+    assert not response.has_header('Content-Encoding')
+
+
+@pytest.mark.django_db
+def test_fragment_cache_keeps_compressed_body(client, user, mixer,
+                                              mock_media, monkeypatch):
+    mixer.cycle(3).blend(Post, author=user)
+    calls = []
+    compress = compression.compress
+    monkeypatch.setattr(compression, 'compress',
+                        lambda *args: calls.append(args) or compress(*args))
+    bodies = [
+        client.get('/fragment/', HTTP_ACCEPT_ENCODING='gzip').content
+        for _ in range(2)
+    ]
+    assert len(calls) == 1
+    assert bodies[0] == bodies[1]
+    assert b'post-container' in gzip.decompress(bodies[1])
+
+
+@pytest.mark.django_db
+def test_pages_with_csrf_token_are_not_compressed(client, user):
+    response = client.get('/auth/login/', HTTP_ACCEPT_ENCODING='gzip')
+    assert b'csrfmiddlewaretoken' in response.content
+    assert not response.has_header('Content-Encoding')
+
+    client.force_login(user)
+    response = client.get('/', HTTP_ACCEPT_ENCODING='gzip')
+    assert response['Content-Encoding'] == 'gzip'
@@ -0,0 +1,69 @@
+from io import StringIO
+
+import pytest
+from core.models import Job
+from django.core import mail
+from django.core.management import call_command
+from users.models import Contact
+
+
+def run_jobs():
+    call_command('run_jobs', once=True, stdout=StringIO())
+
+
+@pytest.fixture
+def admin_client(client, django_user_model):
+    admin = django_user_model.objects.create_superuser(
+        'admin', 'admin@example.com', 'password')
+    client.force_login(admin)
+    return client
+
+
+@pytest.mark.django_db
+def test_contact_form_enqueues_mail(client, settings):
+    settings.MANAGERS = [('Поддержка', 'support@example.com')]
+    response = client.post('/auth/contact/', {
+        'name': 'Иван', 'email': 'ivan@example.com',
+        'subject': 'Вопрос', 'body': 'Как добавить группу?',
+    })
+    assert response.status_code == 302
+    assert response.url == '/auth/contact/done/'
+    contact = Contact.objects.get()
+    assert not contact.is_answered and contact.created
+    assert Job.objects.get().name == 'contact_received'
+    assert not mail.outbox
+
+    run_jobs()
+    assert [message.to for message in mail.outbox] == [
+        ['support@example.com']]
+    assert 'ivan@example.com' in mail.outbox[0].body
+
+
+@pytest.mark.django_db
+def test_inbox_shows_unanswered_by_default(admin_client, mixer):
+    waiting = mixer.blend(Contact, is_answered=False, subject='Ждёт')
+    mixer.blend(Contact, is_answered=True, subject='Отвечено')
+    response = admin_client.get('/admin/users/contact/')
+    assert list(response.context['cl'].result_list) == [waiting]
+    response = admin_client.get('/admin/users/contact/', {'status': 'all'})
+    assert len(response.context['cl'].result_list) == 2
+
+
+@pytest.mark.django_db
+def test_batch_reply(admin_client, mixer, settings):
+    settings.JOB_CHUNK_SIZE = 2
+    contacts = mixer.cycle(3).blend(Contact, is_answered=False)
+    url = '/admin/users/contact/'
+    selected = [contact.pk for contact in contacts]
+
+    admin_client.post(url, {'action': 'answer', 'message': ' ',
+                            '_selected_action': selected})
+    assert not Job.objects.exists()
+
+    admin_client.post(url, {'action': 'answer', 'message': 'Спасибо!',
+                            '_selected_action': selected})
+    run_jobs()
+    assert Job.objects.get().status == Job.DONE
+    assert len(mail.outbox) == 3
+    assert {message.body for message in mail.outbox} == {'Спасибо!'}
+    assert not Contact.objects.filter(is_answered=False).exists()
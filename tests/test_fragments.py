@@ -0,0 +1,98 @@
+import pytest
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from posts import purge
+from posts.models import Follow, Post
+
+
+@pytest.fixture
+def many_posts(user, mixer, mock_media):
+    posts = mixer.cycle(7).blend(Post, author=user)
+    # Одинаковые даты: порядок внутри них задаёт id
+    Post.objects.filter(pk__in=[post.pk for post in posts[:4]]).update(
+        pub_date=timezone.now())
+    cache.clear()
+    yield posts
+    cache.clear()
+
+
+def walk(client, url):
+    seen, cursor = [], ''
+    while True:
+        response = client.get(url, {'per_page': 3, 'cursor': cursor})
+        assert response.status_code == 200
+        seen.extend(post.pk for post in response.context['posts'])
+        cursor = response.get('X-Next-Cursor')
+        if not cursor:
+            return seen
+
+
+@pytest.mark.django_db
+def test_fragments_walk_whole_feed(client, user, many_posts):
+    expected = list(Post.objects.order_by('-pub_date', '-pk')
+                    .values_list('pk', flat=True))
+    assert walk(client, '/fragment/') == expected
+    assert walk(client, f'/profile/{user.username}/fragment/') == expected
+
+
+@pytest.mark.django_db
+def test_fragment_has_only_cards(client, many_posts):
+    response = client.get('/fragment/', {'per_page': 2})
+    content = response.content.decode()
+    assert '<html' not in content and '<header' not in content
+    assert content.count('post-container') == 2
+    assert response['Link'].endswith('; rel="next"')
+    assert 'public' in response['Cache-Control']
+
+    assert client.get('/fragment/', {'cursor': 'oops'}).status_code == 400
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('cursor', [
+    '99999999999999999999_1',
+    '-99999999999999999999_1',
+    '999999999999999999_1',
+    '1_99999999999999999999',
+    '1_-1',
+])
+def test_out_of_range_cursor_is_rejected(client, cursor):
+    response = client.get('/fragment/', {'cursor': cursor})
+    assert response.status_code == 400
+
+
+@pytest.mark.django_db
+def test_follow_fragment_is_private(user_client, user, another_user, mixer,
+                                    mock_media):
+    mixer.blend(Post, author=another_user)
+    Follow.objects.create(user=user, author=another_user)
+    response = user_client.get('/follow/fragment/')
+    assert len(response.context['posts']) == 1
+    assert 'private' in response['Cache-Control']
+
+
+@pytest.mark.django_db
+def test_page_links_to_fragments(client, user, many_posts):
+    response = client.get(f'/profile/{user.username}/')
+    content = response.content.decode()
+    assert f'data-fragment-url="/profile/{user.username}/fragment/"' in content
+    last = response.context['page_obj'][-1]
+    assert f'_{last.pk}"' in content
+
+
+@pytest.mark.django_db
+def test_fragment_cache_drops_hidden_posts(client, user, another_user,
+                                           mixer, mock_media):
+    kept = mixer.blend(Post, author=user)
+    deleted = mixer.blend(Post, author=another_user)
+    response = client.get('/fragment/')
+    assert response['Cache-Control'] == (
+        f'public, max-age={settings.FEED_FRAGMENT_MAX_AGE}')
+    assert client.get('/fragment/').context is None
+
+    deleted.is_deleted = True
+    deleted.save()
+    assert client.get('/fragment/').context['posts'] == [kept]
+
+    purge.soft_delete_user(user)
+    assert client.get('/fragment/').context['posts'] == []
@@ -0,0 +1,54 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from posts.models import Group, GroupAuthorStats, GroupStats, Post
+
+
+@pytest.mark.django_db
+def test_group_stats_follow_posts(user, another_user, mixer):
+    group, other = mixer.cycle(2).blend(Group)
+    first = mixer.blend(Post, author=user, group=group)
+    mixer.cycle(2).blend(Post, author=another_user, group=group)
+
+    stats = GroupStats.objects.get(group=group)
+    assert stats.post_count == 3
+    assert stats.top_author_list() == [another_user.username, user.username]
+
+    first.group = other
+    first.save()
+    stats.refresh_from_db()
+    assert stats.post_count == 2
+    assert stats.top_author_list() == [another_user.username]
+    assert GroupStats.objects.get(group=other).post_count == 1
+
+    first.delete()
+    assert GroupStats.objects.get(group=other).post_count == 0
+    assert GroupStats.objects.get(group=other).last_post_date is None
+
+
+@pytest.mark.django_db
+def test_rebuild_group_stats_matches_signals(user, another_user, mixer):
+    group = mixer.blend(Group)
+    mixer.cycle(2).blend(Post, author=user, group=group)
+    mixer.blend(Post, author=another_user, group=group)
+    expected = GroupStats.objects.values().get(group=group)
+
+    GroupStats.objects.all().delete()
+    GroupAuthorStats.objects.all().delete()
+    call_command('rebuild_group_stats', stdout=StringIO())
+
+    assert GroupStats.objects.values().get(group=group) == expected
+    assert GroupAuthorStats.objects.filter(group=group).count() == 2
+
+
+@pytest.mark.django_db
+def test_group_index_orders_by_post_count(client, user, mixer):
+    empty, small, big = mixer.cycle(3).blend(Group)
+    mixer.blend(Post, author=user, group=small)
+    mixer.cycle(2).blend(Post, author=user, group=big)
+
+    response = client.get('/groups/')
+    assert response.status_code == 200
+    assert list(response.context['page_obj']) == [big, small, empty]
+    assert user.username in response.content.decode()
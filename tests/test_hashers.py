@@ -0,0 +1,89 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from core import hashers
+from django.contrib.auth import hashers as django_hashers
+from django.contrib.auth.hashers import check_password, make_password
+
+ARGON2 = 'core.hashers.Argon2PasswordHasher'
+BCRYPT = 'core.hashers.BCryptSHA256PasswordHasher'
+PBKDF2 = 'core.hashers.PBKDF2PasswordHasher'
+
+
+@pytest.fixture
+def pool(monkeypatch, settings):
+    """Свежий пул хеширования на PASSWORD_HASH_WORKERS потоков."""
+    monkeypatch.setattr(hashers, '_executor', None)
+    yield settings
+    if hashers._executor is not None:
+        hashers._executor.shutdown()
+
+
+def login(client, user, password):
+    return client.post('/auth/login/', {'username': user.username,
+                                        'password': password})
+
+
+@pytest.mark.django_db
+def test_pbkdf2_hash_is_upgraded_on_login(client, django_user_model, pool):
+    pool.PASSWORD_HASHERS = [PBKDF2]
+    pool.PASSWORD_PBKDF2_ITERATIONS = 1000
+    user = django_user_model.objects.create_user('old', password='pass-1234')
+    assert user.password.startswith('pbkdf2_sha256$1000$')
+
+    pool.PASSWORD_PBKDF2_ITERATIONS = 2000
+    assert login(client, user, 'pass-1234').status_code == 302
+    user.refresh_from_db()
+    assert user.password.startswith('pbkdf2_sha256$2000$')
+
+
+@pytest.mark.django_db
+def test_pbkdf2_hash_is_upgraded_to_argon2(client, django_user_model, pool):
+    pytest.importorskip('argon2')
+    pool.PASSWORD_HASHERS = [PBKDF2, ARGON2]
+    pool.PASSWORD_PBKDF2_ITERATIONS = 1000
+    user = django_user_model.objects.create_user('old', password='pass-1234')
+
+    pool.PASSWORD_HASHERS = [ARGON2, PBKDF2]
+    assert login(client, user, 'pass-1234').status_code == 302
+    user.refresh_from_db()
+    assert user.password.startswith('argon2$')
+    assert '$m=19456,t=2,p=1$' in user.password
+
+
+def test_hashing_is_bounded(pool, monkeypatch):
+    pool.PASSWORD_HASHERS = [PBKDF2]
+    pool.PASSWORD_PBKDF2_ITERATIONS = 1000
+    pool.PASSWORD_HASH_WORKERS = 2
+    encoded = make_password('pass-1234')
+    lock = threading.Lock()
+    state = {'running': 0, 'peak': 0, 'threads': set()}
+    pbkdf2 = django_hashers.pbkdf2
+
+    def tracked(*args, **kwargs):
+        with lock:
+            state['running'] += 1
+            state['peak'] = max(state['peak'], state['running'])
+            state['threads'].add(threading.current_thread().name)
+        try:
+            return pbkdf2(*args, **kwargs)
+        finally:
+            with lock:
+                state['running'] -= 1
+
+    monkeypatch.setattr(django_hashers, 'pbkdf2', tracked)
+    with ThreadPoolExecutor(6) as requests:
+        assert all(requests.map(
+            lambda _: check_password('pass-1234', encoded), range(24)))
+    assert state['peak'] <= 2
+    assert all(name.startswith('hasher') for name in state['threads'])
+
+
+def test_nested_bcrypt_call_does_not_deadlock(pool):
+    pytest.importorskip('bcrypt')
+    pool.PASSWORD_HASHERS = [BCRYPT]
+    pool.PASSWORD_BCRYPT_ROUNDS = 4
+    pool.PASSWORD_HASH_WORKERS = 1
+    # BCryptSHA256PasswordHasher.verify вызывает encode внутри пула
+    assert check_password('pass-1234', make_password('pass-1234'))
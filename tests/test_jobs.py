@@ -0,0 +1,93 @@
+from io import BytesIO, StringIO
+
+import pytest
+from core import jobs
+from core.models import Job
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from PIL import Image as PilImage
+from posts.models import Comment, Group, GroupStats, Post
+
+
+@pytest.fixture
+def admin_client(client, django_user_model):
+    admin = django_user_model.objects.create_superuser(
+        'admin', 'admin@example.com', 'password')
+    client.force_login(admin)
+    return client
+
+
+def run_action(client, action, posts, **data):
+    return client.post('/admin/posts/post/', {
+        'action': action,
+        '_selected_action': [post.pk for post in posts],
+        **data,
+    })
+
+
+def run_jobs():
+    call_command('run_jobs', once=True, stdout=StringIO())
+
+
+@pytest.mark.django_db
+def test_bulk_delete_runs_in_background(admin_client, user, mixer,
+                                        mock_media, settings):
+    settings.JOB_CHUNK_SIZE = 2
+    posts = mixer.cycle(5).blend(Post, author=user)
+    mixer.cycle(3).blend(Comment, post=posts[0], author=user)
+
+    run_action(admin_client, 'delete_in_background', posts[:4])
+    job = Job.objects.get()
+    assert job.status == Job.PENDING
+    assert list(Post.objects.all()) == [posts[4]]
+    assert Post.all_objects.count() == 5
+
+    run_jobs()
+    job.refresh_from_db()
+    assert job.status == Job.DONE
+    assert (job.processed, job.total, job.progress()) == (4, 4, 100)
+    assert '4 из 4 (100%)' in admin_client.get(
+        '/admin/core/job/').content.decode()
+    assert list(Post.all_objects.all()) == [posts[4]]
+    assert not Comment.objects.exists()
+
+
+@pytest.mark.django_db
+def test_bulk_group_reassignment(admin_client, user, mixer, mock_media):
+    old, new = mixer.cycle(2).blend(Group)
+    posts = mixer.cycle(3).blend(Post, author=user, group=old)
+
+    run_action(admin_client, 'reassign_group', posts[:2], group='missing')
+    assert not Job.objects.exists()
+
+    run_action(admin_client, 'reassign_group', posts[:2], group=new.slug)
+    run_jobs()
+    assert new.posts.count() == 2
+    assert GroupStats.objects.get(group=old).post_count == 1
+    assert GroupStats.objects.get(group=new).post_count == 2
+
+
+@pytest.mark.django_db
+def test_thumbnails_are_regenerated(admin_client, user, mock_media):
+    buffer = BytesIO()
+    PilImage.new('RGB', (40, 30), (200, 10, 10)).save(buffer, 'PNG')
+    post = Post.objects.create(
+        text='Пост', author=user,
+        image=SimpleUploadedFile('a.png', buffer.getvalue()))
+
+    run_action(admin_client, 'regenerate_thumbnails', [post])
+    run_jobs()
+    assert Job.objects.get().status == Job.DONE
+
+
+@pytest.mark.django_db
+def test_failed_job_keeps_traceback(monkeypatch):
+    def broken(job):
+        raise RuntimeError('сломалось')
+
+    monkeypatch.setitem(jobs.TASKS, 'broken', broken)
+    job = jobs.enqueue('broken')
+    run_jobs()
+    job.refresh_from_db()
+    assert job.status == Job.FAILED
+    assert 'сломалось' in job.error
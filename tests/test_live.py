@@ -0,0 +1,102 @@
+import asyncio
+
+import pytest
+from asgiref.sync import sync_to_async
+from core.pubsub import BaseBroker, LocalBroker
+from posts.live import LiveUpdatesApp, resolve_channel
+from posts.models import Comment
+
+
+class ASGIClient:
+    """Открывает SSE-поток и собирает отправленные части ответа."""
+
+    def __init__(self, app, path):
+        self.app = app
+        self.path = path
+        self.messages = []
+        self.disconnect = asyncio.Event()
+
+    async def receive(self):
+        await self.disconnect.wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(self, message):
+        self.messages.append(message)
+
+    def run(self):
+        scope = {'type': 'http', 'path': self.path}
+        return asyncio.ensure_future(self.app(scope, self.receive, self.send))
+
+    @property
+    def body(self):
+        return b''.join(message.get('body', b'') for message in self.messages)
+
+
+def test_resolve_channel():
+    assert resolve_channel('/live/feed/') == 'feed'
+    assert resolve_channel('/live/group/test-link/') == 'group:test-link'
+    assert resolve_channel('/live/author/TestUser/') == 'author:TestUser'
+    assert resolve_channel('/live/post/12/') == 'post:12'
+    assert resolve_channel('/live/unknown/') is None
+    assert resolve_channel('/feed/') is None
+
+
+def test_local_broker_delivers_to_channel_subscribers():
+    async def scenario():
+        broker = LocalBroker()
+        feed = broker.subscribe('feed')
+        other = broker.subscribe('group:other')
+        broker.publish('feed', {'event': 'post', 'data': {'id': 1}})
+        message = await asyncio.wait_for(feed.get(), 1)
+        feed.close()
+        other.close()
+        return message, other.queue.qsize(), broker.has_subscribers('feed')
+
+    message, other_size, subscribed = asyncio.run(scenario())
+    assert message == {'event': 'post', 'data': {'id': 1}}
+    assert other_size == 0
+    assert not subscribed
+
+
+def test_sse_endpoint_streams_events():
+    async def scenario():
+        broker = LocalBroker()
+        client = ASGIClient(LiveUpdatesApp(broker=broker), '/live/post/5/')
+        task = client.run()
+        while not broker.has_subscribers('post:5'):
+            await asyncio.sleep(0)
+        broker.publish('post:5', {'event': 'comment', 'data': {'id': 3}})
+        while len(client.messages) < 2:
+            await asyncio.sleep(0)
+        client.disconnect.set()
+        await asyncio.wait_for(task, 1)
+        return client, broker
+
+    client, broker = asyncio.run(scenario())
+    assert client.messages[0]['status'] == 200
+    assert (b'content-type', b'text/event-stream') in (
+        client.messages[0]['headers'])
+    assert b'event: comment\ndata: {"id": 3}\n\n' in client.body
+    assert not broker.has_subscribers('post:5')
+
+
+@pytest.mark.django_db(transaction=True)
+def test_new_comment_is_published_as_fragment(settings, monkeypatch, post):
+    settings.LIVE_UPDATES = True
+
+    async def scenario():
+        broker = LocalBroker()
+        monkeypatch.setattr('posts.live.get_broker', lambda: broker)
+        subscription = broker.subscribe(f'post:{post.pk}')
+        await sync_to_async(Comment.objects.create)(
+            post=post, author=post.author, text='Живой')
+        return await asyncio.wait_for(subscription.get(), 1)
+
+    message = asyncio.run(scenario())
+    assert message['event'] == 'comment'
+    assert 'Живой' in message['data']['html']
+
+
+def test_base_broker_declares_unsubscribe():
+    with pytest.raises(NotImplementedError):
+        BaseBroker().unsubscribe(None)
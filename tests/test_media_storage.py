@@ -0,0 +1,81 @@
+import os
+from io import BytesIO, StringIO
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from core.views import serve_media
+from PIL import Image as PilImage
+from posts.models import Image, MediaBlob, Post, PostImage
+
+
+def png_bytes(color=(10, 200, 10)):
+    buffer = BytesIO()
+    PilImage.new('RGB', (30, 30), color).save(buffer, 'PNG')
+    return buffer.getvalue()
+
+
+def upload(client, text, content):
+    return client.post('/create/', data={
+        'text': text, 'image': SimpleUploadedFile('photo.png', content),
+    })
+
+
+def collect(*args):
+    call_command('collect_media', '--min-age=0', *args, stdout=StringIO())
+
+
+@pytest.mark.django_db(transaction=True)
+class TestContentAddressedMedia:
+
+    def test_duplicates_share_one_file(self, mock_media, user_client):
+        upload(user_client, 'Первый', png_bytes())
+        upload(user_client, 'Второй', png_bytes())
+        first, second = Post.objects.order_by('pk')
+        assert first.image.name == second.image.name
+        assert len(os.path.basename(first.image.name)) == 64 + len('.png')
+        assert MediaBlob.objects.get(name=first.image.name).refcount == 2
+
+        first.delete()
+        assert MediaBlob.objects.get(name=second.image.name).refcount == 1
+        collect()
+        assert os.path.exists(second.image.path)
+
+        second.delete()
+        assert MediaBlob.objects.get(name=second.image.name).refcount == 0
+        collect('--dry-run')
+        assert os.path.exists(second.image.path)
+        collect()
+        assert not os.path.exists(second.image.path)
+        assert not MediaBlob.objects.exists()
+
+    def test_collect_removes_unlinked_images(self, mock_media, user, post):
+        linked = Image.objects.create(
+            Image=SimpleUploadedFile('a.png', png_bytes((1, 2, 3))))
+        PostImage.objects.create(post=post, image=linked)
+        unlinked = Image.objects.create(
+            Image=SimpleUploadedFile('b.png', png_bytes((4, 5, 6))))
+        collect()
+        assert list(Image.objects.all()) == [linked]
+        assert os.path.exists(linked.Image.path)
+        assert not os.path.exists(unlinked.Image.path)
+
+    def test_recent_files_are_kept(self, mock_media, user_client):
+        upload(user_client, 'Пост', png_bytes())
+        post = Post.objects.get()
+        Post.objects.filter(pk=post.pk).delete()
+        call_command('collect_media', stdout=StringIO())
+        assert os.path.exists(post.image.path)
+
+    def test_hashed_media_is_cached_forever(self, mock_media, rf,
+                                            user_client):
+        upload(user_client, 'Пост', png_bytes())
+        name = Post.objects.get().image.name
+        response = serve_media(rf.get('/'), name, document_root=mock_media)
+        assert 'immutable' in response['Cache-Control']
+        os.makedirs(os.path.join(mock_media, 'static'))
+        with open(os.path.join(mock_media, 'static', 'logo.png'), 'wb'):
+            pass
+        response = serve_media(rf.get('/'), 'static/logo.png',
+                               document_root=mock_media)
+        assert not response.has_header('Cache-Control')
@@ -1,6 +1,7 @@
 import pytest
 from django.core.cache import cache
 from django.core.paginator import Page, Paginator
+from posts.models import Post
 
 pytestmark = [pytest.mark.django_db]
 
@@ -51,3 +52,32 @@ class TestGroupPaginatorView:
             'Проверьте, что переменная `paginator` объекта `page_obj`'
             ' на странице `/profile/<username>/` типа `Paginator`'
         )
+
+
+class TestPageSize:
+
+    @pytest.fixture
+    def many_posts(self, user, mixer, mock_media):
+        return mixer.cycle(12).blend(Post, author=user)
+
+    def test_per_page_is_capped(self, client, settings, many_posts):
+        settings.MAX_POSTS_PER_PAGE = 10
+        cache.clear()
+        response = client.get('/?per_page=7')
+        assert len(response.context['page_obj']) == 7
+        assert 'page=2&amp;per_page=7' in response.content.decode()
+
+        response = client.get('/?per_page=1000')
+        assert len(response.context['page_obj']) == 10
+
+        response = client.get('/?per_page=abc')
+        assert len(response.context['page_obj']) == settings.NUMBER_POSTS
+
+    def test_link_header(self, client, user, many_posts):
+        response = client.get(f'/profile/{user.username}/?per_page=5&page=2')
+        assert response['Link'] == (
+            f'</profile/{user.username}/?per_page=5&page=3>; rel="next", '
+            f'</profile/{user.username}/?per_page=5&page=1>; rel="prev"'
+        )
+        response = client.get(f'/profile/{user.username}/?per_page=20')
+        assert not response.has_header('Link')
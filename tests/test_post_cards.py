@@ -0,0 +1,69 @@
+from io import BytesIO
+
+import pytest
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from posts.cards import render_cards
+from posts.models import Post
+from posts.thumbnails import CARD_THUMBNAIL, thumbnail_key
+from PIL import Image as PILImage
+from sorl.thumbnail.models import KVStore
+
+
+@pytest.mark.django_db
+def test_cards_are_cached_until_post_changes(user, mixer, mock_media):
+    first, second = mixer.cycle(2).blend(Post, author=user)
+    posts = Post.objects.select_related('author').order_by('pk')
+    cards = dict(render_cards(posts.all(), 'includes/common.html'))
+    assert first.text in cards[first]
+
+    page = list(posts.all())
+    cache_keys = []
+    original = cache.get_many
+    cache.get_many = lambda keys: cache_keys.append(keys) or original(keys)
+    try:
+        with CaptureQueriesContext(connection) as queries:
+            render_cards(page, 'includes/common.html')
+    finally:
+        del cache.get_many
+    assert len(cache_keys) == 1 and len(cache_keys[0]) == 2
+    assert not queries.captured_queries
+
+    first.text = 'Новый текст карточки'
+    first.save()
+    cards = dict(render_cards(posts.all(), 'includes/common.html'))
+    assert 'Новый текст карточки' in cards[first]
+
+
+@pytest.mark.django_db
+def test_renaming_author_refreshes_cards(user, mixer, mock_media):
+    post = mixer.blend(Post, author=user)
+    render_cards([post], 'includes/common.html')
+    user.username = 'renamed_author'
+    user.save()
+    post = Post.objects.select_related('author').get(pk=post.pk)
+    [(_, html)] = render_cards([post], 'includes/common.html')
+    assert 'renamed_author' in html
+
+
+@pytest.mark.django_db
+def test_card_thumbnails_are_read_in_one_query(client, user, mixer,
+                                               mock_media):
+    for size in range(3):
+        image = BytesIO()
+        PILImage.new('RGB', (20 + size, 20)).save(image, 'PNG')
+        mixer.blend(Post, author=user, image=SimpleUploadedFile(
+            'photo.png', image.getvalue()))
+    # Миниатюры построены при сохранении постов
+    keys = [thumbnail_key(post.image, *CARD_THUMBNAIL)
+            for post in Post.objects.all()]
+    assert KVStore.objects.filter(key__in=keys).count() == 3
+
+    cache.clear()
+    with CaptureQueriesContext(connection) as queries:
+        assert client.get('/fragment/').status_code == 200
+    [query] = [query['sql'] for query in queries.captured_queries
+               if 'thumbnail_kvstore' in query['sql']]
+    assert ' IN (' in query
@@ -0,0 +1,97 @@
+import logging
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.template import engines
+from django.test.runner import DiscoverRunner
+from posts import views
+from posts.models import Post
+
+from core.querybudget import QueryBudgetExceeded, fingerprint, query_budget
+from core.runner import TestRunner
+
+User = get_user_model()
+
+BUDGETED_VIEWS = (
+    'index', 'popular', 'group_index', 'group_posts', 'profile',
+    'post_detail', 'follow_index', 'index_fragment', 'group_fragment',
+    'profile_fragment', 'follow_fragment',
+)
+
+
+def test_fingerprint_ignores_parameters():
+    assert fingerprint(
+        "SELECT * FROM t WHERE id = 12 AND name = 'it''s'"
+    ) == fingerprint('SELECT * FROM t  WHERE id = 7 AND name = \'x\'')
+    assert fingerprint('SELECT * FROM t WHERE id IN (1, 2, 3)') == (
+        'SELECT * FROM t WHERE id IN (...)')
+    assert fingerprint('SELECT * FROM t WHERE id IN (%s, %s)') == (
+        'SELECT * FROM t WHERE id IN (...)')
+
+
+@pytest.mark.django_db
+def test_max_queries():
+    with query_budget(max_queries=2):
+        list(User.objects.all())
+        list(Post.objects.all())
+    with pytest.raises(QueryBudgetExceeded, match='3 запросов'):
+        with query_budget(max_queries=2):
+            for _ in range(3):
+                list(Post.objects.all())
+
+
+@pytest.mark.django_db
+def test_max_time():
+    with pytest.raises(QueryBudgetExceeded, match='мс SQL'):
+        with query_budget(max_time=0):
+            list(Post.objects.all())
+
+
+@pytest.mark.django_db
+def test_repeated_query_points_to_template(user, mixer, mock_media):
+    posts = mixer.cycle(5).blend(Post, author=user)
+    template = engines['django'].from_string(
+        '{% for post in posts %}{{ post.author.username }}{% endfor %}')
+    page = Post.objects.filter(pk__in=[post.pk for post in posts])
+    with pytest.raises(QueryBudgetExceeded) as error:
+        with query_budget(name='лента'):
+            template.render({'posts': page})
+    report = str(error.value)
+    assert 'лента' in report
+    assert '5× SELECT' in report
+    assert 'шаблон: <unknown source>:1' in report
+    with query_budget(max_queries=1):
+        template.render({'posts': page.select_related('author')})
+
+
+@pytest.mark.django_db
+def test_log_and_off(settings, caplog):
+    settings.QUERY_BUDGET_ACTION = 'log'
+    with caplog.at_level(logging.WARNING, logger='core.querybudget'):
+        with query_budget(max_queries=0, name='блок'):
+            list(Post.objects.all())
+    assert 'Бюджет запросов превышен: блок' in caplog.text
+
+    settings.QUERY_BUDGET_ACTION = 'off'
+    with query_budget(max_queries=0) as budget:
+        list(Post.objects.all())
+    assert budget.queries == []
+
+
+@pytest.mark.parametrize('name', BUDGETED_VIEWS)
+def test_feed_views_have_budget(name):
+    assert getattr(views, name).query_budget.max_queries is not None
+
+
+def test_manage_py_test_raises(settings, monkeypatch):
+    # Окружение Django для тестов уже подготовил pytest-django
+    for name in ('setup_test_environment', 'teardown_test_environment'):
+        monkeypatch.setattr(DiscoverRunner, name, lambda self: None)
+    settings.QUERY_BUDGET_ACTION = 'off'
+    runner = TestRunner()
+    runner.setup_test_environment()
+    try:
+        assert settings.QUERY_BUDGET_ACTION == 'raise'
+    finally:
+        runner.teardown_test_environment()
+    assert settings.QUERY_BUDGET_ACTION == 'off'
@@ -0,0 +1,51 @@
+from datetime import timedelta
+from io import StringIO
+
+import numpy as np
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+from posts.models import Comment, Post, PostRank
+from posts.ranking import compute_scores, rebuild_ranking
+
+
+def test_compute_scores_prefers_recent_activity():
+    scores = compute_scores(
+        post_age=np.array([5.0, 5.0, 500.0]),
+        author_followers=np.array([0.0, 0.0, 0.0]),
+        comment_post_index=np.array([0, 0, 1, 2, 2, 2]),
+        comment_age=np.array([1.0, 2.0, 100.0, 1.0, 1.0, 1.0]),
+        half_life=24,
+        follower_weight=0.5,
+    )
+    assert scores[0] > scores[1]
+    assert scores[0] > scores[2], 'Старый пост должен терять вес'
+
+
+@pytest.mark.django_db
+def test_popular_feed_uses_ranking(client, user, another_user, mixer):
+    quiet, discussed = mixer.cycle(2).blend(Post, author=user)
+    mixer.cycle(3).blend(Comment, post=discussed, author=another_user)
+    old = mixer.blend(Post, author=user)
+    Post.objects.filter(pk=old.pk).update(
+        pub_date=timezone.now() - timedelta(days=365))
+
+    call_command('rank_posts', stdout=StringIO())
+
+    assert not PostRank.objects.filter(post=old).exists()
+    response = client.get('/popular/')
+    assert list(response.context['page_obj']) == [discussed, quiet]
+
+
+@pytest.mark.django_db
+def test_ranking_ignores_comments_on_hidden_posts(user, another_user, mixer):
+    quiet, deleted, newest = mixer.cycle(3).blend(Post, author=user)
+    mixer.cycle(3).blend(Comment, post=deleted, author=another_user)
+    mixer.cycle(3).blend(Comment, post=newest, author=another_user)
+    Post.all_objects.filter(pk__in=[deleted.pk, newest.pk]).update(
+        is_deleted=True)
+
+    assert rebuild_ranking() == 1
+    rank = PostRank.objects.get()
+    assert rank.post_id == quiet.pk
+    assert rank.score == 0
@@ -0,0 +1,64 @@
+import pytest
+from core.ratelimit import client_ip, take_token
+from django.test import RequestFactory
+from posts.models import Comment
+
+
+def test_client_ip_ignores_addresses_sent_by_client(settings):
+    settings.RATELIMIT_IP_HEADER = 'HTTP_X_FORWARDED_FOR'
+    settings.RATELIMIT_TRUSTED_PROXIES = 1
+    request = RequestFactory().get(
+        '/', HTTP_X_FORWARDED_FOR='1.1.1.1, 2.2.2.2, 203.0.113.7')
+    assert client_ip(request) == '203.0.113.7'
+
+    settings.RATELIMIT_TRUSTED_PROXIES = 2
+    assert client_ip(request) == '2.2.2.2'
+    request = RequestFactory().get('/', HTTP_X_FORWARDED_FOR='203.0.113.7')
+    assert client_ip(request) == '203.0.113.7'
+    request = RequestFactory().get('/', REMOTE_ADDR='10.0.0.1')
+    assert client_ip(request) == '10.0.0.1'
+
+
+@pytest.mark.django_db
+def test_spoofed_forwarded_for_does_not_reset_limit(settings, client, user,
+                                                     another_user):
+    settings.RATELIMIT_IP_HEADER = 'HTTP_X_FORWARDED_FOR'
+    settings.RATELIMITS = {'profile_follow': (1, 60)}
+    client.force_login(user)
+    url = f'/profile/{another_user.username}/follow/'
+    assert client.get(url, HTTP_X_FORWARDED_FOR='1.1.1.1, 203.0.113.7'
+                      ).status_code == 302
+    client.force_login(another_user)
+    response = client.get(f'/profile/{user.username}/follow/',
+                          HTTP_X_FORWARDED_FOR='9.9.9.9, 203.0.113.7')
+    assert response.status_code == 429
+
+
+def test_bucket_refills_over_time():
+    keys = ['ratelimit:test:ip:1']
+    assert take_token(keys, 2, 10, now=100) == 0
+    assert take_token(keys, 2, 10, now=100) == 0
+    assert take_token(keys, 2, 10, now=100) == pytest.approx(5)
+    assert take_token(keys, 2, 10, now=105) == 0
+
+
+@pytest.mark.django_db
+def test_comments_are_throttled(settings, user_client, user, post):
+    settings.RATELIMITS = {'add_comment': (2, 60)}
+    url = f'/posts/{post.pk}/comment/'
+    for _ in range(2):
+        assert user_client.post(url, {'text': 'Привет'}).status_code == 302
+    response = user_client.post(url, {'text': 'Привет'})
+    assert response.status_code == 429
+    assert 0 < int(response['Retry-After']) <= 30
+    assert Comment.objects.count() == 2
+
+
+@pytest.mark.django_db
+def test_ip_bucket_is_shared_by_users(settings, client, user, another_user):
+    settings.RATELIMITS = {'profile_follow': (1, 60)}
+    client.force_login(user)
+    url = f'/profile/{another_user.username}/follow/'
+    assert client.get(url).status_code == 302
+    client.force_login(another_user)
+    assert client.get(f'/profile/{user.username}/follow/').status_code == 429
@@ -0,0 +1,60 @@
+from io import StringIO
+
+import pytest
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connection
+from django.db.migrations.loader import MigrationLoader
+from django.db.migrations.state import ProjectState
+
+from core import schema
+
+SQUASHED = ('posts', '0001_squashed_0017_alter_post_image')
+
+
+def test_snapshot_is_up_to_date():
+    digest, _ = schema.read_snapshot(settings.SCHEMA_SNAPSHOT)
+    assert digest == schema.migrations_digest(), (
+        'Обновите снимок: python manage.py bootstrap_schema --update'
+    )
+
+
+def state_after(migrations):
+    state = ProjectState()
+    for migration in migrations:
+        state = migration.mutate_state(state, preserve=False)
+    return state.models
+
+
+def test_squashed_migration_matches_originals():
+    migrations = MigrationLoader(None).disk_migrations
+    squashed = migrations[SQUASHED]
+    original = state_after(migrations[key] for key in squashed.replaces)
+    assert state_after([squashed]) == original
+
+
+def test_snapshot_matches_migrations(django_db_blocker):
+    out = StringIO()
+    with django_db_blocker.unblock():
+        call_command('bootstrap_schema', check=True, stdout=out)
+    assert 'совпадает' in out.getvalue()
+
+
+def test_stale_snapshot_falls_back_to_migrate(django_db_blocker, tmp_path):
+    snapshot = tmp_path / 'schema.sql'
+    snapshot.write_text(f'{schema.DIGEST_PREFIX}stale\nSELECT 1;\n')
+    err = StringIO()
+    with django_db_blocker.unblock(), schema.scratch_database():
+        call_command('bootstrap_schema', snapshot=str(snapshot),
+                     verbosity=0, stderr=err)
+        assert 'posts_post' in connection.introspection.table_names()
+        assert SQUASHED in schema.applied_migrations()
+    assert 'устарел' in err.getvalue()
+
+
+@pytest.mark.django_db
+def test_check_rejects_stale_snapshot(tmp_path):
+    snapshot = tmp_path / 'schema.sql'
+    snapshot.write_text(f'{schema.DIGEST_PREFIX}stale\n')
+    with pytest.raises(Exception, match='устарел'):
+        call_command('bootstrap_schema', snapshot=str(snapshot), check=True)
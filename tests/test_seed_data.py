@@ -0,0 +1,41 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db.models import F
+from posts.models import Comment, Follow, Group, Post
+
+SEED_OPTIONS = {
+    'users': 20, 'groups': 4, 'posts': 60, 'comments': 90, 'follows': 3,
+    'images': 2, 'workers': 1, 'batch_size': 25, 'seed': 7,
+}
+
+
+def seed(**options):
+    call_command('seed_data', stdout=StringIO(), **{**SEED_OPTIONS, **options})
+
+
+@pytest.mark.django_db
+class TestSeedData:
+
+    def test_seed_data_creates_rows(self, mock_media):
+        seed()
+        assert Post.objects.count() == 60
+        assert Comment.objects.count() == 90
+        assert Group.objects.count() == 4
+        assert Follow.objects.exists()
+        assert not Follow.objects.filter(user=F('author')).exists()
+        dates = set(Post.objects.values_list('pub_date', flat=True))
+        assert len(dates) > 1, 'Даты постов должны быть распределены во времени'
+
+    def test_seed_data_is_deterministic(self, mock_media):
+        seed()
+        first = list(Post.objects.order_by('pk').values_list(
+            'text', 'author__username', 'group__slug'))
+        with pytest.raises(CommandError):
+            seed()
+        seed(clear=True)
+        second = list(Post.objects.order_by('pk').values_list(
+            'text', 'author__username', 'group__slug'))
+        assert first == second
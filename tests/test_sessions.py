@@ -0,0 +1,52 @@
+from importlib.util import find_spec, module_from_spec
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def session_queries(client, url):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+    assert response.status_code == 200
+    return [query['sql'] for query in queries.captured_queries
+            if 'django_session' in query['sql']]
+
+
+@pytest.mark.django_db
+def test_anonymous_feeds_do_not_touch_sessions(client, post_with_group):
+    for url in ('/', '/popular/', '/groups/',
+                f'/group/{post_with_group.group.slug}/',
+                f'/profile/{post_with_group.author.username}/'):
+        assert session_queries(client, url) == [], url
+
+
+@pytest.mark.django_db
+def test_cached_sessions_skip_database(settings, client, user):
+    settings.SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+    client.force_login(user)
+    session_queries(client, '/follow/')
+    assert session_queries(client, '/follow/') == []
+
+
+def load_settings():
+    spec = find_spec('traveltube.settings')
+    module = module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.mark.parametrize('backend, engine', [
+    (None, 'db'),
+    ('django.core.cache.backends.memcached.PyMemcacheCache', 'cached_db'),
+    ('django_redis.cache.RedisCache', 'cached_db'),
+])
+def test_sessions_are_cached_only_in_shared_cache(monkeypatch, backend,
+                                                  engine):
+    monkeypatch.delenv('SESSION_BACKEND', raising=False)
+    if backend:
+        monkeypatch.setenv('SESSION_CACHE_BACKEND', backend)
+    else:
+        monkeypatch.delenv('SESSION_CACHE_BACKEND', raising=False)
+    engines = 'django.contrib.sessions.backends'
+    assert load_settings().SESSION_ENGINE == f'{engines}.{engine}'
@@ -0,0 +1,110 @@
+import pytest
+from core.models import Job
+from posts import purge
+from posts.media import referenced_names
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from posts.models import Comment, Follow, Group, GroupStats, Post
+from users.models import DeletedUser
+
+
+@pytest.fixture
+def feed(user, another_user, mixer, mock_media):
+    group = mixer.blend(Group)
+    hidden = mixer.blend(Post, author=user, group=group, is_deleted=True)
+    shown = mixer.blend(Post, author=another_user, group=group)
+    return group, hidden, shown
+
+
+@pytest.mark.django_db
+def test_deleted_posts_leave_feeds(client, user, feed):
+    group, hidden, shown = feed
+    for url in ('/', f'/group/{group.slug}/', f'/profile/{user.username}/'):
+        assert hidden not in client.get(url).context['page_obj']
+    assert client.get('/fragment/').context['posts'] == [shown]
+    assert client.get(f'/posts/{hidden.pk}/').status_code == 404
+    assert client.get(f'/posts/{shown.pk}/').status_code == 200
+    assert user.posts.count() == 0
+    assert Post.all_objects.count() == 2
+    # Файл удалённого поста остаётся до окончательного удаления
+    assert hidden.image.name in referenced_names([hidden.image.name])
+
+
+@pytest.mark.django_db
+def test_deleted_author_is_hidden(client, another_user, feed):
+    group, hidden, shown = feed
+    purge.soft_delete_user(another_user)
+    assert shown not in client.get('/').context['page_obj']
+    assert client.get(
+        f'/profile/{another_user.username}/').status_code == 404
+
+
+@pytest.mark.django_db
+def test_deactivated_author_keeps_posts(client, another_user, feed):
+    group, hidden, shown = feed
+    another_user.is_active = False
+    another_user.save()
+    assert shown in client.get('/').context['page_obj']
+    assert client.get(
+        f'/profile/{another_user.username}/').status_code == 200
+    purge.purge_user(another_user.pk)
+    assert Post.objects.filter(pk=shown.pk).exists()
+
+
+@pytest.mark.django_db
+def test_visible_posts_do_not_join_users(user):
+    with CaptureQueriesContext(connection) as queries:
+        list(Post.objects.filter(pk=1))
+        user.posts.count()
+    assert all('auth_user' not in query['sql']
+               for query in queries.captured_queries)
+
+
+@pytest.mark.django_db
+def test_purge_user_in_batches(user, another_user, mixer, mock_media,
+                               settings, monkeypatch):
+    settings.PURGE_BATCH_SIZE = 2
+    pauses = []
+    monkeypatch.setattr(purge.time, 'sleep', pauses.append)
+    group = mixer.blend(Group)
+    posts = mixer.cycle(3).blend(Post, author=user, group=group)
+    kept = mixer.blend(Post, author=another_user, group=group)
+    mixer.cycle(3).blend(Comment, post=posts[0], author=another_user)
+    mixer.cycle(2).blend(Comment, post=kept, author=user)
+    mixer.blend(Follow, user=user, author=another_user)
+    mixer.blend(Follow, user=another_user, author=user)
+
+    purge.soft_delete_user(user)
+    purge.purge_user(user.pk)
+
+    assert not type(user).objects.filter(pk=user.pk).exists()
+    assert list(Post.all_objects.all()) == [kept]
+    assert not Comment.objects.exists()
+    assert not Follow.objects.exists()
+    assert GroupStats.objects.get(group=group).post_count == 1
+    # Семь пачек комментариев, подписок и постов — пауза после каждой
+    assert len(pauses) == 7
+    assert set(pauses) == {settings.PURGE_PAUSE}
+
+
+@pytest.mark.django_db
+def test_purge_skips_active_user(user, mixer, mock_media):
+    mixer.blend(Post, author=user)
+    purge.purge_user(user.pk)
+    assert Post.objects.count() == 1
+
+
+@pytest.mark.django_db
+def test_admin_deletes_user_in_background(client, django_user_model, user):
+    admin = django_user_model.objects.create_superuser(
+        'admin', 'admin@example.com', 'password')
+    client.force_login(admin)
+    client.post('/admin/auth/user/', {
+        'action': 'delete_in_background',
+        '_selected_action': [user.pk],
+    })
+    user.refresh_from_db()
+    assert not user.is_active
+    assert DeletedUser.objects.filter(user=user).exists()
+    job = Job.objects.get()
+    assert (job.name, job.kwargs()) == ('purge_user', {'user_id': user.pk})
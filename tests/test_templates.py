@@ -0,0 +1,60 @@
+import pytest
+from django.conf import settings as django_settings
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.template import Context, Engine
+from posts.cards import render_cards
+from posts.models import Post
+
+INLINING_LOADERS = [
+    ('core.template_loaders.Loader', [
+        'django.template.loaders.filesystem.Loader',
+    ]),
+]
+
+
+def make_engine(loaders=None):
+    return Engine(
+        dirs=django_settings.TEMPLATES[0]['DIRS'],
+        loaders=loaders,
+        libraries={'user_filters': 'core.templatetags.user_filters'},
+    )
+
+
+def test_loader_inlines_hot_includes():
+    engine = make_engine(INLINING_LOADERS)
+    source = engine.get_template('posts/post_detail.html').source
+    assert "include 'posts/includes/comment.html'" not in source
+    assert "include 'posts/includes/live.html'" in source
+
+
+@pytest.mark.django_db
+def test_inlined_template_renders_the_same(user, mixer, mock_media):
+    mixer.cycle(3).blend(Post, author=user)
+    page_obj = Paginator(Post.objects.order_by('pk'), 2).get_page(1)
+    context = {'page_obj': page_obj, 'user': user, 'follow': True}
+    template = ("{% for post in page_obj %}"
+                "{% include 'posts/includes/switcher.html' %}{% endfor %}"
+                "{% include 'posts/includes/paginator.html' %}")
+    rendered = [
+        make_engine(loaders).from_string(template).render(Context(context))
+        for loaders in (INLINING_LOADERS, None)
+    ]
+    assert rendered[0] == rendered[1]
+
+
+@pytest.mark.django_db
+def test_jinja2_cards(settings, user, mixer, mock_media):
+    settings.TEMPLATES = django_settings.TEMPLATES + [{
+        'BACKEND': 'django.template.backends.jinja2.Jinja2',
+        'DIRS': [django_settings.BASE_DIR + '/templates/jinja2'],
+        'OPTIONS': {'environment': 'core.jinja2.environment'},
+    }]
+    settings.FEED_TEMPLATE_ENGINE = 'jinja2'
+    post = mixer.blend(Post, author=user)
+    cache.clear()
+    [(_, html)] = render_cards([post], 'includes/common.html')
+    cache.clear()
+    assert f'/profile/{user.username}/' in html
+    assert f'/posts/{post.pk}/' in html
+    assert post.text in html
@@ -0,0 +1,114 @@
+import os
+from io import BytesIO
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.http import HttpResponse
+from PIL import Image
+from posts.forms import PostForm
+from posts.models import Post
+from posts.uploadhandlers import (ImageUploadHandler, RejectedUploadedFile,
+                                  image_uploads)
+from posts.validators import sniff_image
+
+
+def image_bytes(image_format, size=(50, 40), **options):
+    buffer = BytesIO()
+    Image.new('RGB', size, (200, 10, 10)).save(buffer, image_format,
+                                               **options)
+    return buffer.getvalue()
+
+
+def media_files(root):
+    return [name for _, _, names in os.walk(root) for name in names]
+
+
+@pytest.mark.parametrize('image_format', ['PNG', 'JPEG', 'GIF', 'WEBP'])
+def test_sniff_image_reads_format_and_size(image_format):
+    data = image_bytes(image_format, size=(123, 45))
+    assert sniff_image(data[:1024]) == (image_format, 123, 45)
+
+
+def test_sniff_image_lossless_webp():
+    data = image_bytes('WEBP', size=(77, 33), lossless=True)
+    assert sniff_image(data) == ('WEBP', 77, 33)
+
+
+def test_sniff_image_unknown_data():
+    assert sniff_image(b'%PDF-1.4 not an image') == (None, None, None)
+
+
+@pytest.mark.django_db
+class TestImageUpload:
+
+    def post(self, client, name, content):
+        return client.post('/create/', data={
+            'text': 'Пост с картинкой',
+            'image': SimpleUploadedFile(name, content),
+        })
+
+    def test_valid_image_is_saved(self, mock_media, user_client):
+        response = self.post(user_client, 'photo.png', image_bytes('PNG'))
+        assert response.status_code == 302
+        post = Post.objects.get()
+        assert post.image.name.startswith('posts/')
+        assert os.path.exists(post.image.path)
+
+    def test_not_an_image_is_rejected(self, mock_media, user_client):
+        response = self.post(user_client, 'photo.png', b'x' * 4096)
+        assert response.status_code == 200
+        assert 'Недопустимый формат' in str(response.context['form'].errors)
+        assert not Post.objects.exists()
+        assert media_files(mock_media) == []
+
+    def test_too_large_dimensions_are_rejected(self, mock_media, settings,
+                                               user_client):
+        settings.UPLOAD_MAX_DIMENSIONS = (40, 40)
+        response = self.post(user_client, 'photo.jpg', image_bytes('JPEG'))
+        assert 'слишком большое' in str(response.context['form'].errors)
+        assert not Post.objects.exists()
+
+    def test_too_large_file_is_rejected(self, mock_media, settings,
+                                        user_client):
+        settings.UPLOAD_MAX_SIZE = 1024
+        data = image_bytes('PNG', size=(400, 400))
+        response = self.post(user_client, 'photo.png', data + b'\0' * 4096)
+        assert 'слишком большой' in str(response.context['form'].errors)
+        assert media_files(mock_media) == []
+
+    def test_large_upload_is_staged_in_media_root(self, mock_media, settings,
+                                                  user_client):
+        settings.FILE_UPLOAD_MAX_MEMORY_SIZE = 1024
+        data = image_bytes('PNG', size=(300, 300))
+        response = self.post(user_client, 'photo.png', data + b'\0' * 4096)
+        assert response.status_code == 302
+        post = Post.objects.get()
+        assert os.path.getsize(post.image.path) == len(data) + 4096
+        assert os.listdir(os.path.join(mock_media, '.uploads')) == []
+
+
+def test_image_handler_is_scoped_to_post_views(rf):
+    request = rf.post('/admin/')
+    assert not any(isinstance(handler, ImageUploadHandler)
+                   for handler in request.upload_handlers)
+
+    handlers = []
+    view = image_uploads(
+        lambda request: handlers.extend(request.upload_handlers)
+        or HttpResponse())
+    assert view.csrf_exempt
+    # CSRF проверяется самой обёрткой: без токена представление не вызвано
+    view(rf.post('/create/'))
+    assert handlers == []
+    request = rf.post('/create/')
+    request._dont_enforce_csrf_checks = True
+    view(request)
+    assert isinstance(handlers[0], ImageUploadHandler)
+
+
+def test_form_accepts_plain_dict_of_files():
+    rejected = RejectedUploadedFile('image', 'photo.png', 'image/png',
+                                    'Недопустимый формат')
+    form = PostForm({'text': 'Текст'}, {'image': rejected})
+    assert not form.is_valid()
+    assert form.errors['image'] == ['Недопустимый формат']
@@ -0,0 +1,98 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from posts.models import Follow, Post
+from posts.purge import soft_delete_user
+from users.cache import user_summary
+
+
+def user_table_queries(client, url):
+    with CaptureQueriesContext(connection) as queries:
+        assert client.get(url).status_code in (200, 302)
+    return [query['sql'] for query in queries.captured_queries
+            if 'FROM "auth_user"' in query['sql']]
+
+
+@pytest.mark.django_db
+def test_profile_reads_author_from_cache(client, user, mixer, mock_media):
+    mixer.cycle(2).blend(Post, author=user)
+    url = f'/profile/{user.username}/'
+    assert user_table_queries(client, url)
+    assert user_table_queries(client, url) == []
+    assert client.get(url).context['posts_count'] == 2
+
+
+@pytest.mark.django_db
+def test_follow_uses_cached_author(user_client, user, another_user):
+    url = f'/profile/{another_user.username}/'
+    user_client.get(url)
+    # Остаётся только загрузка вошедшего пользователя из сессии
+    assert len(user_table_queries(
+        user_client, f'{url}follow/')) == 1
+    assert Follow.objects.filter(user=user, author=another_user).exists()
+    assert user_summary(another_user.username)['followers_count'] == 1
+    user_client.get(f'{url}unfollow/')
+    assert user_summary(another_user.username)['followers_count'] == 0
+
+
+@pytest.mark.django_db
+def test_summary_is_invalidated(client, user, mixer, mock_media):
+    assert user_summary(user.username)['posts_count'] == 0
+    post = mixer.blend(Post, author=user)
+    assert user_summary(user.username)['posts_count'] == 1
+    post.delete()
+    assert user_summary(user.username)['posts_count'] == 0
+
+    old_name = user.username
+    user.username = 'renamed'
+    user.first_name = 'Новое'
+    user.save()
+    assert user_summary(old_name) is None
+    assert user_summary('renamed')['first_name'] == 'Новое'
+    assert client.get(f'/profile/{old_name}/').status_code == 404
+
+    soft_delete_user(user)
+    assert client.get('/profile/renamed/').status_code == 404
+
+
+@pytest.mark.django_db
+def test_first_profile_page_is_fetched_by_pk(client, user, mixer,
+                                              mock_media, settings):
+    settings.PROFILE_SNAPSHOT_POSTS = 6
+    posts = mixer.cycle(8).blend(Post, author=user)
+    url = f'/profile/{user.username}/'
+    client.get(url)
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+    [query] = queries.captured_queries
+    assert '"posts_post"."id" IN (' in query['sql']
+    assert 'COUNT' not in query['sql']
+    expected = sorted(posts, key=lambda post: post.pub_date, reverse=True)
+    assert list(response.context['page_obj']) == expected[:5]
+    assert response.context['page_obj'].paginator.num_pages == 2
+
+    page = client.get(url, {'per_page': 7}).context['page_obj']
+    assert list(page) == expected[:7]
+
+
+@pytest.mark.django_db
+def test_snapshot_is_updated_incrementally(client, user, mixer, mock_media,
+                                           django_assert_num_queries):
+    first = mixer.blend(Post, author=user)
+    assert user_summary(user.username)['post_ids'] == [first.pk]
+    second = mixer.blend(Post, author=user)
+    with django_assert_num_queries(0):
+        summary = user_summary(user.username)
+    assert summary['post_ids'] == [second.pk, first.pk]
+    assert summary['posts_count'] == 2
+
+    second.text = 'Правка'
+    second.save()
+    with django_assert_num_queries(0):
+        user_summary(user.username)
+
+    second.is_deleted = True
+    second.save()
+    assert user_summary(user.username)['post_ids'] == [first.pk]
+    assert list(client.get(f'/profile/{user.username}/')
+                .context['page_obj']) == [first]
@@ -0,0 +1,23 @@
+from django.contrib import admin
+
+from .models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ('__str__', 'status', 'progress_display', 'created_by',
+                    'created', 'finished')
+    list_filter = ('status', 'name')
+    list_select_related = ('created_by',)
+    readonly_fields = ('name', 'params', 'status', 'total', 'processed',
+                       'progress_display', 'error', 'created_by', 'created',
+                       'started', 'finished')
+    fields = readonly_fields
+
+    def progress_display(self, obj):
+        return f'{obj.processed} из {obj.total} ({obj.progress()}%)'
+
+    progress_display.short_description = 'прогресс'
+
+    def has_add_permission(self, request):
+        return False
@@ -0,0 +1,136 @@
+"""Сжатие ответов gzip и brotli (если установлен пакет Brotli).
+
+Уровень сжатия задаётся для каждого типа содержимого в
+COMPRESSION_LEVELS; типы, которых там нет, не сжимаются. Потоковые
+ответы сжимаются по частям со сбросом буфера после каждой части, чтобы
+клиент получал данные сразу. Закешированные ответы можно хранить уже
+сжатыми (см. cached_body) — тогда middleware их не трогает.
+"""
+import gzip
+import zlib
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def content_type_levels(content_type):
+    return settings.COMPRESSION_LEVELS.get(
+        content_type.split(';')[0].strip().lower(), {})
+
+
+def accepted_encodings(request):
+    accepted = set()
+    header = request.META.get('HTTP_ACCEPT_ENCODING', '')
+    for item in header.split(','):
+        name, _, params = item.strip().partition(';')
+        params = params.replace(' ', '')
+        if params.startswith('q='):
+            try:
+                if float(params[2:]) == 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(name.lower())
+    return accepted
+
+
+def choose_encoding(request, content_type):
+    """Лучшее из поддерживаемых клиентом кодирований или None."""
+    levels = content_type_levels(content_type)
+    accepted = accepted_encodings(request)
+    for encoding in ('br', 'gzip'):
+        if (encoding in levels and encoding in accepted
+                and (encoding != 'br' or brotli)):
+            return encoding
+    return None
+
+
+def compress(data, encoding, level):
+    if encoding == 'br':
+        return brotli.compress(data, quality=level)
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+def compress_stream(chunks, encoding, level):
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=level)
+        for chunk in chunks:
+            yield compressor.process(chunk) + compressor.flush()
+        yield compressor.finish()
+    else:
+        compressor = zlib.compressobj(level, zlib.DEFLATED,
+                                      16 + zlib.MAX_WBITS)
+        for chunk in chunks:
+            yield compressor.compress(chunk) + compressor.flush(
+                zlib.Z_SYNC_FLUSH)
+        yield compressor.flush()
+
+
+def cached_body(request, entry, content_type='text/html'):
+    """Тело ответа из записи кеша в подходящем клиенту кодировании.
+
+    entry — словарь с исходным телом под ключом 'identity'. Сжатый
+    вариант считается один раз и добавляется в entry; третий элемент
+    результата сообщает, что entry изменился и его нужно сохранить.
+    """
+    body = entry['identity']
+    encoding = None
+    if len(body) >= settings.COMPRESSION_MIN_SIZE:
+        encoding = choose_encoding(request, content_type)
+    if encoding is None:
+        return None, body, False
+    if encoding in entry:
+        return encoding, entry[encoding], False
+    level = content_type_levels(content_type)[encoding]
+    entry[encoding] = compress(body, encoding, level)
+    return encoding, entry[encoding], True
+
+
+def weaken_etag(response):
+    etag = response.get('ETag')
+    if etag and etag.startswith('"'):
+        response['ETag'] = 'W/' + etag
+
+
+class CompressionMiddleware:
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        content_type = response.get('Content-Type', '')
+        if (response.has_header('Content-Encoding')
+                or not content_type_levels(content_type)):
+            return response
+        # Страницы с CSRF-токеном не сжимаются: по длине сжатого ответа
+        # токен можно подобрать (BREACH). get_token() отмечает такие
+        # запросы флагом CSRF_COOKIE_USED.
+        if request.META.get('CSRF_COOKIE_USED'):
+            return response
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = choose_encoding(request, content_type)
+        if encoding is None:
+            return response
+        level = content_type_levels(content_type)[encoding]
+
+        if response.streaming:
+            response.streaming_content = compress_stream(
+                response.streaming_content, encoding, level)
+            del response['Content-Length']
+        else:
+            if len(response.content) < settings.COMPRESSION_MIN_SIZE:
+                return response
+            compressed = compress(response.content, encoding, level)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response['Content-Length'] = str(len(compressed))
+        weaken_etag(response)
+        response['Content-Encoding'] = encoding
+        return response
@@ -0,0 +1,8 @@
+from django.conf import settings
+
+
+def live_updates(request):
+    """Добавляет адрес канала живых обновлений, если они включены."""
+    if not settings.LIVE_UPDATES:
+        return {}
+    return {'live_url_prefix': settings.LIVE_URL_PREFIX}
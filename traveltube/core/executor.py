@@ -0,0 +1,40 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+
+from django.conf import settings
+from django.db import close_old_connections
+
+
+@lru_cache(maxsize=None)
+def get_executor():
+    """Общий пул потоков для работы с базой из асинхронного кода.
+
+    Размер пула ограничивает число одновременных запросов к базе: у
+    каждого потока своё соединение, поэтому соединений не больше
+    ASYNC_DB_WORKERS.
+    """
+    return ThreadPoolExecutor(
+        max_workers=settings.ASYNC_DB_WORKERS,
+        thread_name_prefix='async-db',
+    )
+
+
+def _call(func):
+    # Обработчик ASGI закрывает соединения только в своём потоке. Как в
+    # начале и конце обычного запроса, соединение потока пула
+    # закрывается, если истёк CONN_MAX_AGE или оно сломано (перезапуск
+    # базы, ошибка в транзакции)
+    close_old_connections()
+    try:
+        return func()
+    finally:
+        close_old_connections()
+
+
+async def run_sync(func, *args, **kwargs):
+    """Выполняет синхронную функцию в пуле и ждёт результата."""
+    loop = asyncio.get_event_loop()
+    return await loop.run_in_executor(
+        get_executor(), _call, partial(func, *args, **kwargs)
+    )
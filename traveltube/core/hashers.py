@@ -0,0 +1,84 @@
+"""Хешеры паролей с настраиваемой стоимостью и общим пулом потоков.
+
+Параметры алгоритмов берутся из настроек PASSWORD_ARGON2,
+PASSWORD_BCRYPT_ROUNDS и PASSWORD_PBKDF2_ITERATIONS. Имена алгоритмов
+совпадают со стандартными хешерами Django, поэтому уже сохранённые хеши
+проверяются как раньше, а при входе Django пересчитывает хеш, если он
+сделан не первым хешером из PASSWORD_HASHERS или с другими параметрами.
+
+Сами вычисления идут в пуле из PASSWORD_HASH_WORKERS потоков: argon2,
+bcrypt и hashlib отпускают GIL, а всплеск входов не занимает больше
+ядер, чем выделено под хеширование, — лишние запросы ждут очереди.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import hashers
+
+_executor = None
+_executor_lock = threading.Lock()
+_local = threading.local()
+
+
+def executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.PASSWORD_HASH_WORKERS,
+                thread_name_prefix='hasher',
+            )
+    return _executor
+
+
+def _call(func, *args):
+    _local.inside = True
+    try:
+        return func(*args)
+    finally:
+        _local.inside = False
+
+
+def run_bounded(func, *args):
+    """Выполняет func в пуле хеширования и ждёт результата."""
+    # bcrypt.verify вызывает encode: вложенный вызов из потока пула
+    # выполняется сразу, иначе заполненный пул ждал бы сам себя
+    if getattr(_local, 'inside', False):
+        return func(*args)
+    return executor().submit(_call, func, *args).result()
+
+
+class BoundedHasherMixin:
+    def encode(self, password, salt, *args):
+        return run_bounded(super().encode, password, salt, *args)
+
+    def verify(self, password, encoded):
+        return run_bounded(super().verify, password, encoded)
+
+
+class Argon2PasswordHasher(BoundedHasherMixin, hashers.Argon2PasswordHasher):
+    @property
+    def time_cost(self):
+        return settings.PASSWORD_ARGON2['time_cost']
+
+    @property
+    def memory_cost(self):
+        return settings.PASSWORD_ARGON2['memory_cost']
+
+    @property
+    def parallelism(self):
+        return settings.PASSWORD_ARGON2['parallelism']
+
+
+class BCryptSHA256PasswordHasher(BoundedHasherMixin,
+                                 hashers.BCryptSHA256PasswordHasher):
+    @property
+    def rounds(self):
+        return settings.PASSWORD_BCRYPT_ROUNDS
+
+
+class PBKDF2PasswordHasher(BoundedHasherMixin, hashers.PBKDF2PasswordHasher):
+    @property
+    def iterations(self):
+        return settings.PASSWORD_PBKDF2_ITERATIONS
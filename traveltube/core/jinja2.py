@@ -0,0 +1,46 @@
+"""Окружение Jinja2 для карточек постов (FEED_TEMPLATE_ENGINE=jinja2)."""
+import logging
+
+from django.templatetags.static import static
+from django.urls import reverse
+from django.utils.formats import date_format as format_date
+from django.utils.timezone import template_localtime
+from jinja2 import Environment
+from sorl.thumbnail import get_thumbnail
+from sorl.thumbnail.templatetags.thumbnail import margin
+
+logger = logging.getLogger(__name__)
+
+
+def thumbnail(file_, geometry, **options):
+    """Аналог {% thumbnail %}: None, если картинки нет или она битая."""
+    if not file_:
+        return None
+    try:
+        return get_thumbnail(file_, geometry, **options)
+    except Exception:
+        logger.exception('Не удалось создать миниатюру %s', file_)
+        return None
+
+
+def date_format(value, format_string='d E Y'):
+    """Как фильтр date в шаблонах Django."""
+    return format_date(template_localtime(value), format_string)
+
+
+def url(viewname, *args, **kwargs):
+    return reverse(viewname, args=args or None, kwargs=kwargs or None)
+
+
+def environment(**options):
+    env = Environment(**options)
+    env.globals.update({
+        'static': static,
+        'thumbnail': thumbnail,
+        'url': url,
+    })
+    env.filters.update({
+        'date_format': date_format,
+        'margin': margin,
+    })
+    return env
@@ -0,0 +1,81 @@
+"""Фоновые задачи: реестр, постановка в очередь и выполнение.
+
+Задача — функция, зарегистрированная декоратором register. Она
+получает объект Job и параметры из enqueue и обычно обрабатывает
+записи пачками через run_in_chunks: каждая пачка — отдельная
+транзакция, после неё сохраняется прогресс, видный в админке.
+Выполняет задачи команда run_jobs.
+"""
+import json
+import logging
+import time
+import traceback
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+TASKS = {}
+
+
+def register(name):
+    def decorator(func):
+        TASKS[name] = func
+        return func
+    return decorator
+
+
+def enqueue(name, created_by=None, **params):
+    if name not in TASKS:
+        raise KeyError(f'Неизвестная задача: {name}')
+    return Job.objects.create(name=name, params=json.dumps(params),
+                              created_by=created_by)
+
+
+def run_in_chunks(job, items, handler, chunk_size=100, pause=0):
+    """Вызывает handler для пачек items, каждую в своей транзакции.
+
+    pause — сколько секунд ждать между пачками, чтобы другие процессы
+    успели записать в базу (SQLite блокирует её целиком).
+    """
+    items = list(items)
+    Job.objects.filter(pk=job.pk).update(total=len(items))
+    for start in range(0, len(items), chunk_size):
+        if start and pause:
+            time.sleep(pause)
+        chunk = items[start:start + chunk_size]
+        with transaction.atomic():
+            handler(chunk)
+            Job.objects.filter(pk=job.pk).update(
+                processed=F('processed') + len(chunk))
+
+
+def claim_job():
+    """Забирает самую старую задачу из очереди или возвращает None.
+
+    Условный UPDATE гарантирует, что задачу получит только один
+    из параллельно работающих обработчиков.
+    """
+    for pk in (Job.objects.filter(status=Job.PENDING).order_by('created')
+               .values_list('pk', flat=True)[:10]):
+        claimed = Job.objects.filter(pk=pk, status=Job.PENDING).update(
+            status=Job.RUNNING, started=timezone.now())
+        if claimed:
+            return Job.objects.get(pk=pk)
+    return None
+
+
+def run_job(job):
+    try:
+        TASKS[job.name](job, **job.kwargs())
+    except Exception:
+        logger.exception('Задача %s завершилась ошибкой', job)
+        status, error = Job.FAILED, traceback.format_exc()
+    else:
+        status, error = Job.DONE, ''
+    Job.objects.filter(pk=job.pk).update(
+        status=status, error=error, finished=timezone.now())
@@ -0,0 +1,79 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from core import schema
+
+
+class Command(BaseCommand):
+    help = (
+        'Создаёт схему пустой базы из снимка (SCHEMA_SNAPSHOT) вместо '
+        'прогона всех миграций, затем выполняет migrate. Непустая база '
+        'или устаревший снимок — обычный migrate.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--snapshot', default=settings.SCHEMA_SNAPSHOT,
+            help='Путь к снимку схемы.'
+        )
+        parser.add_argument(
+            '--update', action='store_true',
+            help='Пересоздать снимок из миграций.'
+        )
+        parser.add_argument(
+            '--check', action='store_true',
+            help='Сверить снимок с результатом migrate на пустой базе.'
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('Снимок схемы поддерживается только для '
+                               'SQLite, используйте migrate.')
+        path = options['snapshot']
+        if options['update']:
+            schema.write_snapshot(path)
+            self.stdout.write(f'Снимок записан: {path}')
+        elif options['check']:
+            self.check_snapshot(path)
+        else:
+            self.bootstrap(path, options['verbosity'])
+
+    def bootstrap(self, path, verbosity):
+        digest, script = schema.read_snapshot(path)
+        if not connection.introspection.table_names():
+            if digest == schema.migrations_digest():
+                schema.load_snapshot(script)
+                if verbosity:
+                    self.stdout.write('Схема создана из снимка.')
+            else:
+                self.stderr.write('Снимок схемы устарел, применяются '
+                                  'миграции. Обновите его: '
+                                  'bootstrap_schema --update')
+        # Досоздаёт права и типы содержимого (post_migrate)
+        schema.migrate(verbosity)
+
+    def check_snapshot(self, path):
+        digest, script = schema.read_snapshot(path)
+        if digest != schema.migrations_digest():
+            raise CommandError('Снимок схемы устарел: '
+                               'bootstrap_schema --update')
+        with schema.scratch_database():
+            schema.migrate()
+            expected = schema.describe_schema()
+            expected_applied = schema.applied_migrations()
+        with schema.scratch_database():
+            schema.load_snapshot(script)
+            actual = schema.describe_schema()
+            actual_applied = schema.applied_migrations()
+        differences = sorted(
+            table for table in expected.keys() | actual.keys()
+            if expected.get(table) != actual.get(table))
+        if differences:
+            raise CommandError('Снимок расходится с миграциями в таблицах: '
+                               + ', '.join(differences))
+        if expected_applied != actual_applied:
+            missing = sorted(expected_applied ^ actual_applied)
+            raise CommandError('Снимок расходится с миграциями в '
+                               f'отметках применения: {missing}')
+        self.stdout.write('Снимок схемы совпадает с миграциями.')
@@ -0,0 +1,30 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.jobs import claim_job, run_job
+
+
+class Command(BaseCommand):
+    help = 'Выполняет фоновые задачи из очереди (core.models.Job).'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Выйти, когда очередь опустеет.'
+        )
+        parser.add_argument(
+            '--sleep', type=float, default=2.0,
+            help='Пауза между проверками пустой очереди, в секундах.'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            job = claim_job()
+            if job is None:
+                if options['once']:
+                    return
+                time.sleep(options['sleep'])
+                continue
+            self.stdout.write(f'Задача {job}')
+            run_job(job)
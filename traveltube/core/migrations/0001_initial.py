@@ -0,0 +1,38 @@
+# Generated by Django 2.2.16 on 2026-10-19 15:09
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Job',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, verbose_name='задача')),
+                ('params', models.TextField(default='{}', verbose_name='параметры')),
+                ('status', models.CharField(choices=[('pending', 'в очереди'), ('running', 'выполняется'), ('done', 'готово'), ('failed', 'ошибка')], db_index=True, default='pending', max_length=10, verbose_name='статус')),
+                ('total', models.PositiveIntegerField(default=0, verbose_name='всего')),
+                ('processed', models.PositiveIntegerField(default=0, verbose_name='обработано')),
+                ('error', models.TextField(blank=True, verbose_name='ошибка')),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='создана')),
+                ('started', models.DateTimeField(blank=True, null=True, verbose_name='начата')),
+                ('finished', models.DateTimeField(blank=True, null=True, verbose_name='завершена')),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL, verbose_name='автор')),
+            ],
+            options={
+                'verbose_name': 'Фоновая задача',
+                'verbose_name_plural': 'Фоновые задачи',
+                'ordering': ('-created',),
+            },
+        ),
+    ]
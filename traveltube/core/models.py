@@ -1,3 +1,6 @@
+import json
+
+from django.conf import settings
 from django.db import models
 
 
@@ -8,3 +11,50 @@ class CreatedModel(models.Model):
 
     class Meta:
         abstract = True
+
+
+class Job(models.Model):
+    """Фоновая задача, выполняемая командой run_jobs (см. core.jobs)."""
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUSES = (
+        (PENDING, 'в очереди'),
+        (RUNNING, 'выполняется'),
+        (DONE, 'готово'),
+        (FAILED, 'ошибка'),
+    )
+
+    name = models.CharField('задача', max_length=100)
+    params = models.TextField('параметры', default='{}')
+    status = models.CharField('статус', max_length=10, choices=STATUSES,
+                              default=PENDING, db_index=True)
+    total = models.PositiveIntegerField('всего', default=0)
+    processed = models.PositiveIntegerField('обработано', default=0)
+    error = models.TextField('ошибка', blank=True)
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        blank=True, null=True,
+        verbose_name='автор',
+    )
+    created = models.DateTimeField('создана', auto_now_add=True)
+    started = models.DateTimeField('начата', blank=True, null=True)
+    finished = models.DateTimeField('завершена', blank=True, null=True)
+
+    class Meta:
+        ordering = ('-created',)
+        verbose_name = 'Фоновая задача'
+        verbose_name_plural = 'Фоновые задачи'
+
+    def __str__(self):
+        return f'{self.name} #{self.pk}'
+
+    def kwargs(self):
+        return json.loads(self.params)
+
+    def progress(self):
+        if not self.total:
+            return 100 if self.status == self.DONE else 0
+        return min(100, self.processed * 100 // self.total)
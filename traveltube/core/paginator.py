@@ -0,0 +1,53 @@
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+
+def estimated_count(model, using='default'):
+    """Приблизительное число строк таблицы из статистики планировщика.
+
+    PostgreSQL хранит его в pg_class.reltuples, SQLite — в sqlite_stat1
+    (заполняется командой ANALYZE). Если статистики нет, возвращает None.
+    """
+    connection = connections[using]
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute(
+                'SELECT reltuples FROM pg_class WHERE relname = %s', [table])
+        elif connection.vendor == 'sqlite':
+            cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'")
+            if cursor.fetchone() is None:
+                return None
+            # Первое число в stat — количество строк индекса; у частичных
+            # индексов оно меньше, поэтому берётся максимум
+            cursor.execute(
+                'SELECT MAX(CAST(stat AS INTEGER)) FROM sqlite_stat1 '
+                'WHERE tbl = %s', [table])
+        else:
+            return None
+        row = cursor.fetchone()
+    if row is None or not row[0] or row[0] < 0:
+        return None
+    return int(row[0])
+
+
+class EstimatedCountPaginator(Paginator):
+    """Пагинатор, не считающий COUNT(*) по большой таблице целиком.
+
+    Для выборки без фильтров число строк берётся из статистики базы,
+    если оно больше ESTIMATE_THRESHOLD; меньшие таблицы и выборки с
+    фильтрами считаются точно.
+    """
+    ESTIMATE_THRESHOLD = 100000
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        query = getattr(queryset, 'query', None)
+        if query is not None and not query.where:
+            estimate = estimated_count(queryset.model, queryset.db)
+            if estimate and estimate > self.ESTIMATE_THRESHOLD:
+                return estimate
+        return super().count
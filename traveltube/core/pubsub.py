@@ -0,0 +1,99 @@
+import asyncio
+import threading
+from collections import defaultdict
+from functools import lru_cache
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+
+class BaseBroker:
+    """Интерфейс брокера сообщений для живых обновлений.
+
+    publish() вызывается из синхронного кода Django, subscribe() — из
+    ASGI-приложения, unsubscribe() — из Subscription.close() при
+    отключении клиента. Брокер на Redis или другом сервере реализует те
+    же четыре метода: publish, subscribe, unsubscribe и has_subscribers.
+    """
+
+    def publish(self, channel, message):
+        raise NotImplementedError
+
+    def subscribe(self, *channels):
+        raise NotImplementedError
+
+    def unsubscribe(self, subscription):
+        raise NotImplementedError
+
+    def has_subscribers(self, channel):
+        return True
+
+
+class Subscription:
+    """Очередь сообщений одного подписчика, читается через await get()."""
+
+    def __init__(self, broker, channels, queue_size):
+        self.broker = broker
+        self.channels = channels
+        self.loop = asyncio.get_event_loop()
+        self.queue = asyncio.Queue(maxsize=queue_size)
+
+    def put(self, message):
+        self.loop.call_soon_threadsafe(self._put, message)
+
+    def _put(self, message):
+        # Медленный клиент не должен копить память: старые сообщения
+        # вытесняются новыми.
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(message)
+
+    async def get(self):
+        return await self.queue.get()
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class LocalBroker(BaseBroker):
+    """Брокер в памяти процесса: работает без Redis.
+
+    Доставляет сообщения только подписчикам того же процесса, поэтому
+    подходит для разработки и развёртывания в один ASGI-процесс.
+    """
+
+    def __init__(self, queue_size=100):
+        self.queue_size = queue_size
+        self._lock = threading.Lock()
+        self._subscriptions = defaultdict(set)
+
+    def publish(self, channel, message):
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(channel, ()))
+        for subscription in subscriptions:
+            subscription.put(message)
+
+    def subscribe(self, *channels):
+        subscription = Subscription(self, channels, self.queue_size)
+        with self._lock:
+            for channel in channels:
+                self._subscriptions[channel].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            for channel in subscription.channels:
+                subscribers = self._subscriptions.get(channel)
+                if subscribers is None:
+                    continue
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscriptions[channel]
+
+    def has_subscribers(self, channel):
+        return channel in self._subscriptions
+
+
+@lru_cache(maxsize=None)
+def get_broker():
+    return import_string(settings.LIVE_BROKER)()
@@ -0,0 +1,203 @@
+"""Бюджет SQL-запросов для представлений и участков кода.
+
+    @query_budget(max_queries=6)
+    def index(request): ...
+
+    with query_budget(max_queries=2, max_time=0.05):
+        ...
+
+Кроме числа запросов и суммарного времени SQL проверяются повторы:
+запросы, отличающиеся только параметрами (одинаковый отпечаток),
+выполненные больше max_repeats раз, — это почти всегда N+1. В отчёте
+для каждого повтора указаны шаблоны и строки кода проекта, откуда он
+выполнен.
+
+Что делать с нарушением, решает QUERY_BUDGET_ACTION: raise — бросить
+QueryBudgetExceeded (тесты), log — предупреждение в лог (DEBUG),
+off — не считать запросы вовсе.
+"""
+import logging
+import os
+import re
+import sys
+import time
+from collections import Counter
+from functools import wraps
+
+from django.conf import settings
+from django.db import connections
+from django.template.base import Node
+
+logger = logging.getLogger(__name__)
+
+FINGERPRINT_RULES = (
+    (re.compile(r"'(?:[^']|'')*'"), '?'),
+    (re.compile(r'\b\d+(?:\.\d+)?\b'), '?'),
+    (re.compile(r'\bIN \((?:\s*(?:\?|%s)\s*,?)+\)', re.IGNORECASE),
+     'IN (...)'),
+    (re.compile(r'\s+'), ' '),
+)
+SAVEPOINT = re.compile(r'(RELEASE |ROLLBACK TO )?SAVEPOINT ')
+SITE_PACKAGES = f'{os.sep}site-packages{os.sep}'
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+def fingerprint(sql):
+    """SQL без значений параметров: одинаков у запросов N+1."""
+    for pattern, replacement in FINGERPRINT_RULES:
+        sql = pattern.sub(replacement, sql)
+    return sql.strip()
+
+
+def query_origin():
+    """Шаблоны и строки кода проекта в текущем стеке, изнутри наружу."""
+    templates, code = [], []
+    frame = sys._getframe(2)
+    while frame is not None:
+        node = frame.f_locals.get('self')
+        # type(), а не isinstance: isinstance вычислил бы ленивые
+        # объекты вроде request.user и выполнил бы новый запрос
+        if issubclass(type(node), Node) and getattr(node, 'origin', None):
+            # Из вложенных тегов одного шаблона нужен самый внутренний
+            name = node.origin.template_name or node.origin.name
+            if not templates or not templates[-1].startswith(f'{name}:'):
+                templates.append(f'{name}:{node.token.lineno}')
+        filename = frame.f_code.co_filename
+        if (filename.startswith(settings.BASE_DIR)
+                and SITE_PACKAGES not in filename
+                and filename != __file__):
+            code.append(f'{os.path.relpath(filename, settings.BASE_DIR)}:'
+                        f'{frame.f_lineno} in {frame.f_code.co_name}')
+        elif filename.endswith('.html'):
+            # Шаблоны Jinja2 компилируются с именем файла шаблона
+            code.append(f'{filename}:{frame.f_lineno}')
+        frame = frame.f_back
+    return templates, code
+
+
+class QueryBudget:
+    """Контекстный менеджер и декоратор с лимитами на запросы."""
+
+    def __init__(self, max_queries=None, max_time=None, max_repeats=None,
+                 name=None, using='default'):
+        self.max_queries = max_queries
+        self.max_time = max_time
+        self.max_repeats = max_repeats
+        self.name = name
+        self.using = using
+        self.queries = []
+
+    def copy(self, **changes):
+        options = {
+            'max_queries': self.max_queries,
+            'max_time': self.max_time,
+            'max_repeats': self.max_repeats,
+            'name': self.name,
+            'using': self.using,
+        }
+        options.update(changes)
+        return type(self)(**options)
+
+    def __call__(self, func):
+        name = self.name or f'{func.__module__}.{func.__qualname__}'
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with self.copy(name=name):
+                return func(*args, **kwargs)
+        wrapper.query_budget = self
+        return wrapper
+
+    def __enter__(self):
+        self.action = settings.QUERY_BUDGET_ACTION
+        self.queries = []
+        if self.action != 'off':
+            self._wrapper = connections[self.using].execute_wrapper(
+                self.record)
+            self._wrapper.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.action == 'off':
+            return
+        self._wrapper.__exit__(exc_type, exc_value, traceback)
+        if exc_type is not None:
+            return
+        problems = self.problems()
+        if not problems:
+            return
+        report = self.report(problems)
+        if self.action == 'raise':
+            raise QueryBudgetExceeded(report)
+        logger.warning(report)
+
+    def record(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            templates, code = query_origin()
+            self.queries.append({
+                'sql': sql,
+                'time': time.perf_counter() - start,
+                'templates': templates,
+                'code': code,
+            })
+
+    @property
+    def total_time(self):
+        return sum(query['time'] for query in self.queries)
+
+    def counted(self):
+        """Запросы без точек сохранения и обращений к
+        QUERY_BUDGET_IGNORE_TABLES."""
+        return [query for query in self.queries
+                if not SAVEPOINT.match(query['sql'])
+                and not any(table in query['sql']
+                            for table in settings.QUERY_BUDGET_IGNORE_TABLES)]
+
+    def repeated(self):
+        """Отпечатки, выполненные больше max_repeats раз."""
+        limit = self.max_repeats
+        if limit is None:
+            limit = settings.QUERY_BUDGET_MAX_REPEATS
+        counts = Counter(fingerprint(query['sql'])
+                         for query in self.counted())
+        return [(sql, count) for sql, count in counts.most_common()
+                if count > limit]
+
+    def problems(self):
+        problems = []
+        count = len(self.counted())
+        if self.max_queries is not None and count > self.max_queries:
+            problems.append(f'{count} запросов (лимит {self.max_queries})')
+        max_time = self.max_time
+        if max_time is None:
+            max_time = settings.QUERY_BUDGET_MAX_TIME
+        if self.total_time > max_time:
+            problems.append(f'{self.total_time * 1000:.1f} мс SQL '
+                            f'(лимит {max_time * 1000:.1f} мс)')
+        for sql, count in self.repeated():
+            problems.append(f'{count}× {sql}')
+        return problems
+
+    def report(self, problems):
+        lines = [f'Бюджет запросов превышен: {self.name or "блок кода"}']
+        for problem in problems:
+            lines.append(f'  {problem}')
+        for sql, count in self.repeated():
+            first = next(query for query in self.queries
+                         if fingerprint(query['sql']) == sql)
+            lines.append(f'  Повтор ({count}×) выполнен из:')
+            if first['templates']:
+                lines.append(
+                    f'    шаблон: {" <- ".join(first["templates"])}')
+            for place in first['code']:
+                lines.append(f'    {place}')
+        return '\n'.join(lines)
+
+
+query_budget = QueryBudget
@@ -0,0 +1,91 @@
+"""Ограничение частоты запросов по алгоритму token bucket.
+
+Корзина вмещает limit жетонов и пополняется со скоростью limit за period
+секунд; каждый запрос забирает жетон. Состояние корзин хранится в кеше
+RATELIMIT_CACHE, поэтому при общем кеше (memcached, redis) лимит общий
+для всех процессов. Чтение и запись не атомарны: при гонке несколько
+запросов сверх лимита могут пройти, для защиты от потока записей этого
+достаточно.
+"""
+import math
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+
+RETRY_MESSAGE = 'Слишком много запросов. Повторите через {} с.'
+
+
+def client_ip(request):
+    """Адрес клиента из RATELIMIT_IP_HEADER.
+
+    Левые адреса X-Forwarded-For присылает сам клиент, поэтому берётся
+    адрес, дописанный последним из RATELIMIT_TRUSTED_PROXIES доверенных
+    прокси, — считая с конца списка.
+    """
+    value = request.META.get(settings.RATELIMIT_IP_HEADER, '')
+    addresses = [address.strip() for address in value.split(',')
+                 if address.strip()]
+    if not addresses:
+        return request.META.get('REMOTE_ADDR', '')
+    hops = max(settings.RATELIMIT_TRUSTED_PROXIES, 1)
+    return addresses[-min(hops, len(addresses))]
+
+
+def bucket_keys(request, scope):
+    """Корзины запроса: по IP и, для вошедших, по пользователю."""
+    keys = [f'ratelimit:{scope}:ip:{client_ip(request)}']
+    if request.user.is_authenticated:
+        keys.append(f'ratelimit:{scope}:user:{request.user.pk}')
+    return keys
+
+
+def take_token(keys, limit, period, now=None):
+    """Забирает по жетону из каждой корзины.
+
+    Возвращает 0, если запрос разрешён, иначе число секунд до
+    появления жетона. Все корзины читаются и пишутся за одно
+    обращение к кешу.
+    """
+    cache = caches[settings.RATELIMIT_CACHE]
+    now = now or time.time()
+    rate = limit / period
+    buckets = cache.get_many(keys)
+    wait = 0
+    updated = {}
+    for key in keys:
+        tokens, stamp = buckets.get(key, (limit, now))
+        tokens = min(limit, tokens + (now - stamp) * rate)
+        if tokens < 1:
+            wait = max(wait, (1 - tokens) / rate)
+        updated[key] = (tokens, now)
+    if not wait:
+        updated = {key: (tokens - 1, stamp)
+                   for key, (tokens, stamp) in updated.items()}
+    cache.set_many(updated, math.ceil(period))
+    return wait
+
+
+def ratelimit(scope, methods=('POST',)):
+    """Декоратор представления с лимитом RATELIMITS[scope] = (limit, period).
+
+    Считаются только запросы с методами из methods (None — все). При
+    превышении лимита возвращается 429 с заголовком Retry-After.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            limits = settings.RATELIMITS.get(scope)
+            if limits and (methods is None or request.method in methods):
+                wait = take_token(bucket_keys(request, scope), *limits)
+                if wait:
+                    seconds = math.ceil(wait)
+                    response = HttpResponse(RETRY_MESSAGE.format(seconds),
+                                            status=429)
+                    response['Retry-After'] = str(seconds)
+                    return response
+            return view(request, *args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,18 @@
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+
+class TestRunner(DiscoverRunner):
+    """`manage.py test` с QUERY_BUDGET_ACTION = 'raise'.
+
+    Под pytest то же делает фикстура enforce_query_budget.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self.query_budget = override_settings(QUERY_BUDGET_ACTION='raise')
+        self.query_budget.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self.query_budget.disable()
+        super().teardown_test_environment(**kwargs)
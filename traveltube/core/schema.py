@@ -0,0 +1,137 @@
+"""Снимок схемы SQLite для быстрого развёртывания пустой базы.
+
+Новая база (CI, свежая реплика, тесты) не прогоняет миграции по одной,
+а выполняет готовый CREATE-скрипт и отмечает все миграции графа
+применёнными. Первая строка снимка — отпечаток файлов миграций и версии
+Django: если миграции изменились, а снимок нет, он не используется.
+
+Снимок обновляет и сверяет с результатом migrate команда
+bootstrap_schema.
+"""
+import hashlib
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+
+import django
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.db.migrations.loader import MigrationLoader
+from django.db.migrations.recorder import MigrationRecorder
+
+DIGEST_PREFIX = '-- migrations: '
+
+
+def migrations_digest():
+    """Отпечаток всех файлов миграций на диске."""
+    loader = MigrationLoader(None, ignore_no_migrations=True)
+    digest = hashlib.sha256(django.get_version().encode())
+    for key in sorted(loader.disk_migrations):
+        module = sys.modules[loader.disk_migrations[key].__module__]
+        with open(module.__file__, 'rb') as file:
+            # Не зависит от core.autocrlf в рабочей копии
+            digest.update(file.read().replace(b'\r\n', b'\n'))
+    return digest.hexdigest()[:16]
+
+
+@contextmanager
+def database_file(name):
+    """Временно направляет соединение default в другой файл SQLite."""
+    original_name = connection.settings_dict['NAME']
+    connection.close()
+    connection.settings_dict['NAME'] = name
+    try:
+        yield
+    finally:
+        connection.close()
+        connection.settings_dict['NAME'] = original_name
+
+
+@contextmanager
+def scratch_database():
+    with tempfile.TemporaryDirectory() as directory:
+        with database_file(os.path.join(directory, 'db.sqlite3')):
+            yield
+
+
+def migrate(verbosity=0):
+    call_command('migrate', run_syncdb=True, interactive=False,
+                 verbosity=verbosity)
+
+
+def schema_statements():
+    """CREATE-выражения текущей базы в порядке создания."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT sql FROM sqlite_master WHERE sql IS NOT NULL "
+            "AND name NOT LIKE 'sqlite_%' ORDER BY rowid")
+        return [row[0] for row in cursor.fetchall()]
+
+
+def describe_schema():
+    """Структура таблиц без учёта порядка колонок и текста DDL."""
+    schema = {}
+    with connection.cursor() as cursor:
+        for table in connection.introspection.table_names(cursor):
+            cursor.execute(f'PRAGMA table_info("{table}")')
+            columns = sorted(row[1:] for row in cursor.fetchall())
+            cursor.execute(f'PRAGMA foreign_key_list("{table}")')
+            foreign_keys = sorted(row[2:5] for row in cursor.fetchall())
+            cursor.execute(f'PRAGMA index_list("{table}")')
+            indexes = []
+            for _, name, unique, origin, partial in cursor.fetchall():
+                cursor.execute(f'PRAGMA index_info("{name}")')
+                fields = tuple(row[2] for row in cursor.fetchall())
+                indexes.append((name, unique, origin, partial, fields))
+            schema[table] = {
+                'columns': columns,
+                'foreign_keys': foreign_keys,
+                'indexes': sorted(indexes),
+            }
+    return schema
+
+
+def applied_migrations():
+    return set(MigrationRecorder(connection).applied_migrations())
+
+
+def write_snapshot(path):
+    """Пишет снимок схемы, полученной миграциями с нуля."""
+    with scratch_database():
+        migrate()
+        statements = schema_statements()
+    with open(path, 'w', encoding='utf-8', newline='\n') as file:
+        file.write(f'{DIGEST_PREFIX}{migrations_digest()}\n')
+        for statement in statements:
+            file.write(f'{statement};\n')
+
+
+def read_snapshot(path):
+    """Отпечаток миграций и скрипт снимка или (None, None)."""
+    if not os.path.exists(path):
+        return None, None
+    with open(path, encoding='utf-8') as file:
+        header = file.readline().strip()
+        script = file.read()
+    if not header.startswith(DIGEST_PREFIX):
+        return None, None
+    return header[len(DIGEST_PREFIX):], script
+
+
+def load_snapshot(script):
+    """Создаёт схему из снимка и отмечает миграции применёнными.
+
+    Объединённые (squashed) миграции отмечаются вместе с заменёнными,
+    как после migrate.
+    """
+    connection.ensure_connection()
+    connection.connection.executescript(script)
+    loader = MigrationLoader(None, ignore_no_migrations=True)
+    applied = set(loader.disk_migrations)
+    for migration in loader.disk_migrations.values():
+        applied.update(migration.replaces)
+    recorder = MigrationRecorder(connection)
+    with transaction.atomic():
+        for app_label, name in sorted(applied):
+            recorder.record_applied(app_label, name)
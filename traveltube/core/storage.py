@@ -0,0 +1,75 @@
+import hashlib
+import os
+import posixpath
+import re
+import tempfile
+
+from django.core.files.move import file_move_safe
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
+
+HASHED_NAME_RE = re.compile(r'(^|/)[0-9a-f]{2}/[0-9a-f]{64}(\.\w+)?$')
+
+
+def content_hash(content):
+    """SHA-256 содержимого файла.
+
+    ImageUploadHandler считает хеш при загрузке и сохраняет его в
+    атрибуте sha256, тогда файл повторно не читается.
+    """
+    digest = getattr(content, 'sha256', None)
+    if digest:
+        return digest
+    hasher = hashlib.sha256()
+    for chunk in content.chunks():
+        hasher.update(chunk)
+    content.seek(0)
+    return hasher.hexdigest()
+
+
+def is_hashed_name(name):
+    return HASHED_NAME_RE.search(name) is not None
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """Хранилище, называющее файлы по SHA-256 их содержимого.
+
+    posts/photo.jpg сохраняется как posts/ab/ab12...ef.jpg. Одинаковые
+    файлы получают одно имя и хранятся один раз, поэтому удалять файл
+    можно только когда на него не осталось ссылок (см. posts.media).
+    """
+
+    def hashed_name(self, name, content):
+        directory, filename = posixpath.split(name)
+        extension = os.path.splitext(filename)[1].lower()
+        digest = content_hash(content)
+        return posixpath.join(directory, digest[:2], digest + extension)
+
+    def get_available_name(self, name, max_length=None):
+        # Имя определяется содержимым: совпадение имён — это дубликат.
+        return name
+
+    def _save(self, name, content):
+        name = self.hashed_name(name, content)
+        if self.exists(name):
+            # Свежая дата изменения защищает файл от collect_media, пока
+            # ссылка на него ещё не сохранена в базе.
+            os.utime(self.path(name))
+            return name
+        full_path = self.path(name)
+        directory = os.path.dirname(full_path)
+        os.makedirs(directory, exist_ok=True)
+        # Файл появляется под итоговым именем атомарно: параллельная
+        # загрузка того же содержимого просто перезапишет его копией.
+        if hasattr(content, 'temporary_file_path'):
+            file_move_safe(content.temporary_file_path(), full_path,
+                           allow_overwrite=True)
+        else:
+            with tempfile.NamedTemporaryFile(dir=directory,
+                                             delete=False) as file:
+                for chunk in content.chunks():
+                    file.write(chunk)
+            os.replace(file.name, full_path)
+        os.chmod(full_path, self.file_permissions_mode or 0o644)
+        return name
@@ -0,0 +1,55 @@
+"""Загрузчик шаблонов, встраивающий частые {% include %} при загрузке.
+
+Вместо поиска и рендеринга отдельного шаблона на каждой итерации цикла
+текст шаблонов из TEMPLATE_INLINE_INCLUDES подставляется прямо в
+включающий шаблон. Переменные из include ... with превращаются в блок
+{% with %}. Include с only или с именем из переменной не трогаются.
+Предназначен для работы внутри cached.Loader.
+"""
+import re
+
+from django.conf import settings
+from django.template import TemplateDoesNotExist
+from django.template.loaders.base import Loader as BaseLoader
+
+INCLUDE_RE = re.compile(
+    r'{%\s*include\s+(?P<quote>[\'"])(?P<name>[^\'"]+)(?P=quote)'
+    r'(?:\s+with\s+(?P<extra>.*?))?\s*%}'
+)
+
+
+class Loader(BaseLoader):
+
+    def __init__(self, engine, loaders):
+        super().__init__(engine)
+        self.loaders = engine.get_template_loaders(loaders)
+
+    def get_template_sources(self, template_name):
+        for loader in self.loaders:
+            yield from loader.get_template_sources(template_name)
+
+    def get_contents(self, origin):
+        return self.inline(origin.loader.get_contents(origin), [origin.name])
+
+    def find_contents(self, template_name):
+        for origin in self.get_template_sources(template_name):
+            try:
+                return origin.loader.get_contents(origin)
+            except TemplateDoesNotExist:
+                continue
+        raise TemplateDoesNotExist(template_name)
+
+    def inline(self, source, chain):
+        def replace(match):
+            name = match.group('name')
+            extra = match.group('extra')
+            if (name not in settings.TEMPLATE_INLINE_INCLUDES
+                    or name in chain
+                    or (extra and re.search(r'\bonly$', extra))):
+                return match.group(0)
+            content = self.inline(self.find_contents(name), chain + [name])
+            if extra:
+                return f'{{% with {extra} %}}{content}{{% endwith %}}'
+            return content
+
+        return INCLUDE_RE.sub(replace, source)
@@ -1,6 +1,9 @@
 from http import HTTPStatus
 
 from django.shortcuts import render
+from django.views.static import serve
+
+from core.storage import is_hashed_name
 
 
 def page_not_found(request, exception):
@@ -10,3 +13,11 @@ def page_not_found(request, exception):
 
 def csrf_failure(request, reason=''):
     return render(request, 'core/403csrf.html')
+
+
+def serve_media(request, path, document_root=None):
+    """Отдаёт медиафайл; файлы с хешем в имени кешируются навсегда."""
+    response = serve(request, path, document_root)
+    if response.status_code == HTTPStatus.OK and is_hashed_name(path):
+        response['Cache-Control'] = 'public, max-age=31536000, immutable'
+    return response
@@ -1,14 +1,38 @@
-from django.contrib import admin
-from django.utils.safestring import mark_safe
+from django import forms
+from django.contrib import admin, messages
+from django.contrib.admin.helpers import ActionForm
+from django.urls import reverse
+from django.utils.html import format_html
+from sorl.thumbnail import get_thumbnail
 
+from core.jobs import enqueue
+from core.paginator import EstimatedCountPaginator
+from users.cache import invalidate
+
+from .fragments import invalidate_fragments
 from .models import Comment, Follow, Group, Post, PostImage
 
 
+class ScalableAdmin(admin.ModelAdmin):
+    """Список без COUNT(*) по всей таблице: число строк берётся из
+    статистики базы, общее число записей при фильтрации не считается."""
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+
+class PostActionForm(ActionForm):
+    group = forms.SlugField(
+        label='Группа (slug)', required=False,
+        help_text='Для действия «Перенести в группу»',
+    )
+
+
 class PostImagesAdmin(admin.StackedInline):
     model = PostImage
+    raw_id_fields = ('image',)
 
 
-class PostAdmin(admin.ModelAdmin):
+class PostAdmin(ScalableAdmin):
     inlines = [PostImagesAdmin]
     list_display = (
         'pk',
@@ -16,31 +40,122 @@ class PostAdmin(admin.ModelAdmin):
         'pub_date',
         'author',
         'group',
-        'image_show'
+        'image_show',
+        'is_deleted',
     )
+    list_select_related = ('author', 'group')
+    raw_id_fields = ('author',)
+    autocomplete_fields = ('group',)
 
     def image_show(self, obj):
-        if obj.image:
-            return mark_safe("<img src='{}' width='60' />"
-                             .format(obj.image.url))
-        return None
+        if not obj.image:
+            return None
+        try:
+            thumbnail = get_thumbnail(obj.image, '60x60', crop='center')
+        except Exception:
+            return None
+        return format_html("<img src='{}' width='60' />", thumbnail.url)
 
     image_show.__name__ = "Картинка"
     list_editable = ('group',)
     search_fields = ('text',)
-    list_filter = ('pub_date',)
+    list_filter = ('pub_date', 'is_deleted')
     empty_value_display = '-пусто-'
+    # Массовые действия выполняются фоновыми задачами (команда run_jobs)
+    action_form = PostActionForm
+    actions = ('delete_in_background', 'reassign_group',
+               'regenerate_thumbnails')
+
+    def get_queryset(self, request):
+        # В админке видны и удалённые, но ещё не вычищенные посты
+        return Post.all_objects.all()
+
+    def get_actions(self, request):
+        actions = super().get_actions(request)
+        # Синхронное удаление тысяч постов с каскадом не укладывается
+        # во время запроса
+        actions.pop('delete_selected', None)
+        return actions
+
+    def enqueue_job(self, request, queryset, name, **params):
+        ids = list(queryset.values_list('pk', flat=True))
+        job = enqueue(name, created_by=request.user, ids=ids, **params)
+        url = reverse('admin:core_job_change', args=[job.pk])
+        self.message_user(request, format_html(
+            'Задача <a href="{}">{}</a> для {} постов поставлена в очередь',
+            url, job, len(ids),
+        ))
+
+    def delete_in_background(self, request, queryset):
+        # Посты сразу пропадают из лент, строки вычищает задача
+        queryset.update(is_deleted=True)
+        author_ids = set(queryset.values_list('author_id', flat=True))
+        for author_id in author_ids:
+            invalidate(author_id)
+        invalidate_fragments(
+            author_ids, set(queryset.values_list('group_id', flat=True)))
+        self.enqueue_job(request, queryset, 'delete_posts')
+
+    def delete_model(self, request, obj):
+        obj.is_deleted = True
+        obj.save(update_fields=['is_deleted', 'updated'])
+        enqueue('delete_posts', created_by=request.user, ids=[obj.pk])
+
+    delete_in_background.short_description = 'Удалить (в фоне)'
+    delete_in_background.allowed_permissions = ('delete',)
+
+    def reassign_group(self, request, queryset):
+        slug = request.POST.get('group')
+        group = Group.objects.filter(slug=slug).first()
+        if group is None:
+            self.message_user(request, f'Группа «{slug}» не найдена',
+                              messages.ERROR)
+            return
+        self.enqueue_job(request, queryset, 'reassign_group',
+                         group_id=group.pk)
+
+    reassign_group.short_description = 'Перенести в группу (в фоне)'
+    reassign_group.allowed_permissions = ('change',)
+
+    def regenerate_thumbnails(self, request, queryset):
+        self.enqueue_job(request, queryset, 'regenerate_thumbnails')
+
+    regenerate_thumbnails.short_description = 'Пересоздать миниатюры (в фоне)'
+    regenerate_thumbnails.allowed_permissions = ('change',)
 
 
 @admin.register(PostImage)
-class PostImagesAdmin(admin.ModelAdmin):
+class PostImagesAdmin(ScalableAdmin):
     list_display = (
         'image',
         'post',
     )
+    list_select_related = ('image', 'post')
+    raw_id_fields = ('image', 'post')
+
+
+@admin.register(Group)
+class GroupAdmin(admin.ModelAdmin):
+    list_display = ('title', 'slug')
+    search_fields = ('title', 'slug')
+    prepopulated_fields = {'slug': ('title',)}
+
+
+@admin.register(Comment)
+class CommentAdmin(ScalableAdmin):
+    list_display = ('pk', 'text', 'author', 'post', 'pub_date')
+    list_select_related = ('author', 'post')
+    raw_id_fields = ('author', 'post')
+    search_fields = ('text',)
+    list_filter = ('pub_date',)
+
+
+@admin.register(Follow)
+class FollowAdmin(ScalableAdmin):
+    list_display = ('user', 'author')
+    list_select_related = ('user', 'author')
+    raw_id_fields = ('user', 'author')
+    search_fields = ('user__username', 'author__username')
 
 
 admin.site.register(Post, PostAdmin)
-admin.site.register(Group)
-admin.site.register(Comment)
-admin.site.register(Follow)
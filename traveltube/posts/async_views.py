@@ -0,0 +1,100 @@
+"""Асинхронные варианты страниц ленты для запуска через ASGI.
+
+Запросы к базе и рендеринг шаблонов выполняются в ограниченном пуле
+потоков (core.executor), независимые запросы идут параллельно.
+"""
+import asyncio
+
+from django.shortcuts import get_object_or_404, render
+
+from core.executor import run_sync
+from posts.services import add_page_links, make_pages
+from traveltube.settings import NUMBER_POSTS
+from users.cache import get_author_or_404, user_summary
+
+from .forms import CommentForm
+from .models import Follow, Group, Post
+
+
+def fetch_page(request, post_list, **kwargs):
+    page_obj = make_pages(request, post_list, NUMBER_POSTS, **kwargs)
+    page_obj.object_list = list(page_obj.object_list)
+    return page_obj
+
+
+def is_following(user, author):
+    return user.is_authenticated and Follow.objects.filter(
+        user=user, author=author
+    ).exists()
+
+
+def load_user(request):
+    # request.user ленивый и читает сессию из базы — вычисляем его
+    # в пуле, а не в цикле событий.
+    return request.user.is_authenticated and request.user
+
+
+async def index(request):
+    posts = Post.objects.select_related('author', 'group')
+    page_obj = await run_sync(fetch_page, request, posts)
+    context = {
+        'page_obj': page_obj,
+    }
+    response = await run_sync(render, request, 'posts/index.html', context)
+    return add_page_links(request, response, page_obj)
+
+
+async def group_posts(request, slug):
+    group = await run_sync(get_object_or_404, Group, slug=slug)
+    post_list = group.posts.select_related('author')
+    page_obj = await run_sync(fetch_page, request, post_list)
+    context = {
+        'page_obj': page_obj,
+        'group': group,
+    }
+    response = await run_sync(render, request, 'posts/group_list.html',
+                              context)
+    return add_page_links(request, response, page_obj)
+
+
+async def profile(request, username):
+    author, _ = await asyncio.gather(
+        run_sync(get_author_or_404, username),
+        run_sync(load_user, request),
+    )
+    page_obj, following = await asyncio.gather(
+        run_sync(fetch_page, request, author.posts.select_related('group'),
+                 count=author.summary['posts_count'],
+                 first_ids=author.summary['post_ids']),
+        run_sync(is_following, request.user, author),
+    )
+    context = {
+        'author': author,
+        'page_obj': page_obj,
+        'following': following,
+        'posts_count': author.summary['posts_count'],
+    }
+    response = await run_sync(render, request, 'posts/profile.html', context)
+    return add_page_links(request, response, page_obj)
+
+
+async def post_detail(request, post_id):
+    post = await run_sync(
+        get_object_or_404,
+        Post.objects.select_related('author', 'group'),
+        pk=post_id,
+    )
+    comments, images, summary, _ = await asyncio.gather(
+        run_sync(list, post.comments.select_related('author')),
+        run_sync(list, post.images.all()),
+        run_sync(user_summary, post.author.username),
+        run_sync(load_user, request),
+    )
+    context = {
+        'post': post,
+        'form': CommentForm(request.POST or None),
+        'comments': comments,
+        'post_images': images,
+        'author_posts_count': summary['posts_count'],
+    }
+    return await run_sync(render, request, 'posts/post_detail.html', context)
@@ -0,0 +1,57 @@
+"""Кеш HTML-карточек постов для лент.
+
+Карточка зависит только от самого поста, поэтому ключ составляется из
+id поста, времени его изменения и версии шаблона карточки. Отредактированный
+пост получает новый ключ, а старая запись просто истекает. Все карточки
+страницы читаются одним cache.get_many, рендерятся только промахи, а
+записи их миниатюр заранее читаются одним запросом (posts.thumbnails).
+"""
+import hashlib
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.cache import cache
+from django.template.loader import get_template
+
+from .thumbnails import CARD_THUMBNAIL, warm_kvstore
+
+
+def card_template(template_name):
+    """Шаблон карточки из движка FEED_TEMPLATE_ENGINE."""
+    return get_template(template_name, using=settings.FEED_TEMPLATE_ENGINE)
+
+
+@lru_cache(maxsize=None)
+def template_version(engine, template_name):
+    """Версия шаблона: меняется при правке файла и при смене
+    POST_CARD_CACHE_VERSION."""
+    with open(card_template(template_name).origin.name, 'rb') as file:
+        digest = hashlib.md5(file.read()).hexdigest()[:8]
+    return f'{engine}.{settings.POST_CARD_CACHE_VERSION}.{digest}'
+
+
+def card_key(post, template_name):
+    version = template_version(settings.FEED_TEMPLATE_ENGINE, template_name)
+    return (f'post_card:{template_name}:{version}:'
+            f'{post.pk}:{post.updated.timestamp()}')
+
+
+def render_cards(posts, template_name):
+    """Возвращает список пар (пост, HTML карточки)."""
+    posts = list(posts)
+    keys = [card_key(post, template_name) for post in posts]
+    cached = cache.get_many(keys)
+    # Записи миниатюр для карточек, которые придётся рендерить
+    warm_kvstore([post.image for post, key in zip(posts, keys)
+                  if key not in cached], *CARD_THUMBNAIL)
+    missing = {}
+    template = card_template(template_name)
+    cards = []
+    for post, key in zip(posts, keys):
+        html = cached.get(key)
+        if html is None:
+            html = missing[key] = template.render({'post': post})
+        cards.append((post, html))
+    if missing:
+        cache.set_many(missing, settings.POST_CARD_CACHE_TIMEOUT)
+    return cards
@@ -3,14 +3,39 @@ from django import forms
 from .models import Comment, Image, Post
 
 
+class MultipleFileInput(forms.ClearableFileInput):
+    # Начиная с Django 3.2.19 атрибут multiple требует этого флага.
+    # Все файлы поля забирает представление (request.FILES.getlist),
+    # форма по-прежнему проверяет первый
+    allow_multiple_selected = True
+
+    def value_from_datadict(self, data, files, name):
+        return files.get(name)
+
+
 class PostForm(forms.ModelForm):
-    images = forms.ImageField(widget=forms.ClearableFileInput(
+    images = forms.ImageField(widget=MultipleFileInput(
         attrs={'multiple': True}), required=False)
 
     class Meta:
         model = Post
         fields = ('image', 'text', 'group')
 
+    def clean(self):
+        cleaned_data = super().clean()
+        # Файлы, отклонённые ImageUploadHandler ещё при загрузке.
+        # Вместо MultiValueDict форме может прийти обычный словарь
+        getlist = getattr(self.files, 'getlist', None)
+        for name in self.files:
+            uploads = getlist(name) if getlist else [self.files[name]]
+            for upload in uploads:
+                error = getattr(upload, 'upload_error', None)
+                if error:
+                    self.errors.pop(name, None)
+                    self.add_error(name, error)
+                    break
+        return cleaned_data
+
     def clean_text(self):
         data = self.cleaned_data.get('text')
         if data is None:
@@ -0,0 +1,28 @@
+"""Версии кеша порций бесконечной прокрутки.
+
+Порция общей ленты кешируется под ключом с версией её области: feed,
+group:<id> или author:<id>. Любое изменение поста, влияющее на ленты
+(новый пост, правка, удаление, перенос в группу, удаление автора),
+записывает новую версию областей, и следующие запросы собирают порции
+заново, не дожидаясь FEED_FRAGMENT_CACHE_TIMEOUT.
+"""
+import time
+
+from django.core.cache import cache
+
+
+def version_key(scope):
+    return f'fragment:version:{scope}'
+
+
+def fragment_key(scope, cursor, per_page):
+    version = cache.get(version_key(scope), 0)
+    return f'fragment:{scope}:{version}:{cursor}:{per_page}'
+
+
+def invalidate_fragments(author_ids=(), group_ids=()):
+    scopes = ['feed']
+    scopes += [f'author:{author_id}' for author_id in author_ids]
+    scopes += [f'group:{group_id}' for group_id in group_ids if group_id]
+    version = time.time_ns()
+    cache.set_many({version_key(scope): version for scope in scopes}, None)
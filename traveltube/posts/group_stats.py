@@ -0,0 +1,112 @@
+"""Денормализованная статистика групп для каталога /groups/.
+
+Счётчики меняются на единицу при появлении, удалении и переносе поста
+между группами, поэтому каталогу не нужен GROUP BY по всем постам.
+Пост, помеченный удалённым, учитывается до окончательного удаления
+фоновой задачей (posts.purge).
+"""
+from collections import defaultdict
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Max, Q, Subquery
+
+from .models import GroupAuthorStats, GroupStats, Post, User
+
+TOP_AUTHORS = 3
+
+
+def _increment(model, lookup, delta):
+    if model.objects.filter(**lookup).update(
+            post_count=F('post_count') + delta):
+        return
+    if delta < 0:
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(post_count=delta, **lookup)
+    except IntegrityError:
+        model.objects.filter(**lookup).update(
+            post_count=F('post_count') + delta)
+
+
+def _refresh_top_authors(group_id):
+    usernames = (GroupAuthorStats.objects
+                 .filter(group_id=group_id, post_count__gt=0)
+                 .order_by('-post_count', 'author_id')
+                 .values_list('author__username', flat=True)[:TOP_AUTHORS])
+    GroupStats.objects.filter(group_id=group_id).update(
+        top_authors=','.join(usernames))
+
+
+def post_added(group_id, author_id, pub_date):
+    if group_id is None:
+        return
+    _increment(GroupStats, {'group_id': group_id}, 1)
+    GroupStats.objects.filter(
+        Q(last_post_date__lt=pub_date) | Q(last_post_date__isnull=True),
+        group_id=group_id,
+    ).update(last_post_date=pub_date)
+    _increment(GroupAuthorStats,
+               {'group_id': group_id, 'author_id': author_id}, 1)
+    _refresh_top_authors(group_id)
+
+
+def post_removed(group_id, author_id):
+    if group_id is None:
+        return
+    _increment(GroupStats, {'group_id': group_id}, -1)
+    GroupStats.objects.filter(group_id=group_id).update(
+        last_post_date=Subquery(Post.all_objects.filter(group_id=group_id)
+                                .order_by('-pub_date').values('pub_date')[:1])
+    )
+    _increment(GroupAuthorStats,
+               {'group_id': group_id, 'author_id': author_id}, -1)
+    _refresh_top_authors(group_id)
+
+
+def rebuild_group_stats(batch_size=1000):
+    """Пересчитывает статистику всех групп за один агрегирующий проход."""
+    totals = defaultdict(lambda: [0, None])
+    authors = defaultdict(list)
+    rows = (Post.all_objects.filter(group__isnull=False)
+            .values('group_id', 'author_id')
+            .annotate(posts=Count('pk'), last=Max('pub_date'))
+            .order_by())
+    for row in rows.iterator():
+        total = totals[row['group_id']]
+        total[0] += row['posts']
+        if total[1] is None or row['last'] > total[1]:
+            total[1] = row['last']
+        authors[row['group_id']].append((row['posts'], row['author_id']))
+
+    top = {
+        group_id: [author for _, author in sorted(
+            counts, key=lambda item: (-item[0], item[1]))[:TOP_AUTHORS]]
+        for group_id, counts in authors.items()
+    }
+    top_ids = list({author for ids in top.values() for author in ids})
+    usernames = {}
+    for start in range(0, len(top_ids), batch_size):
+        usernames.update(User.objects.filter(
+            pk__in=top_ids[start:start + batch_size]
+        ).values_list('pk', 'username'))
+
+    # bulk_create без batch_size: см. posts.media.rebuild_refcounts
+    with transaction.atomic():
+        GroupStats.objects.all().delete()
+        GroupAuthorStats.objects.all().delete()
+        GroupStats.objects.bulk_create((
+            GroupStats(
+                group_id=group_id, post_count=count, last_post_date=last,
+                top_authors=','.join(usernames[author]
+                                     for author in top[group_id]),
+            )
+            for group_id, (count, last) in totals.items()
+        ))
+        GroupAuthorStats.objects.bulk_create((
+            GroupAuthorStats(group_id=group_id, author_id=author_id,
+                             post_count=count)
+            for group_id, counts in authors.items()
+            for count, author_id in counts
+        ))
+    return len(totals)
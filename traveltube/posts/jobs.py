@@ -0,0 +1,54 @@
+"""Фоновые задачи для массовых действий в админках постов и
+пользователей."""
+from django.conf import settings
+from sorl.thumbnail import delete, get_thumbnail
+
+from core.jobs import register, run_in_chunks
+
+from . import purge
+from .models import Post
+from .thumbnails import CARD_THUMBNAIL
+
+# Миниатюры, которые строят карточки лент и список постов в админке
+THUMBNAILS = (
+    CARD_THUMBNAIL,
+    ('60x60', {'crop': 'center'}),
+)
+
+
+@register('delete_posts')
+def delete_posts(job, ids):
+    """Вычищает посты, уже помеченные удалёнными в админке."""
+    purge.delete_comments(ids)
+    # delete() по строкам: сигналы обновляют счётчики медиа и групп
+    run_in_chunks(
+        job, ids,
+        lambda chunk: Post.all_objects.filter(pk__in=chunk).delete(),
+        settings.JOB_CHUNK_SIZE, settings.PURGE_PAUSE,
+    )
+
+
+@register('purge_user')
+def purge_user(job, user_id):
+    purge.purge_user(user_id)
+
+
+@register('reassign_group')
+def reassign_group(job, ids, group_id):
+    def handler(chunk):
+        for post in Post.objects.filter(pk__in=chunk):
+            post.group_id = group_id
+            post.save(update_fields=['group', 'updated'])
+
+    run_in_chunks(job, ids, handler, settings.JOB_CHUNK_SIZE)
+
+
+@register('regenerate_thumbnails')
+def regenerate_thumbnails(job, ids):
+    def handler(chunk):
+        for post in Post.objects.filter(pk__in=chunk).exclude(image=''):
+            delete(post.image, delete_file=False)
+            for geometry, options in THUMBNAILS:
+                get_thumbnail(post.image, geometry, **options)
+
+    run_in_chunks(job, ids, handler, settings.JOB_CHUNK_SIZE)
@@ -0,0 +1,115 @@
+import asyncio
+import json
+import re
+
+from django.conf import settings
+from django.template.loader import render_to_string
+
+from core.pubsub import get_broker
+
+CHANNEL_PATTERNS = (
+    (re.compile(r'^feed/$'), 'feed'),
+    (re.compile(r'^group/(?P<key>[-\w]+)/$'), 'group:{key}'),
+    (re.compile(r'^author/(?P<key>[^/]+)/$'), 'author:{key}'),
+    (re.compile(r'^post/(?P<key>\d+)/$'), 'post:{key}'),
+)
+
+
+def post_channels(post):
+    channels = ['feed', f'author:{post.author.username}']
+    if post.group_id:
+        channels.append(f'group:{post.group.slug}')
+    return channels
+
+
+def publish(channels, event, data):
+    broker = get_broker()
+    message = {'event': event, 'data': data}
+    for channel in channels:
+        broker.publish(channel, message)
+
+
+def publish_post(post):
+    """Сообщает подписчикам ленты, группы и автора о новом посте."""
+    publish(post_channels(post), 'post', {'id': post.pk})
+
+
+def publish_comment(comment):
+    """Отправляет подписчикам поста готовый HTML нового комментария."""
+    channel = f'post:{comment.post_id}'
+    if not get_broker().has_subscribers(channel):
+        return
+    html = render_to_string('posts/includes/comment.html',
+                            {'comment': comment})
+    publish([channel], 'comment', {'id': comment.pk, 'html': html})
+
+
+def resolve_channel(path):
+    prefix = settings.LIVE_URL_PREFIX
+    if not path.startswith(prefix):
+        return None
+    path = path[len(prefix):]
+    for pattern, channel in CHANNEL_PATTERNS:
+        match = pattern.match(path)
+        if match:
+            return channel.format(**match.groupdict())
+    return None
+
+
+class LiveUpdatesApp:
+    """ASGI-приложение, отдающее обновления в формате server-sent events.
+
+    /live/feed/, /live/group/<slug>/, /live/author/<username>/ и
+    /live/post/<id>/ — каналы ленты, группы, автора и поста.
+    """
+
+    def __init__(self, broker=None, keepalive=15):
+        self.broker = broker
+        self.keepalive = keepalive
+
+    async def __call__(self, scope, receive, send):
+        channel = resolve_channel(scope['path'])
+        if scope['type'] != 'http' or channel is None:
+            await send({'type': 'http.response.start', 'status': 404,
+                        'headers': [(b'content-type', b'text/plain')]})
+            await send({'type': 'http.response.body', 'body': b'Not found'})
+            return
+        await send({'type': 'http.response.start', 'status': 200,
+                    'headers': [
+                        (b'content-type', b'text/event-stream'),
+                        (b'cache-control', b'no-cache'),
+                        (b'x-accel-buffering', b'no'),
+                    ]})
+        subscription = (self.broker or get_broker()).subscribe(channel)
+        disconnected = asyncio.ensure_future(self.wait_disconnect(receive))
+        message = asyncio.ensure_future(subscription.get())
+        try:
+            while not disconnected.done():
+                done, _ = await asyncio.wait(
+                    {message, disconnected}, timeout=self.keepalive,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if message in done:
+                    body = self.format_event(message.result())
+                    message = asyncio.ensure_future(subscription.get())
+                elif not done:
+                    body = b': keepalive\n\n'
+                else:
+                    break
+                await send({'type': 'http.response.body', 'body': body,
+                            'more_body': True})
+        finally:
+            message.cancel()
+            disconnected.cancel()
+            subscription.close()
+        await send({'type': 'http.response.body', 'body': b''})
+
+    @staticmethod
+    async def wait_disconnect(receive):
+        while (await receive())['type'] != 'http.disconnect':
+            pass
+
+    @staticmethod
+    def format_event(message):
+        data = json.dumps(message['data'], ensure_ascii=False)
+        return f'event: {message["event"]}\ndata: {data}\n\n'.encode()
@@ -0,0 +1,137 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from sorl.thumbnail import default
+from sorl.thumbnail.conf import settings as thumbnail_settings
+from sorl.thumbnail.images import ImageFile
+from sorl.thumbnail.kvstores.base import add_prefix
+from sorl.thumbnail.kvstores.cached_db_kvstore import KVStore
+from sorl.thumbnail.models import KVStore as KVStoreModel
+
+from posts.media import MEDIA_FIELDS, referenced_names
+from posts.models import Image, MediaBlob
+from posts.uploadhandlers import UPLOAD_STAGING_DIR
+
+
+def scan(root, directory):
+    """Обходит каталог, не собирая список файлов в памяти.
+
+    Возвращает пары (имя относительно root, время изменения).
+    """
+    try:
+        entries = os.scandir(os.path.join(root, directory))
+    except FileNotFoundError:
+        return
+    with entries:
+        for entry in entries:
+            name = f'{directory}/{entry.name}'
+            if entry.is_dir(follow_symlinks=False):
+                yield from scan(root, name)
+            elif entry.is_file(follow_symlinks=False):
+                yield name, entry.stat(follow_symlinks=False).st_mtime
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+class Command(BaseCommand):
+    help = (
+        'Удаляет медиафайлы и миниатюры, на которые не ссылается база, '
+        'и картинки, не привязанные к постам.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Только показать, что будет удалено.'
+        )
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--workers', type=int, default=8)
+        parser.add_argument(
+            '--min-age', type=int, default=3600,
+            help='Не трогать файлы моложе стольких секунд.'
+        )
+
+    def handle(self, *args, **options):
+        self.dry_run = options['dry_run']
+        self.batch_size = options['batch_size']
+        self.deadline = time.time() - options['min_age']
+        self.root = settings.MEDIA_ROOT
+        with ThreadPoolExecutor(max_workers=options['workers']) as executor:
+            self.executor = executor
+            self.collect_images()
+            directories = {
+                field.upload_to.strip('/')
+                for field in (model._meta.get_field(name)
+                              for model, name in MEDIA_FIELDS)
+            }
+            for directory in sorted(directories):
+                self.collect_files(directory, self.unreferenced)
+            self.collect_files(UPLOAD_STAGING_DIR, lambda names: names)
+            if not self.dry_run:
+                default.kvstore.cleanup()
+            self.collect_files(
+                thumbnail_settings.THUMBNAIL_PREFIX.strip('/'),
+                self.unknown_thumbnails,
+            )
+
+    def log(self, message):
+        self.stdout.write(message)
+
+    def collect_images(self):
+        orphans = Image.objects.filter(postimage__isnull=True).values_list(
+            'pk', flat=True)
+        total = 0
+        for batch in batched(orphans.iterator(), self.batch_size):
+            total += len(batch)
+            if not self.dry_run:
+                # delete() по каждой строке уменьшает счётчики ссылок
+                Image.objects.filter(pk__in=batch).delete()
+            self.log(f'Картинки без постов: {total}')
+
+    def unreferenced(self, names):
+        return set(names) - referenced_names(names)
+
+    def unknown_thumbnails(self, names):
+        keys = {
+            add_prefix(ImageFile(name, default.storage).key): name
+            for name in names
+        }
+        if isinstance(default.kvstore, KVStore):
+            known = KVStoreModel.objects.filter(
+                key__in=list(keys)).values_list('key', flat=True)
+        else:
+            known = [key for key in keys
+                     if default.kvstore._get_raw(key) is not None]
+        return set(names) - {keys[key] for key in known}
+
+    def collect_files(self, directory, find_orphans):
+        scanned = deleted = 0
+        for batch in batched(scan(self.root, directory), self.batch_size):
+            scanned += len(batch)
+            names = [name for name, mtime in batch if mtime < self.deadline]
+            orphans = sorted(find_orphans(names)) if names else []
+            deleted += len(orphans)
+            if orphans and not self.dry_run:
+                list(self.executor.map(self.remove, orphans))
+                MediaBlob.objects.filter(
+                    name__in=orphans, refcount=0).delete()
+            self.log(f'{directory}: проверено {scanned}, '
+                     f'{"к удалению" if self.dry_run else "удалено"} '
+                     f'{deleted}')
+
+    def remove(self, name):
+        try:
+            os.remove(os.path.join(self.root, name))
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from posts.ranking import rebuild_ranking
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает рейтинг популярных постов. '
+        'Запускается периодически, например из cron.'
+    )
+
+    def handle(self, *args, **options):
+        ranked = rebuild_ranking()
+        self.stdout.write(f'В рейтинге постов: {ranked}')
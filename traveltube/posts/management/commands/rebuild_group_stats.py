@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from posts.group_stats import rebuild_group_stats
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает статистику групп для каталога. Нужна после '
+        'массовой загрузки постов в обход сигналов.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        groups = rebuild_group_stats(batch_size=options['batch_size'])
+        self.stdout.write(f'Групп с постами: {groups}')
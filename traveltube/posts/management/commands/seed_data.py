@@ -0,0 +1,276 @@
+import os
+import random
+from array import array
+from bisect import bisect
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from datetime import timedelta
+from itertools import accumulate, islice
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from PIL import Image as PilImage
+from PIL import ImageDraw
+
+from posts.group_stats import rebuild_group_stats
+from posts.media import rebuild_refcounts
+from posts.models import Comment, Follow, Group, Post, User
+
+IMAGE_DIR = 'posts/seed'
+IMAGE_SIZE = (960, 720)
+WORDS = (
+    'горы', 'море', 'поезд', 'самолёт', 'палатка', 'маршрут', 'закат',
+    'рассвет', 'город', 'озеро', 'лес', 'перевал', 'музей', 'рынок',
+    'кофе', 'пляж', 'тропа', 'остров', 'мост', 'карта', 'рюкзак',
+    'дорога', 'вокзал', 'гостиница', 'фестиваль', 'река', 'каньон',
+)
+
+
+def batched(iterable, size):
+    """Разбивает поток объектов на списки длиной не больше size."""
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def zipf_weights(count, exponent):
+    """Накопленные веса степенного распределения популярности."""
+    return list(accumulate(1 / (rank ** exponent)
+                           for rank in range(1, count + 1)))
+
+
+def weighted_index(rng, cum_weights):
+    return bisect(cum_weights, rng.random() * cum_weights[-1])
+
+
+def render_placeholder(task):
+    """Рисует картинку-заглушку. Выполняется в дочернем процессе."""
+    path, seed = task
+    if os.path.exists(path):
+        return path
+    rng = random.Random(seed)
+    image = PilImage.new(
+        'RGB', IMAGE_SIZE, tuple(rng.randrange(256) for _ in range(3))
+    )
+    draw = ImageDraw.Draw(image)
+    for _ in range(8):
+        x, y = rng.randrange(IMAGE_SIZE[0]), rng.randrange(IMAGE_SIZE[1])
+        draw.rectangle(
+            (x, y, x + rng.randrange(40, 400), y + rng.randrange(40, 300)),
+            fill=tuple(rng.randrange(256) for _ in range(3)),
+        )
+    image.save(path, 'JPEG', quality=70)
+    return path
+
+
+@contextmanager
+def keep_pub_date(*models):
+    """Отключает auto_now_add, чтобы сохранить сгенерированные даты."""
+    fields = [model._meta.get_field('pub_date') for model in models]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+class Command(BaseCommand):
+    help = (
+        'Заполняет базу большим объёмом правдоподобных данных '
+        'для нагрузочного тестирования.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10000)
+        parser.add_argument('--groups', type=int, default=2000)
+        parser.add_argument('--posts', type=int, default=1000000)
+        parser.add_argument('--comments', type=int, default=3000000)
+        parser.add_argument(
+            '--follows', type=float, default=20.0,
+            help='Среднее число подписок на одного пользователя.'
+        )
+        parser.add_argument(
+            '--images', type=int, default=64,
+            help='Количество разных картинок-заглушек.'
+        )
+        parser.add_argument('--days', type=int, default=365)
+        parser.add_argument('--seed', type=int, default=1)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument(
+            '--workers', type=int, default=os.cpu_count() or 1,
+            help='Число процессов для генерации картинок.'
+        )
+        parser.add_argument(
+            '--clear', action='store_true',
+            help='Удалить данные, созданные ранее с тем же --seed.'
+        )
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        self.prefix = f'seed{options["seed"]}_'
+        self.now = timezone.now()
+        self.span = timedelta(days=options['days']).total_seconds()
+
+        users = User.objects.filter(username__startswith=self.prefix)
+        if users.exists():
+            if not options['clear']:
+                raise CommandError(
+                    f'Данные с --seed={options["seed"]} уже созданы. '
+                    'Используйте --clear, чтобы пересоздать их.'
+                )
+            users.delete()
+            Group.objects.filter(slug__startswith=self.prefix).delete()
+
+        images = self.create_images(
+            options['images'], options['seed'], options['workers']
+        )
+        user_ids = self.create_users(options['users'])
+        group_ids = self.create_groups(options['groups'])
+        popularity = zipf_weights(len(user_ids), 1.1)
+        post_ids = self.create_posts(
+            options['posts'], user_ids, group_ids, images, popularity
+        )
+        self.create_comments(options['comments'], user_ids, post_ids)
+        self.create_follows(options['follows'], user_ids, popularity)
+        # bulk_create не отправляет сигналы, счётчики ссылок на картинки
+        # и статистика групп пересчитываются одним проходом
+        rebuild_refcounts()
+        rebuild_group_stats()
+
+    def log(self, message):
+        self.stdout.write(message)
+
+    def random_date(self):
+        return self.now - timedelta(seconds=self.rng.random() * self.span)
+
+    def random_text(self, low, high):
+        return ' '.join(
+            self.rng.choice(WORDS) for _ in range(self.rng.randint(low, high))
+        ).capitalize()
+
+    def bulk_insert(self, model, objects, total):
+        created = 0
+        for batch in batched(objects, self.batch_size):
+            with transaction.atomic():
+                model.objects.bulk_create(batch, ignore_conflicts=True)
+            created += len(batch)
+            self.log(f'{model.__name__}: {created}/{total}')
+
+    def collect_ids(self, queryset):
+        ids = array('q')
+        ids.extend(queryset.order_by('pk').values_list('pk', flat=True)
+                   .iterator())
+        return ids
+
+    def create_images(self, count, seed, workers):
+        directory = os.path.join(settings.MEDIA_ROOT, IMAGE_DIR)
+        os.makedirs(directory, exist_ok=True)
+        names = [f'{IMAGE_DIR}/{self.prefix}{index}.jpg'
+                 for index in range(count)]
+        tasks = [(os.path.join(settings.MEDIA_ROOT, name), seed * 100003 + i)
+                 for i, name in enumerate(names)]
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                list(executor.map(render_placeholder, tasks))
+        else:
+            for task in tasks:
+                render_placeholder(task)
+        self.log(f'Картинки: {count}')
+        return names
+
+    def create_users(self, count):
+        last_pk = User.objects.order_by('-pk').values_list(
+            'pk', flat=True).first() or 0
+        # Хеш пароля считается один раз: PBKDF2 на миллион строк — часы.
+        password = make_password('seed-password')
+        self.bulk_insert(User, (
+            User(username=f'{self.prefix}user_{index}', password=password,
+                 first_name=self.rng.choice(WORDS).capitalize())
+            for index in range(count)
+        ), count)
+        return self.collect_ids(User.objects.filter(
+            pk__gt=last_pk, username__startswith=self.prefix))
+
+    def create_groups(self, count):
+        last_pk = Group.objects.order_by('-pk').values_list(
+            'pk', flat=True).first() or 0
+        self.bulk_insert(Group, (
+            Group(title=self.random_text(1, 3),
+                  slug=f'{self.prefix}group_{index}',
+                  description=self.random_text(5, 20))
+            for index in range(count)
+        ), count)
+        return self.collect_ids(Group.objects.filter(
+            pk__gt=last_pk, slug__startswith=self.prefix))
+
+    def create_posts(self, count, user_ids, group_ids, images, popularity):
+        last_pk = Post.objects.order_by('-pk').values_list(
+            'pk', flat=True).first() or 0
+        rng = self.rng
+
+        def posts():
+            for index in range(count):
+                yield Post(
+                    text=self.random_text(10, 80),
+                    image=images[index % len(images)] if images else '',
+                    author_id=user_ids[weighted_index(rng, popularity)],
+                    group_id=(rng.choice(group_ids)
+                              if group_ids and rng.random() < 0.7 else None),
+                    pub_date=self.random_date(),
+                )
+
+        with keep_pub_date(Post):
+            self.bulk_insert(Post, posts(), count)
+        return self.collect_ids(Post.objects.filter(pk__gt=last_pk))
+
+    def create_comments(self, count, user_ids, post_ids):
+        if not post_ids:
+            return
+        rng = self.rng
+        # Обсуждения тоже распределены неравномерно: свежие и популярные
+        # посты собирают большую часть комментариев.
+        activity = zipf_weights(len(post_ids), 0.8)
+        comments = (
+            Comment(
+                post_id=post_ids[-1 - weighted_index(rng, activity)],
+                author_id=rng.choice(user_ids),
+                text=self.random_text(3, 30),
+                pub_date=self.random_date(),
+            )
+            for _ in range(count)
+        )
+        with keep_pub_date(Comment):
+            self.bulk_insert(Comment, comments, count)
+
+    def create_follows(self, mean, user_ids, popularity):
+        if len(user_ids) < 2:
+            return
+        rng = self.rng
+        # Число подписок у читателя и популярность авторов подчиняются
+        # степенному закону: у немногих авторов тысячи подписчиков.
+        alpha = 1 + 1 / max(mean - 1, 0.01)
+        limit = len(user_ids) - 1
+
+        def follows():
+            for user_id in user_ids:
+                wanted = min(int(rng.paretovariate(alpha)), limit)
+                authors = set()
+                for _ in range(wanted * 3):
+                    if len(authors) >= wanted:
+                        break
+                    author_id = user_ids[weighted_index(rng, popularity)]
+                    if author_id != user_id:
+                        authors.add(author_id)
+                for author_id in sorted(authors):
+                    yield Follow(user_id=user_id, author_id=author_id)
+
+        self.bulk_insert(Follow, follows(), f'~{int(mean * len(user_ids))}')
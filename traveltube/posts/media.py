@@ -0,0 +1,75 @@
+"""Учёт ссылок на медиафайлы постов.
+
+Файлы в ContentAddressedStorage общие для одинаковых загрузок, поэтому
+их нельзя удалять вместе с постом. Сигналы (posts.signals) ведут счётчики
+ссылок в MediaBlob, а команда collect_media удаляет файлы без ссылок.
+"""
+from collections import Counter
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+from django.utils import timezone
+
+from .models import Image, MediaBlob, Post
+
+MEDIA_FIELDS = (
+    (Post, 'image'),
+    (Image, 'Image'),
+)
+
+
+def media_field(model):
+    for media_model, field in MEDIA_FIELDS:
+        if model is media_model:
+            return field
+    return None
+
+
+def incref(name):
+    if not name:
+        return
+    changes = {'refcount': F('refcount') + 1, 'updated': timezone.now()}
+    if MediaBlob.objects.filter(name=name).update(**changes):
+        return
+    try:
+        with transaction.atomic():
+            MediaBlob.objects.create(name=name, refcount=1)
+    except IntegrityError:
+        MediaBlob.objects.filter(name=name).update(**changes)
+
+
+def decref(name):
+    if not name:
+        return
+    MediaBlob.objects.filter(name=name, refcount__gt=0).update(
+        refcount=F('refcount') - 1, updated=timezone.now()
+    )
+
+
+def referenced_names(names):
+    """Возвращает те из имён файлов, на которые есть ссылки в базе."""
+    found = set()
+    for model, field in MEDIA_FIELDS:
+        found.update(model._base_manager.filter(**{f'{field}__in': names})
+                     .values_list(field, flat=True))
+    return found
+
+
+def rebuild_refcounts():
+    """Пересчитывает MediaBlob одним агрегирующим запросом на модель."""
+    counts = Counter()
+    for model, field in MEDIA_FIELDS:
+        rows = (model._base_manager.exclude(**{field: ''}).values(field)
+                .annotate(references=Count('pk')).order_by())
+        for row in rows.iterator():
+            counts[row[field]] += row['references']
+    with transaction.atomic():
+        MediaBlob.objects.all().delete()
+        # Размер пачки выбирает Django: на SQLite строки вставляются
+        # через UNION ALL SELECT, и явный batch_size больше 500 превысил
+        # бы лимит составного SELECT (SQLITE_MAX_COMPOUND_SELECT)
+        MediaBlob.objects.bulk_create(
+            MediaBlob(name=name, refcount=refcount)
+            for name, refcount in counts.items()
+        )
+    return len(counts)
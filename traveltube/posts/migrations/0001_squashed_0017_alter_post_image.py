@@ -0,0 +1,89 @@
+# Generated by Django 2.2.16 on 2026-10-19 15:30
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    replaces = [('posts', '0001_initial'), ('posts', '0002_auto_20230125_1524'), ('posts', '0003_auto_20230207_1901'), ('posts', '0004_auto_20230224_2333'), ('posts', '0005_auto_20230224_2347'), ('posts', '0006_comment'), ('posts', '0007_auto_20230301_1742'), ('posts', '0008_auto_20230302_2225'), ('posts', '0009_auto_20230303_1409'), ('posts', '0010_follow'), ('posts', '0011_auto_20230309_1919'), ('posts', '0012_image_postimage_post_images'), ('posts', '0013_auto_20230428_2218'), ('posts', '0014_auto_20230428_2236'), ('posts', '0015_alter_post_image'), ('posts', '0016_alter_post_image'), ('posts', '0017_alter_post_image')]
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Group',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=200, verbose_name='Название')),
+                ('slug', models.SlugField(unique=True, verbose_name='Тема')),
+                ('description', models.TextField(verbose_name='Описание')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Post',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('text', models.TextField(help_text='Введите текст поста', verbose_name='Текст поста')),
+                ('pub_date', models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='дата создания')),
+                ('author', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='posts', to=settings.AUTH_USER_MODEL, verbose_name='Автор')),
+                ('group', models.ForeignKey(blank=True, help_text='Группа, к которой будет относиться пост', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='posts', to='posts.Group', verbose_name='Группа')),
+                ('image', models.ImageField(upload_to='posts/', verbose_name='Аватар поста')),
+            ],
+            options={
+                'ordering': ('-pub_date',),
+                'verbose_name': 'Пост',
+                'verbose_name_plural': 'Посты',
+            },
+        ),
+        migrations.CreateModel(
+            name='Comment',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('text', models.TextField(verbose_name='Комментарий')),
+                ('pub_date', models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='дата создания')),
+                ('author', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='comments', to=settings.AUTH_USER_MODEL, verbose_name='Автор')),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='comments', to='posts.Post', verbose_name='Пост')),
+            ],
+            options={
+                'ordering': ('-pub_date',),
+            },
+        ),
+        migrations.CreateModel(
+            name='Follow',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('author', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='following', to=settings.AUTH_USER_MODEL, verbose_name='Автор')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='follower', to=settings.AUTH_USER_MODEL, verbose_name='Подписчик')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='follow',
+            constraint=models.UniqueConstraint(fields=('user', 'author'), name='unique_subscription'),
+        ),
+        migrations.CreateModel(
+            name='Image',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('Image', models.ImageField(upload_to='images/')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='PostImage',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('image', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='posts.image')),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='posts.post')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='images',
+            field=models.ManyToManyField(through='posts.PostImage', to='posts.Image'),
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 2.2.16 on 2026-10-19 14:49
+
+import core.storage
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def count_references(apps, schema_editor):
+    MediaBlob = apps.get_model('posts', 'MediaBlob')
+    counts = {}
+    for model_name, field in (('Post', 'image'), ('Image', 'Image')):
+        model = apps.get_model('posts', model_name)
+        rows = (model.objects.exclude(**{field: ''}).values(field)
+                .annotate(references=Count('pk')).order_by())
+        for row in rows:
+            counts[row[field]] = counts.get(row[field], 0) + row['references']
+    MediaBlob.objects.bulk_create(
+        MediaBlob(name=name, refcount=refcount)
+        for name, refcount in counts.items()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0017_alter_post_image'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MediaBlob',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True)),
+                ('refcount', models.PositiveIntegerField(default=0)),
+                ('updated', models.DateTimeField(auto_now=True, db_index=True)),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='image',
+            name='Image',
+            field=models.ImageField(storage=core.storage.ContentAddressedStorage(), upload_to='images/'),
+        ),
+        migrations.AlterField(
+            model_name='post',
+            name='image',
+            field=models.ImageField(storage=core.storage.ContentAddressedStorage(), upload_to='posts/', verbose_name='Аватар поста'),
+        ),
+        migrations.RunPython(count_references, migrations.RunPython.noop),
+    ]
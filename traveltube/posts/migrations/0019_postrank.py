@@ -0,0 +1,25 @@
+# Generated by Django 2.2.16 on 2026-10-19 14:50
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0018_mediablob_content_addressed_storage'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostRank',
+            fields=[
+                ('post', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='rank', serialize=False, to='posts.Post')),
+                ('score', models.FloatField(db_index=True)),
+                ('computed', models.DateTimeField()),
+            ],
+            options={
+                'ordering': ('-score',),
+            },
+        ),
+    ]
@@ -0,0 +1,68 @@
+# Generated by Django 2.2.16 on 2026-10-19 14:51
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Max
+import django.db.models.deletion
+
+
+def count_group_posts(apps, schema_editor):
+    Post = apps.get_model('posts', 'Post')
+    GroupStats = apps.get_model('posts', 'GroupStats')
+    GroupAuthorStats = apps.get_model('posts', 'GroupAuthorStats')
+    rows = (Post.objects.filter(group__isnull=False)
+            .values('group_id', 'author_id', 'author__username')
+            .annotate(posts=Count('pk'), last=Max('pub_date'))
+            .order_by('group_id', '-posts', 'author_id'))
+    groups = {}
+    for row in rows:
+        stats = groups.setdefault(row['group_id'], GroupStats(
+            group_id=row['group_id'], post_count=0))
+        stats.post_count += row['posts']
+        if stats.last_post_date is None or row['last'] > stats.last_post_date:
+            stats.last_post_date = row['last']
+        authors = stats.top_authors.split(',') if stats.top_authors else []
+        if len(authors) < 3:
+            stats.top_authors = ','.join(authors + [row['author__username']])
+        GroupAuthorStats.objects.create(
+            group_id=row['group_id'], author_id=row['author_id'],
+            post_count=row['posts'])
+    GroupStats.objects.bulk_create(groups.values())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('posts', '0019_postrank'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GroupStats',
+            fields=[
+                ('group', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='posts.Group')),
+                ('post_count', models.PositiveIntegerField(db_index=True, default=0)),
+                ('last_post_date', models.DateTimeField(blank=True, null=True)),
+                ('top_authors', models.TextField(blank=True, help_text='Имена самых активных авторов через запятую')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='GroupAuthorStats',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('post_count', models.PositiveIntegerField(default=0)),
+                ('author', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+                ('group', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='posts.Group')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='groupauthorstats',
+            index=models.Index(fields=['group', '-post_count'], name='group_top_authors'),
+        ),
+        migrations.AddConstraint(
+            model_name='groupauthorstats',
+            constraint=models.UniqueConstraint(fields=('group', 'author'), name='unique_group_author'),
+        ),
+        migrations.RunPython(count_group_posts, migrations.RunPython.noop),
+    ]
@@ -1,9 +1,10 @@
 from django.contrib.auth import get_user_model
-from django.core.exceptions import ValidationError
 from django.db import models
-from PIL import Image as PilImage
 
 from core.models import CreatedModel
+from core.storage import ContentAddressedStorage
+
+from .validators import validate_image_format
 
 User = get_user_model()
 
@@ -17,12 +18,25 @@ class Group(models.Model):
         return self.title
 
 
+class PostQuerySet(models.QuerySet):
+    def visible(self):
+        """Посты, которые не удалены — сами или вместе с автором
+        (posts.purge.soft_delete_user помечает все его посты)."""
+        return self.filter(is_deleted=False)
+
+
+class VisiblePostManager(models.Manager.from_queryset(PostQuerySet)):
+    def get_queryset(self):
+        return super().get_queryset().visible()
+
+
 class Post(CreatedModel):
     text = models.TextField(verbose_name='Текст поста',
                             help_text='Введите текст поста')
     image = models.ImageField(
         verbose_name='Аватар поста',
         upload_to='posts/',
+        storage=ContentAddressedStorage(),
         blank=False,
     )
     author = models.ForeignKey(
@@ -43,6 +57,14 @@ class Post(CreatedModel):
         'Image',
         through='PostImage'
     )
+    updated = models.DateTimeField('дата изменения', auto_now=True)
+    is_deleted = models.BooleanField('удалён', default=False)
+
+    # Ленты, счётчики и related-менеджеры (author.posts, group.posts)
+    # видят только видимые посты. Удалённые ещё не вычищенные строки
+    # доступны через all_objects (админка, posts.purge).
+    objects = VisiblePostManager()
+    all_objects = PostQuerySet.as_manager()
 
     class Meta:
         ordering = ('-pub_date',)
@@ -54,31 +76,19 @@ class Post(CreatedModel):
 
 
 class Image(models.Model):
-    Image = models.ImageField(upload_to='images/')
+    Image = models.ImageField(upload_to='images/',
+                              storage=ContentAddressedStorage())
 
     def clean(self):
         super().clean()
-        img = PilImage.open(self.image)
-        if img.format not in ('JPEG', 'WEBP', 'PNG'):
-            raise ValidationError(
-                'Недопустимый формат файла. '
-                'Поддерживаются только JPEG, WEBP и PNG.'
-            )
+        if self.Image:
+            validate_image_format(self.Image, ('JPEG', 'WEBP', 'PNG'))
 
 
 class PostImage(models.Model):
     post = models.ForeignKey(Post, on_delete=models.CASCADE)
     image = models.ForeignKey(Image, on_delete=models.CASCADE)
 
-    def clean(self):
-        super().clean()
-        img = PilImage.open(self.image)
-        if img.format not in ('JPEG', 'WEBP', 'PNG'):
-            raise ValidationError(
-                'Недопустимый формат файла. '
-                'Поддерживаются только JPEG, WEBP и PNG.'
-            )
-
 
 class Comment(CreatedModel):
     post = models.ForeignKey(
@@ -121,3 +131,67 @@ class Follow(models.Model):
     class Meta:
         constraints = [models.UniqueConstraint(fields=['user', 'author'],
                                                name='unique_subscription')]
+
+
+class MediaBlob(models.Model):
+    """Число ссылок из базы на файл в MEDIA_ROOT.
+
+    Одинаковые загрузки делят один файл (ContentAddressedStorage), файл
+    без ссылок удаляет команда collect_media.
+    """
+    name = models.CharField(max_length=255, unique=True)
+    refcount = models.PositiveIntegerField(default=0)
+    updated = models.DateTimeField(auto_now=True, db_index=True)
+
+    def __str__(self):
+        return f'{self.name} ({self.refcount})'
+
+
+class PostRank(models.Model):
+    """Оценка поста в ленте популярного, пересчитывается rank_posts."""
+    post = models.OneToOneField(
+        Post,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='rank',
+    )
+    score = models.FloatField(db_index=True)
+    computed = models.DateTimeField()
+
+    class Meta:
+        ordering = ('-score',)
+
+
+class GroupStats(models.Model):
+    """Сводка по группе для каталога групп.
+
+    Обновляется при сохранении и удалении постов (posts.group_stats),
+    полностью пересчитывается командой rebuild_group_stats.
+    """
+    group = models.OneToOneField(
+        Group,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='stats',
+    )
+    post_count = models.PositiveIntegerField(default=0, db_index=True)
+    last_post_date = models.DateTimeField(blank=True, null=True)
+    top_authors = models.TextField(
+        blank=True,
+        help_text='Имена самых активных авторов через запятую',
+    )
+
+    def top_author_list(self):
+        return self.top_authors.split(',') if self.top_authors else []
+
+
+class GroupAuthorStats(models.Model):
+    group = models.ForeignKey(Group, on_delete=models.CASCADE)
+    author = models.ForeignKey(User, on_delete=models.CASCADE)
+    post_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=['group', 'author'],
+                                               name='unique_group_author')]
+        indexes = [models.Index(fields=['group', '-post_count'],
+                                name='group_top_authors')]
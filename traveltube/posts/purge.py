@@ -0,0 +1,72 @@
+"""Удаление постов и пользователей без долгих блокировок базы.
+
+Удаление сначала мягкое: пост помечается is_deleted, пользователь
+получает строку users.DeletedUser, а все его посты — is_deleted, и они
+сразу пропадают из лент. Строки вычищает
+фоновая задача небольшими пачками: каждая пачка — своя короткая
+транзакция, между пачками пауза PURGE_PAUSE, в которую успевают
+записать другие процессы. Каскад по тысячам постов и комментариев
+одной транзакцией блокировал SQLite на секунды.
+"""
+import time
+
+from django.conf import settings
+from django.db import transaction
+
+from users.models import DeletedUser
+
+from .fragments import invalidate_fragments
+from .models import Comment, Follow, Post, User
+
+
+def delete_in_batches(queryset, batch_size=None, pause=None):
+    """Удаляет строки queryset пачками, возвращает число удалённых."""
+    batch_size = batch_size or settings.PURGE_BATCH_SIZE
+    pause = settings.PURGE_PAUSE if pause is None else pause
+    model = queryset.model
+    deleted = 0
+    while True:
+        with transaction.atomic():
+            pks = list(queryset.values_list('pk', flat=True)[:batch_size])
+            if not pks:
+                return deleted
+            # delete() по строкам: сигналы обновляют счётчики медиа и групп
+            model._base_manager.filter(pk__in=pks).delete()
+        deleted += len(pks)
+        time.sleep(pause)
+
+
+def delete_comments(post_ids):
+    """Удаляет комментарии к постам заранее, чтобы каскад при удалении
+    самих постов не захватывал их одной транзакцией."""
+    for start in range(0, len(post_ids), settings.PURGE_BATCH_SIZE):
+        delete_in_batches(Comment.objects.filter(
+            post_id__in=post_ids[start:start + settings.PURGE_BATCH_SIZE]))
+
+
+def soft_delete_user(user):
+    with transaction.atomic():
+        DeletedUser.objects.get_or_create(user=user)
+        # Закрывает вход; ленты скрывают посты по is_deleted, без
+        # соединения с auth_user
+        user.is_active = False
+        user.save(update_fields=['is_active'])
+        posts = Post.all_objects.filter(author=user)
+        posts.update(is_deleted=True)
+    group_ids = set(posts.values_list('group_id', flat=True))
+    invalidate_fragments([user.pk], group_ids)
+
+
+def purge_user(user_id):
+    """Окончательно удаляет пользователя, скрытого soft_delete_user."""
+    user = User.objects.filter(pk=user_id, deletion__isnull=False).first()
+    if user is None:
+        return
+    post_ids = list(Post.all_objects.filter(author_id=user_id)
+                    .values_list('pk', flat=True))
+    delete_comments(post_ids)
+    delete_in_batches(Comment.objects.filter(author_id=user_id))
+    delete_in_batches(Follow.objects.filter(user_id=user_id))
+    delete_in_batches(Follow.objects.filter(author_id=user_id))
+    delete_in_batches(Post.all_objects.filter(author_id=user_id))
+    user.delete()
@@ -0,0 +1,100 @@
+"""Рейтинг популярных постов.
+
+Оценка поста складывается из свежих комментариев (каждый со временем
+теряет вес вдвое за RANKING_HALF_LIFE_HOURS) и охвата автора (логарифм
+числа подписчиков), а затем затухает с возрастом самого поста. Расчёт
+векторизован в NumPy по всем постам окна, результат целиком заменяет
+таблицу PostRank, из которой лента популярного читается по индексу.
+"""
+from datetime import timedelta
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from .models import Comment, Follow, Post, PostRank
+
+
+def decay(age_hours, half_life_hours):
+    return np.exp2(-age_hours / half_life_hours)
+
+
+def compute_scores(post_age, author_followers, comment_post_index,
+                   comment_age, half_life, follower_weight):
+    """Считает оценки постов. Все возрасты — в часах.
+
+    comment_post_index — номер поста (позиция в post_age) для каждого
+    комментария.
+    """
+    activity = np.bincount(
+        comment_post_index,
+        weights=decay(comment_age, half_life),
+        minlength=len(post_age),
+    )
+    reach = follower_weight * np.log1p(author_followers)
+    return (activity + reach) * decay(post_age, half_life * 3)
+
+
+def _hours_ago(now, dates):
+    now = now.timestamp()
+    return np.fromiter(((now - date.timestamp()) / 3600 for date in dates),
+                       dtype=np.float64)
+
+
+def rebuild_ranking(now=None):
+    """Пересчитывает оценки и атомарно заменяет таблицу рейтинга."""
+    now = now or timezone.now()
+    since = now - timedelta(days=settings.RANKING_WINDOW_DAYS)
+
+    posts = list(Post.objects.filter(pub_date__gte=since).order_by('pk')
+                 .values_list('pk', 'author_id', 'pub_date').iterator())
+    if posts:
+        post_ids, author_ids, dates = zip(*posts)
+    else:
+        post_ids, author_ids, dates = (), (), ()
+    post_ids = np.array(post_ids, dtype=np.int64)
+    author_ids = np.array(author_ids, dtype=np.int64)
+
+    followers = dict(Follow.objects.values('author_id')
+                     .annotate(count=Count('pk')).order_by()
+                     .values_list('author_id', 'count'))
+    author_followers = np.array(
+        [followers.get(author, 0) for author in author_ids.tolist()],
+        dtype=np.float64,
+    )
+
+    # То же условие видимости, что и у Post.objects
+    comments = list(Comment.objects.filter(
+        pub_date__gte=since, post__pub_date__gte=since,
+        post__is_deleted=False,
+    ).values_list('post_id', 'pub_date').iterator())
+    if comments:
+        comment_posts, comment_dates = zip(*comments)
+    else:
+        comment_posts, comment_dates = (), ()
+    comment_posts = np.array(comment_posts, dtype=np.int64)
+    comment_index = np.searchsorted(post_ids, comment_posts)
+    # Комментарии к постам, которых нет в выборке (пост скрыли между
+    # запросами), отбрасываются, а не приписываются соседнему посту
+    matched = comment_index < len(post_ids)
+    matched[matched] = (post_ids[comment_index[matched]]
+                        == comment_posts[matched])
+
+    scores = compute_scores(
+        _hours_ago(now, dates), author_followers, comment_index[matched],
+        _hours_ago(now, comment_dates)[matched],
+        settings.RANKING_HALF_LIFE_HOURS,
+        settings.RANKING_FOLLOWER_WEIGHT,
+    )
+    top = np.argsort(-scores, kind='stable')[:settings.RANKING_LIMIT]
+    ranks = [
+        PostRank(post_id=int(post_ids[index]), score=float(scores[index]),
+                 computed=now)
+        for index in top
+    ]
+    with transaction.atomic():
+        PostRank.objects.all().delete()
+        PostRank.objects.bulk_create(ranks)
+    return len(ranks)
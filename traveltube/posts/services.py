@@ -1,7 +1,119 @@
+from datetime import datetime, timedelta
+
+from django.conf import settings
 from django.core.paginator import Paginator
+from django.db.models import Q
+from django.utils import timezone
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+MICROSECOND = timedelta(microseconds=1)
+# Наибольшее значение INTEGER в SQLite и bigint в PostgreSQL
+MAX_PK = 2 ** 63 - 1
+
+
+def page_size(request, default, maximum=None):
+    """Размер страницы из ?per_page=, не больше MAX_POSTS_PER_PAGE."""
+    maximum = maximum or settings.MAX_POSTS_PER_PAGE
+    try:
+        per_page = int(request.GET['per_page'])
+    except (KeyError, ValueError):
+        return default
+    return min(max(per_page, 1), maximum)
+
+
+class CountedPaginator(Paginator):
+    """Пагинатор с заранее известным числом объектов, без COUNT(*)."""
 
+    def __init__(self, object_list, per_page, count, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.count = count
 
-def make_pages(request, post_list, NUMBER_POSTS):
-    paginator = Paginator(post_list, NUMBER_POSTS)
+
+def fetch_in_order(post_list, ids):
+    """Посты с данными id в том же порядке, одним запросом по pk."""
+    posts = post_list.in_bulk(ids)
+    return [posts[pk] for pk in ids if pk in posts]
+
+
+def make_pages(request, post_list, NUMBER_POSTS, maximum=None, count=None,
+               first_ids=None):
+    """Страница post_list по ?page= и ?per_page=.
+
+    count — заранее посчитанное число постов, first_ids — id первых
+    постов по порядку: если их хватает на первую страницу, она
+    выбирается по первичному ключу без сортировки всей выборки.
+    """
+    per_page = page_size(request, NUMBER_POSTS, maximum)
+    if count is None:
+        paginator = Paginator(post_list, per_page)
+    else:
+        paginator = CountedPaginator(post_list, per_page, count)
     page_number = request.GET.get('page')
-    return paginator.get_page(page_number)
+    page_obj = paginator.get_page(page_number)
+    if (first_ids is not None and page_obj.number == 1
+            and page_obj.end_index() <= len(first_ids)):
+        page_obj.object_list = fetch_in_order(
+            post_list, first_ids[:page_obj.end_index()])
+    # Ссылки пагинатора сохраняют размер страницы, выбранный клиентом
+    page_obj.per_page_query = (
+        f'&per_page={per_page}' if per_page != NUMBER_POSTS else ''
+    )
+    return page_obj
+
+
+def page_url(request, number):
+    query = request.GET.copy()
+    query['page'] = number
+    return f'{request.path}?{query.urlencode()}'
+
+
+def add_page_links(request, response, page_obj):
+    """Заголовок Link с соседними страницами, чтобы клиент мог
+    запрашивать следующую страницу заранее."""
+    links = []
+    if page_obj.has_next():
+        links.append(
+            f'<{page_url(request, page_obj.next_page_number())}>; rel="next"'
+        )
+    if page_obj.has_previous():
+        links.append(
+            f'<{page_url(request, page_obj.previous_page_number())}>; '
+            'rel="prev"'
+        )
+    if links:
+        response['Link'] = ', '.join(links)
+    return response
+
+
+def encode_cursor(post):
+    """Курсор ленты: дата публикации в микросекундах и id поста."""
+    return f'{(post.pub_date - EPOCH) // MICROSECOND}_{post.pk}'
+
+
+def decode_cursor(cursor):
+    """Разбирает курсор, при ошибке бросает ValueError."""
+    microseconds, pk = cursor.split('_')
+    pk = int(pk)
+    if not 0 < pk <= MAX_PK:
+        raise ValueError('id поста вне допустимого диапазона')
+    try:
+        return EPOCH + int(microseconds) * MICROSECOND, pk
+    except OverflowError as error:
+        # timedelta и datetime не вмещают дату курсора
+        raise ValueError('дата курсора вне допустимого диапазона') from error
+
+
+def keyset_page(post_list, cursor, size):
+    """Посты после курсора и курсор следующей порции (или None).
+
+    В отличие от OFFSET глубина прокрутки не влияет на стоимость
+    запроса: выборка идёт по индексу от последнего показанного поста.
+    """
+    post_list = post_list.order_by('-pub_date', '-pk')
+    if cursor:
+        pub_date, pk = decode_cursor(cursor)
+        post_list = post_list.filter(
+            Q(pub_date__lt=pub_date) | Q(pub_date=pub_date, pk__lt=pk))
+    posts = list(post_list[:size + 1])
+    next_cursor = encode_cursor(posts[size - 1]) if len(posts) > size else None
+    return posts[:size], next_cursor
@@ -0,0 +1,108 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from . import group_stats
+from .fragments import invalidate_fragments
+from .media import decref, incref, media_field
+from .models import Comment, Image, Post, User
+from .thumbnails import build_card_thumbnail
+
+
+@receiver(post_save, sender=Post)
+def post_created(sender, instance, created, **kwargs):
+    if created and settings.LIVE_UPDATES:
+        # posts.live тянет asyncio: WSGI-воркерам без живых обновлений
+        # он не нужен
+        from .live import publish_post
+        transaction.on_commit(lambda: publish_post(instance))
+
+
+@receiver(post_save, sender=Comment)
+def comment_created(sender, instance, created, **kwargs):
+    if created and settings.LIVE_UPDATES:
+        from .live import publish_comment
+        transaction.on_commit(lambda: publish_comment(instance))
+
+
+@receiver(pre_save, sender=Post)
+@receiver(pre_save, sender=Image)
+def remember_saved(sender, instance, **kwargs):
+    """Запоминает сохранённые в базе значения полей до изменения."""
+    fields = [media_field(sender)]
+    if sender is Post:
+        fields += ['group_id', 'author_id', 'is_deleted']
+    saved = instance.pk and sender._base_manager.filter(
+        pk=instance.pk).values(*fields).first()
+    instance._saved_state = saved or {}
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_save, sender=Image)
+def count_media(sender, instance, **kwargs):
+    field = media_field(sender)
+    name = getattr(instance, field).name
+    saved = getattr(instance, '_saved_state', {}).get(field)
+    if name != saved:
+        incref(name)
+        decref(saved)
+
+
+@receiver(post_save, sender=Post)
+def prepare_card_thumbnail(sender, instance, **kwargs):
+    saved = getattr(instance, '_saved_state', {}).get('image')
+    if instance.image and instance.image.name != saved:
+        build_card_thumbnail(instance.image)
+
+
+@receiver(post_delete, sender=Post)
+@receiver(post_delete, sender=Image)
+def release_media(sender, instance, **kwargs):
+    decref(getattr(instance, media_field(sender)).name)
+
+
+@receiver(pre_save, sender=User)
+def remember_username(sender, instance, **kwargs):
+    instance._saved_username = instance.pk and sender.objects.filter(
+        pk=instance.pk).values_list('username', flat=True).first()
+
+
+@receiver(post_save, sender=User)
+def refresh_author_cards(sender, instance, created, **kwargs):
+    # Имя автора есть в закешированных карточках постов (posts.cards)
+    saved = getattr(instance, '_saved_username', None)
+    if not created and saved and saved != instance.username:
+        instance.posts.update(updated=timezone.now())
+        # и в закешированных порциях лент
+        invalidate_fragments([instance.pk], set(
+            instance.posts.values_list('group_id', flat=True)))
+
+
+@receiver(post_save, sender=Post)
+def count_group_post(sender, instance, created, **kwargs):
+    if created:
+        group_stats.post_added(instance.group_id, instance.author_id,
+                               instance.pub_date)
+        return
+    saved = getattr(instance, '_saved_state', {})
+    if 'group_id' in saved and saved['group_id'] != instance.group_id:
+        group_stats.post_removed(saved['group_id'], instance.author_id)
+        group_stats.post_added(instance.group_id, instance.author_id,
+                               instance.pub_date)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_post_fragments(sender, instance, **kwargs):
+    saved = getattr(instance, '_saved_state', {})
+    invalidate_fragments(
+        {instance.author_id, saved.get('author_id', instance.author_id)},
+        {instance.group_id, saved.get('group_id')},
+    )
+
+
+@receiver(post_delete, sender=Post)
+def uncount_group_post(sender, instance, **kwargs):
+    group_stats.post_removed(instance.group_id, instance.author_id)
@@ -0,0 +1,20 @@
+from django import template
+from django.utils.safestring import mark_safe
+
+from posts.cards import render_cards
+from posts.services import encode_cursor
+
+register = template.Library()
+
+
+@register.simple_tag
+def post_cards(posts, template_name):
+    """{% post_cards page_obj 'includes/common.html' as cards %}"""
+    return [(post, mark_safe(html))
+            for post, html in render_cards(posts, template_name)]
+
+
+@register.filter
+def next_cursor(page_obj):
+    """Курсор для подгрузки постов после текущей страницы."""
+    return encode_cursor(page_obj[-1]) if len(page_obj) else ''
@@ -1,3 +1,4 @@
+import hashlib
 import shutil
 import tempfile
 
@@ -49,6 +50,9 @@ class PostFormTests(TestCase):
             b'\x02\x00\x01\x00\x00\x02\x02\x0C'
             b'\x0A\x00\x3B'
         )
+        # Хранилище называет файлы по SHA-256 содержимого
+        digest = hashlib.sha256(self.small_gif).hexdigest()
+        self.small_gif_name = f'posts/{digest[:2]}/{digest}.gif'
 
     def test_post_create(self):
         # Подсчитаем количество записей в Post
@@ -80,8 +84,7 @@ class PostFormTests(TestCase):
         self.assertEqual(post_object.text, form_data['text'])
         self.assertEqual(post_object.group.id, form_data['group'])
         post_object = Post.objects.first()
-        self.assertEqual(post_object.image.name,
-                         'posts/' + form_data.get('image').name)
+        self.assertEqual(post_object.image.name, self.small_gif_name)
 
     def test_edit_post(self):
         # Подсчитаем количество записей в Post
@@ -110,5 +113,4 @@ class PostFormTests(TestCase):
         post_object = Post.objects.get(id=self.post.pk)
         self.assertEqual(post_object.group.id, form_data['group'])
         self.assertEqual(post_object.text, form_data['text'])
-        self.assertEqual(post_object.image.name,
-                         'posts/' + form_data.get('image').name)
+        self.assertEqual(post_object.image.name, self.small_gif_name)
@@ -0,0 +1,63 @@
+"""Чтение записей sorl-thumbnail для карточек одним запросом.
+
+sorl находит миниатюру по ключу в kvstore: сначала в кеше, при промахе —
+отдельным запросом к thumbnail_kvstore на каждую картинку. warm_kvstore
+вычисляет ключи миниатюр так же, как ThumbnailBackend.get_thumbnail,
+и загружает в кеш все недостающие записи страницы одним запросом.
+Отсутствующие ключи кешируются пустыми, как это делает сам sorl.
+
+Сама миниатюра строится при сохранении поста (build_card_thumbnail):
+при первом показе в ленте её создание стоило бы ещё нескольких
+запросов к thumbnail_kvstore на карточку.
+"""
+from sorl.thumbnail import default, get_thumbnail
+from sorl.thumbnail.base import ThumbnailBackend
+from sorl.thumbnail.conf import defaults as default_settings
+from sorl.thumbnail.conf import settings as thumbnail_settings
+from sorl.thumbnail.images import ImageFile
+from sorl.thumbnail.kvstores.base import add_prefix
+from sorl.thumbnail.kvstores.cached_db_kvstore import EMPTY_VALUE, KVStore
+from sorl.thumbnail.models import KVStore as KVStoreModel
+
+# Миниатюра карточек лент (includes/common.html, template_index.html)
+CARD_THUMBNAIL = ('960x720', {'crop': 'center', 'upscale': True})
+
+
+def thumbnail_key(file_, geometry, options):
+    """Ключ kvstore миниатюры, которую построит get_thumbnail."""
+    backend = default.backend
+    source = ImageFile(file_)
+    options = dict(options)
+    if thumbnail_settings.THUMBNAIL_PRESERVE_FORMAT:
+        options.setdefault('format', backend._get_format(source))
+    for key, value in ThumbnailBackend.default_options.items():
+        options.setdefault(key, value)
+    for key, attr in ThumbnailBackend.extra_options:
+        value = getattr(thumbnail_settings, attr)
+        if value != getattr(default_settings, attr):
+            options.setdefault(key, value)
+    name = backend._get_thumbnail_filename(source, geometry, options)
+    return add_prefix(ImageFile(name, default.storage).key)
+
+
+def build_card_thumbnail(image):
+    get_thumbnail(image, CARD_THUMBNAIL[0], **CARD_THUMBNAIL[1])
+
+
+def warm_kvstore(files, geometry, options):
+    kvstore = default.kvstore
+    if not isinstance(kvstore, KVStore):
+        return
+    keys = {thumbnail_key(file_, geometry, options)
+            for file_ in files if file_}
+    if not keys:
+        return
+    missing = keys - kvstore.cache.get_many(keys).keys()
+    if not missing:
+        return
+    values = dict(KVStoreModel.objects.filter(key__in=missing)
+                  .values_list('key', 'value'))
+    kvstore.cache.set_many(
+        {key: values.get(key, EMPTY_VALUE) for key in missing},
+        thumbnail_settings.THUMBNAIL_CACHE_TIMEOUT,
+    )
@@ -0,0 +1,175 @@
+import hashlib
+import os
+import tempfile
+from functools import wraps
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.uploadedfile import (InMemoryUploadedFile,
+                                            UploadedFile)
+from django.core.files.uploadhandler import FileUploadHandler
+from django.views.decorators.csrf import csrf_exempt, csrf_protect
+
+from .validators import (HEADER_LIMIT, SNIFF_BYTES, check_image_header,
+                         sniff_image)
+
+UPLOAD_STAGING_DIR = '.uploads'
+
+
+class StagedUploadedFile(UploadedFile):
+    """Загруженный файл, записанный прямо в MEDIA_ROOT.
+
+    FileSystemStorage переносит такой файл на место переименованием,
+    без копирования содержимого, как и обычный временный файл.
+    """
+
+    def __init__(self, name, content_type, size, charset,
+                 content_type_extra=None):
+        directory = os.path.join(settings.MEDIA_ROOT, UPLOAD_STAGING_DIR)
+        os.makedirs(directory, exist_ok=True)
+        _, ext = os.path.splitext(name)
+        file = tempfile.NamedTemporaryFile(suffix='.upload' + ext,
+                                           dir=directory)
+        super().__init__(file, name, content_type, size, charset,
+                         content_type_extra)
+
+    def temporary_file_path(self):
+        return self.file.name
+
+    def close(self):
+        try:
+            return self.file.close()
+        except FileNotFoundError:
+            # Файл уже перенесён хранилищем на постоянное место.
+            pass
+
+
+class RejectedUploadedFile(InMemoryUploadedFile):
+    """Пустая замена отклонённого файла с текстом ошибки для формы."""
+
+    def __init__(self, field_name, name, content_type, error):
+        super().__init__(BytesIO(), field_name, name, content_type, 0, None)
+        self.upload_error = error
+
+
+class ImageUploadHandler(FileUploadHandler):
+    """Проверяет загружаемые картинки по мере получения данных.
+
+    Формат и размеры определяются по первым байтам, размер файла — по
+    мере чтения. Отклонённый файл не попадает на диск, остаток его
+    данных отбрасывается. Небольшие файлы остаются в памяти, большие
+    пишутся во временный файл внутри MEDIA_ROOT. Попутно считается
+    SHA-256 содержимого для ContentAddressedStorage.
+    """
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.header = b''
+        self.chunks = []
+        self.size = 0
+        self.checked = False
+        self.error = None
+        self.file = None
+        self.hasher = hashlib.sha256()
+
+    def receive_data_chunk(self, raw_data, start):
+        if self.error:
+            return None
+        self.size += len(raw_data)
+        if self.size > settings.UPLOAD_MAX_SIZE:
+            self.reject(
+                'Файл слишком большой. Максимальный размер — '
+                f'{settings.UPLOAD_MAX_SIZE // (1024 * 1024)} МБ.'
+            )
+            return None
+        if not self.checked:
+            self.header += raw_data
+            self.check_header(final=False)
+            if self.error:
+                return None
+        self.chunks.append(raw_data)
+        self.hasher.update(raw_data)
+        if self.checked and (self.file or self.size
+                             > settings.FILE_UPLOAD_MAX_MEMORY_SIZE):
+            self.flush()
+        return None
+
+    def check_header(self, final):
+        image_format, width, _ = sniff_image(self.header)
+        waiting = (
+            (image_format is None and len(self.header) < SNIFF_BYTES)
+            or (image_format is not None and width is None
+                and len(self.header) < HEADER_LIMIT)
+        )
+        if waiting and not final:
+            return
+        self.checked = True
+        error = check_image_header(
+            self.header, settings.UPLOAD_IMAGE_FORMATS,
+            *settings.UPLOAD_MAX_DIMENSIONS
+        )
+        if error:
+            self.reject(error)
+        self.header = b''
+
+    def reject(self, error):
+        self.error = error
+        self.chunks = []
+        if self.file:
+            self.file.close()
+            self.file = None
+
+    def flush(self):
+        if self.file is None:
+            self.file = StagedUploadedFile(
+                self.file_name, self.content_type, 0, self.charset,
+                self.content_type_extra,
+            )
+        for chunk in self.chunks:
+            self.file.write(chunk)
+        self.chunks = []
+
+    def file_complete(self, file_size):
+        if not self.error and not self.checked:
+            self.check_header(final=True)
+        if self.error:
+            return RejectedUploadedFile(
+                self.field_name, self.file_name, self.content_type,
+                self.error,
+            )
+        if self.file is None:
+            upload = InMemoryUploadedFile(
+                BytesIO(b''.join(self.chunks)), self.field_name,
+                self.file_name, self.content_type, file_size, self.charset,
+                self.content_type_extra,
+            )
+        else:
+            self.flush()
+            upload = self.file
+            upload.seek(0)
+            upload.size = file_size
+        upload.sha256 = self.hasher.hexdigest()
+        return upload
+
+    def upload_interrupted(self):
+        if self.file:
+            self.file.close()
+
+
+def image_uploads(view):
+    """Проверяет загрузки представления обработчиком ImageUploadHandler.
+
+    Остальные формы (админка, будущие поля файлов) получают обычные
+    обработчики Django. Список обработчиков можно менять только до
+    чтения request.POST, поэтому CsrfViewMiddleware пропускает
+    представление, а CSRF проверяется уже после замены.
+    """
+    protected = csrf_protect(view)
+
+    @csrf_exempt
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        request.upload_handlers.insert(0, ImageUploadHandler(request))
+        return protected(request, *args, **kwargs)
+
+    return wrapper
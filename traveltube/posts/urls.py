@@ -1,20 +1,36 @@
+from django.conf import settings
 from django.urls import path
 
 from . import views
 
 app_name = 'posts'
 
+# При запуске через ASGI страницы ленты обслуживают асинхронные варианты
+if settings.ASYNC_VIEWS:
+    from . import async_views as feed_views
+else:
+    feed_views = views
+
 
 urlpatterns = [
-    path('', views.index, name='index'),
-    path('group/<slug:slug>/', views.group_posts, name='group_posts'),
-    path('profile/<str:username>/', views.profile, name='profile'),
-    path('posts/<int:post_id>/', views.post_detail, name='post_detail'),
+    path('', feed_views.index, name='index'),
+    path('fragment/', views.index_fragment, name='index_fragment'),
+    path('popular/', views.popular, name='popular'),
+    path('groups/', views.group_index, name='group_index'),
+    path('group/<slug:slug>/', feed_views.group_posts, name='group_posts'),
+    path('group/<slug:slug>/fragment/', views.group_fragment,
+         name='group_fragment'),
+    path('profile/<str:username>/', feed_views.profile, name='profile'),
+    path('profile/<str:username>/fragment/', views.profile_fragment,
+         name='profile_fragment'),
+    path('posts/<int:post_id>/', feed_views.post_detail,
+         name='post_detail'),
     path('create/', views.create_post, name='create_post'),
     path('posts/<int:post_id>/edit/', views.edit_post, name='edit_post'),
     path('posts/<int:post_id>/comment/', views.add_comment,
          name='add_comment'),
     path('follow/', views.follow_index, name='follow_index'),
+    path('follow/fragment/', views.follow_fragment, name='follow_fragment'),
     path(
         'profile/<str:username>/follow/',
         views.profile_follow,
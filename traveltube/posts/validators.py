@@ -0,0 +1,103 @@
+import struct
+
+from django.core.exceptions import ValidationError
+
+# Сколько байт достаточно, чтобы отличить картинку от прочих файлов
+SNIFF_BYTES = 32
+# Сколько байт начала файла можно просмотреть в поисках размеров:
+# у JPEG перед ними бывают большие блоки EXIF
+HEADER_LIMIT = 256 * 1024
+
+JPEG_SOF_MARKERS = {
+    0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7,
+    0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF,
+}
+
+
+def _jpeg_size(header):
+    position = 2
+    while position + 9 <= len(header):
+        if header[position] != 0xFF:
+            return None, None
+        marker = header[position + 1]
+        if marker == 0xFF:
+            position += 1
+            continue
+        if marker in JPEG_SOF_MARKERS:
+            height, width = struct.unpack('>HH', header[position + 5:
+                                                        position + 9])
+            return width, height
+        if 0xD0 <= marker <= 0xD9 or marker == 0x01:
+            position += 2
+            continue
+        length, = struct.unpack('>H', header[position + 2:position + 4])
+        position += 2 + length
+    return None, None
+
+
+def _webp_size(header):
+    chunk = header[12:16]
+    if chunk == b'VP8 ' and len(header) >= 30:
+        width, height = struct.unpack('<HH', header[26:30])
+        return width & 0x3FFF, height & 0x3FFF
+    if chunk == b'VP8L' and len(header) >= 25:
+        bits, = struct.unpack('<I', header[21:25])
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    if chunk == b'VP8X' and len(header) >= 30:
+        width = int.from_bytes(header[24:27], 'little') + 1
+        height = int.from_bytes(header[27:30], 'little') + 1
+        return width, height
+    return None, None
+
+
+def sniff_image(header):
+    """Определяет формат и размеры картинки по первым байтам файла.
+
+    Возвращает (format, width, height). Формат None — файл не похож на
+    поддерживаемую картинку; размеры None — их нет в переданном куске.
+    """
+    if header.startswith(b'\x89PNG\r\n\x1a\n'):
+        if len(header) < 24:
+            return 'PNG', None, None
+        return ('PNG',) + struct.unpack('>II', header[16:24])
+    if header[:6] in (b'GIF87a', b'GIF89a'):
+        if len(header) < 10:
+            return 'GIF', None, None
+        return ('GIF',) + struct.unpack('<HH', header[6:10])
+    if header.startswith(b'\xff\xd8'):
+        return ('JPEG',) + _jpeg_size(header)
+    if header[:4] == b'RIFF' and header[8:12] == b'WEBP':
+        return ('WEBP',) + _webp_size(header)
+    return None, None, None
+
+
+def check_image_header(header, formats, max_width=None, max_height=None):
+    """Проверяет начало файла, возвращает текст ошибки или None."""
+    image_format, width, height = sniff_image(header)
+    if image_format not in formats:
+        return (
+            'Недопустимый формат файла. '
+            f'Поддерживаются только {", ".join(formats)}.'
+        )
+    if width is None:
+        return 'Не удалось определить размеры изображения.'
+    if ((max_width and width > max_width)
+            or (max_height and height > max_height)):
+        return (
+            f'Изображение {width}x{height} слишком большое. '
+            f'Максимальный размер — {max_width}x{max_height}.'
+        )
+    return None
+
+
+def validate_image_format(file, formats):
+    """Проверяет формат файла по заголовку, не декодируя картинку."""
+    file.open('rb')
+    position = file.tell()
+    try:
+        header = file.read(HEADER_LIMIT)
+    finally:
+        file.seek(position)
+    error = check_image_header(header, formats)
+    if error:
+        raise ValidationError(error)
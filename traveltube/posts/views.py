@@ -1,79 +1,137 @@
+from django.conf import settings
 from django.contrib.auth.decorators import login_required
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from django.http import HttpResponse, HttpResponseBadRequest
 from django.shortcuts import get_object_or_404, redirect, render
+from django.template.loader import render_to_string
+from django.utils.cache import patch_cache_control, patch_vary_headers
 
-from posts.services import make_pages
-from traveltube.settings import NUMBER_POSTS
+from core.compression import cached_body
+from core.querybudget import query_budget
+from core.ratelimit import ratelimit
+from posts.services import (add_page_links, keyset_page, make_pages,
+                            page_size)
+from traveltube.settings import NUMBER_GROUPS, NUMBER_POSTS
+from users.cache import get_author_or_404, user_summary
 
 from .forms import CommentForm, PostForm
-from .models import Follow, Group, Image, Post, PostImage, User
+from .fragments import fragment_key
+from .models import Follow, Group, Image, Post, PostImage
+from .uploadhandlers import image_uploads
 
 
+@query_budget(max_queries=3)
 def index(request):
-    posts = Post.objects.all().order_by('-pub_date')
+    posts = Post.objects.select_related('author', 'group').order_by(
+        '-pub_date')
     page_obj = make_pages(request, posts, NUMBER_POSTS)
     context = {
         'page_obj': page_obj,
         'posts': posts,
     }
-    return render(request, 'posts/index.html', context)
+    response = render(request, 'posts/index.html', context)
+    return add_page_links(request, response, page_obj)
 
 
+@query_budget(max_queries=3)
+def popular(request):
+    posts = Post.objects.filter(rank__isnull=False).select_related(
+        'author', 'group').order_by('-rank__score')
+    page_obj = make_pages(request, posts, NUMBER_POSTS)
+    context = {
+        'page_obj': page_obj,
+        'popular': True,
+    }
+    response = render(request, 'posts/popular.html', context)
+    return add_page_links(request, response, page_obj)
+
+
+@query_budget(max_queries=3)
+def group_index(request):
+    groups = Group.objects.select_related('stats').order_by(
+        F('stats__post_count').desc(nulls_last=True), 'title')
+    page_obj = make_pages(request, groups, NUMBER_GROUPS)
+    response = render(request, 'posts/group_index.html',
+                      {'page_obj': page_obj})
+    return add_page_links(request, response, page_obj)
+
+
+@query_budget(max_queries=4)
 def group_posts(request, slug):
     group = get_object_or_404(Group, slug=slug)
-    post_list = group.posts.all().order_by('-pub_date')
+    post_list = group.posts.select_related('author').order_by('-pub_date')
     page_obj = make_pages(request, post_list, NUMBER_POSTS)
     context = {
         'page_obj': page_obj,
         'group': group,
     }
-    return render(request, 'posts/group_list.html', context)
+    response = render(request, 'posts/group_list.html', context)
+    return add_page_links(request, response, page_obj)
 
 
+@query_budget(max_queries=8)
 def profile(request, username):
-    author = get_object_or_404(User, username=username)
+    author = get_author_or_404(username)
     template = 'posts/profile.html'
     following = request.user.is_authenticated and Follow.objects.filter(
         user=request.user, author=author
     )
     post_list = author.posts.select_related('group')
-    page_obj = make_pages(request, post_list, NUMBER_POSTS)
+    # Первая страница и счётчик берутся из сводки автора (users.cache)
+    page_obj = make_pages(request, post_list, NUMBER_POSTS,
+                          count=author.summary['posts_count'],
+                          first_ids=author.summary['post_ids'])
     context = {
         'author': author,
         'page_obj': page_obj,
         'following': following,
+        'posts_count': author.summary['posts_count'],
     }
-    return render(request, template, context)
+    response = render(request, template, context)
+    return add_page_links(request, response, page_obj)
 
 
+@query_budget(max_queries=9)
 def post_detail(request, post_id):
-    post = get_object_or_404(Post, pk=post_id)
+    post = get_object_or_404(
+        Post.objects.select_related('author', 'group'), pk=post_id)
     template = 'posts/post_detail.html'
     form = CommentForm(request.POST or None)
-    comments = post.comments.all()
+    comments = post.comments.select_related('author')
     context = {
         'post': post,
         'form': form,
         'comments': comments,
+        'post_images': post.images.all(),
+        'author_posts_count': user_summary(
+            post.author.username)['posts_count'],
     }
     return render(request, template, context)
 
 
+@image_uploads
 @login_required
+@ratelimit('create_post')
 def create_post(request):
     form = PostForm(request.POST, request.FILES)
     if form.is_valid():
-        post = form.save(commit=False)
-        post.author = request.user
-        post.save()
-        # Обработка множественных изображений
-        images = request.FILES.getlist('images')
-        # Получение списка изображений
-        for image_file in images:
-            image = Image(Image=image_file)
-            image.save()
-            # Сохранение объекта Image
-            post_image = PostImage(post=post, image=image)
-            post_image.save()
+        # Картинки без связи с постом удаляет collect_media, поэтому
+        # пост и его картинки сохраняются одной транзакцией
+        with transaction.atomic():
+            post = form.save(commit=False)
+            post.author = request.user
+            post.save()
+            # Обработка множественных изображений
+            images = request.FILES.getlist('images')
+            # Получение списка изображений
+            for image_file in images:
+                image = Image(Image=image_file)
+                image.save()
+                # Сохранение объекта Image
+                post_image = PostImage(post=post, image=image)
+                post_image.save()
         return redirect('posts:profile', username=post.author.username)
     else:
         print(form.errors)
@@ -81,6 +139,7 @@ def create_post(request):
                   {'form': form})
 
 
+@image_uploads
 @login_required
 def edit_post(request, post_id):
     post = get_object_or_404(Post, pk=post_id)
@@ -103,6 +162,7 @@ def edit_post(request, post_id):
 
 
 @login_required
+@ratelimit('add_comment')
 def add_comment(request, post_id):
     post = get_object_or_404(Post, pk=post_id)
     form = CommentForm(request.POST or None)
@@ -115,20 +175,25 @@ def add_comment(request, post_id):
 
 
 @login_required
+@query_budget(max_queries=3)
 def follow_index(request):
     template = 'posts/follow.html'
-    posts = Post.objects.filter(author__following__user=request.user)
+    posts = Post.objects.filter(
+        author__following__user=request.user
+    ).select_related('author', 'group')
     page_obj = make_pages(request, posts, NUMBER_POSTS)
     context = {
         'page_obj': page_obj,
         'follow': True,
     }
-    return render(request, template, context)
+    response = render(request, template, context)
+    return add_page_links(request, response, page_obj)
 
 
 @login_required
+@ratelimit('profile_follow', methods=None)
 def profile_follow(request, username):
-    author = get_object_or_404(User, username=username)
+    author = get_author_or_404(username)
     template = 'posts:profile'
     if author != request.user:
         Follow.objects.get_or_create(user=request.user, author=author)
@@ -137,7 +202,83 @@ def profile_follow(request, username):
 
 @login_required
 def profile_unfollow(request, username):
-    author = get_object_or_404(User, username=username)
+    author = get_author_or_404(username)
     template = 'posts:profile'
     Follow.objects.filter(user=request.user, author=author).delete()
     return redirect(template, author)
+
+
+def render_fragment(request, post_list, card_template, cache_key=None):
+    """Порция карточек после ?cursor= для бесконечной прокрутки.
+
+    Без base.html и шапки, курсор следующей порции — в заголовке
+    X-Next-Cursor. Общие ленты кешируются по курсору и размеру порции
+    вместе с уже сжатыми вариантами тела; изменения постов сбрасывают
+    кеш (posts.fragments).
+    """
+    cursor = request.GET.get('cursor', '')
+    per_page = page_size(request, NUMBER_POSTS)
+    key = cache_key and fragment_key(cache_key, cursor, per_page)
+    entry = cache.get(key) if key else None
+    changed = entry is None
+    if entry is None:
+        try:
+            posts, next_cursor = keyset_page(post_list, cursor, per_page)
+        except ValueError:
+            return HttpResponseBadRequest('Неверный курсор')
+        html = render_to_string('posts/includes/feed_fragment.html', {
+            'posts': posts,
+            'card_template': card_template,
+        })
+        entry = {'identity': html.encode(), 'next_cursor': next_cursor}
+    encoding, body, compressed = cached_body(request, entry)
+    if key and (changed or compressed):
+        cache.set(key, entry, settings.FEED_FRAGMENT_CACHE_TIMEOUT)
+    response = HttpResponse(body)
+    if encoding:
+        response['Content-Encoding'] = encoding
+    patch_vary_headers(response, ('Accept-Encoding',))
+    next_cursor = entry['next_cursor']
+    if next_cursor:
+        response['X-Next-Cursor'] = next_cursor
+        query = request.GET.copy()
+        query['cursor'] = next_cursor
+        response['Link'] = f'<{request.path}?{query.urlencode()}>; rel="next"'
+    if key:
+        patch_cache_control(response, public=True,
+                            max_age=settings.FEED_FRAGMENT_MAX_AGE)
+    else:
+        patch_cache_control(response, private=True)
+    return response
+
+
+@query_budget(max_queries=2)
+def index_fragment(request):
+    posts = Post.objects.select_related('author', 'group')
+    return render_fragment(request, posts, 'includes/template_index.html',
+                           cache_key='feed')
+
+
+@query_budget(max_queries=3)
+def group_fragment(request, slug):
+    group = get_object_or_404(Group, slug=slug)
+    posts = group.posts.select_related('author', 'group')
+    return render_fragment(request, posts, 'includes/common.html',
+                           cache_key=f'group:{group.pk}')
+
+
+@query_budget(max_queries=7)
+def profile_fragment(request, username):
+    author = get_author_or_404(username)
+    posts = author.posts.select_related('author', 'group')
+    return render_fragment(request, posts, 'includes/common.html',
+                           cache_key=f'author:{author.pk}')
+
+
+@login_required
+@query_budget(max_queries=2)
+def follow_fragment(request):
+    posts = Post.objects.filter(
+        author__following__user=request.user
+    ).select_related('author', 'group')
+    return render_fragment(request, posts, 'includes/template_index.html')
@@ -0,0 +1,59 @@
+-- migrations: 68233f55e8ef9a8a
+CREATE TABLE "django_migrations" ("id" integer NOT NULL PRIMARY KEY AUTOINCREMENT, "app" varchar(255) NOT NULL, "name" varchar(255) NOT NULL, "applied" datetime NOT NULL);
+CREATE TABLE "auth_group_permissions" ("id" integer NOT NULL PRIMARY KEY AUTOINCREMENT, "group_id" integer NOT NULL REFERENCES "auth_group" ("id") DEFERRABLE INITIALLY DEFERRED, "permission_id" integer NOT NULL REFERENCES "auth_permission" ("id") DEFERRABLE INITIALLY DEFERRED);
+CREATE TABLE "auth_user_groups" ("id" integer NOT NULL PRIMARY KEY AUTOINCREMENT, "user_id" integer NOT NULL REFERENCES "auth_user" ("id") DEFERRABLE INITIALLY DEFERRED, "group_id" integer NOT NULL REFERENCES "auth_group" ("id") DEFERRABLE INITIALLY DEFERRED);
+CREATE TABLE "auth_user_user_permissions" ("id" integer NOT NULL PRIMARY KEY AUTOINCREMENT, "user_id" integer NOT NULL REFERENCES "auth_user" ("id") DEFERRABLE INITIALLY DEFERRED, "permission_id" integer NOT NULL REFERENCES "auth_permission" ("id") DEFERRABLE INITIALLY DEFERRED);
+CREATE UNIQUE INDEX "auth_group_permissions_group_id_permission_id_0cd325b0_uniq" ON "auth_group_permissions" ("group_id", "permission_id");
+CREATE INDEX "auth_group_permissions_group_id_b120cbf9" ON "auth_group_permissions" ("group_id");
+CREATE INDEX "auth_group_permissions_permission_id_84c5c92e" ON "auth_group_permissions" ("permission_id");
+CREATE UNIQUE INDEX "auth_user_groups_user_id_group_id_94350c0c_uniq" ON "auth_user_groups" ("user_id", "group_id");
+CREATE INDEX "auth_user_groups_user_id_6a12ed8b" ON "auth_user_groups" ("user_id");
+CREATE INDEX "auth_user_groups_group_id_97559544" ON "auth_user_groups" ("group_id");
+CREATE UNIQUE INDEX "auth_user_user_permissions_user_id_permission_id_14a6b632_uniq" ON "auth_user_user_permissions" ("user_id", "permission_id");
+CREATE INDEX "auth_user_user_permissions_user_id_a95ead1b" ON "auth_user_user_permissions" ("user_id");
+CREATE INDEX "auth_user_user_permissions_permission_id_1fbb5f2c" ON "auth_user_user_permissions" ("permission_id");
+CREATE TABLE "django_admin_log" ("id" integer NOT NULL PRIMARY KEY AUTOINCREMENT, "action_time" datetime NOT NULL, "object_id" text NULL, "object_repr" varchar(200) NOT NULL, "change_message" text NOT NULL, "content_type_id" integer NULL REFERENCES "django_content_type" ("id") DEFERRABLE INITIALLY DEFERRED, "user_id" integer NOT NULL REFERENCES "auth_user" ("id") DEFERRABLE INITIALLY DEFERRED, "action_flag" smallint unsigned NOT NULL CHECK ("action_flag" >= 0));
+CREATE INDEX "django_admin_log_content_type_id_c4bce8eb" ON "django_admin_log" ("content_type_id");
+CREATE INDEX "django_admin_log_user_id_c564eba6" ON "django_admin_log" ("user_id");
+CREATE TABLE "django_content_type" ("id" integer NOT NULL PRIMARY KEY AUTOINCREMENT, "app_label" varchar(100) NOT NULL, "model" varchar(100) NOT NULL);
+CREATE UNIQUE INDEX "django_content_type_app_label_model_76bd3d3b_uniq" ON "django_content_type" ("app_label", "model");
+CREATE TABLE "auth_permission" ("id" integer NOT NULL PRIMARY KEY AUTOINCREMENT, "content_type_id" integer NOT NULL REFERENCES "django_content_type" ("id") DEFERRABLE INITIALLY DEFERRED, "codename" varchar(100) NOT NULL, "name" varchar(255) NOT NULL);
+CREATE UNIQUE INDEX "auth_permission_content_type_id_codename_01ab375a_uniq" ON "auth_permission" ("content_type_id", "codename");
+CREATE INDEX "auth_permission_content_type_id_2f476e4b" ON "auth_permission" ("content_type_id");
+CREATE TABLE "auth_group" ("id" integer NOT NULL PRIMARY KEY AUTOINCREMENT, "name" varchar(150) NOT NULL UNIQUE);
+CREATE TABLE "auth_user" ("id" integer NOT NULL PRIMARY KEY AUTOINCREMENT, "password" varchar(128) NOT NULL, "last_login" datetime NULL, "is_superuser" bool NOT NULL, "username" varchar(150) NOT NULL UNIQUE, "last_name" varchar(150) NOT NULL, "email" varchar(254) NOT NULL, "is_staff" bool NOT NULL, "is_active" bool NOT NULL, "date_joined" datetime NOT NULL, "first_name" varchar(150) NOT NULL);
+CREATE TABLE "core_job" ("id" integer NOT NULL PRIMARY KEY AUTOINCREMENT, "name" varchar(100) NOT NULL, "params" text NOT NULL, "status" varchar(10) NOT NULL, "total" integer unsigned NOT NULL CHECK ("total" >= 0), "processed" integer unsigned NOT NULL CHECK ("processed" >= 0), "error" text NOT NULL, "created" datetime NOT NULL, "started" datetime NULL, "finished" datetime NULL, "created_by_id" integer NULL REFERENCES "auth_user" ("id") DEFERRABLE INITIALLY DEFERRED);
+CREATE INDEX "core_job_status_ce8f16d2" ON "core_job" ("status");
+CREATE INDEX "core_job_created_by_id_818c132f" ON "core_job" ("created_by_id");
+CREATE TABLE "posts_group" ("id" integer NOT NULL PRIMARY KEY AUTOINCREMENT, "title" varchar(200) NOT NULL, "slug" varchar(50) NOT NULL UNIQUE, "description" text NOT NULL);
+CREATE TABLE "posts_comment" ("id" integer NOT NULL PRIMARY KEY AUTOINCREMENT, "text" text NOT NULL, "pub_date" datetime NOT NULL, "author_id" integer NOT NULL REFERENCES "auth_user" ("id") DEFERRABLE INITIALLY DEFERRED, "post_id" integer NOT NULL REFERENCES "posts_post" ("id") DEFERRABLE INITIALLY DEFERRED);
+CREATE TABLE "posts_follow" ("id" integer NOT NULL PRIMARY KEY AUTOINCREMENT, "author_id" integer NOT NULL REFERENCES "auth_user" ("id") DEFERRABLE INITIALLY DEFERRED, "user_id" integer NOT NULL REFERENCES "auth_user" ("id") DEFERRABLE INITIALLY DEFERRED, CONSTRAINT "unique_subscription" UNIQUE ("user_id", "author_id"));
+CREATE INDEX "posts_comment_pub_date_90133a5e" ON "posts_comment" ("pub_date");
+CREATE INDEX "posts_comment_author_id_795e4d12" ON "posts_comment" ("author_id");
+CREATE INDEX "posts_comment_post_id_e81436d7" ON "posts_comment" ("post_id");
+CREATE INDEX "posts_follow_author_id_07282e68" ON "posts_follow" ("author_id");
+CREATE INDEX "posts_follow_user_id_0b8e2703" ON "posts_follow" ("user_id");
+CREATE TABLE "posts_postimage" ("id" integer NOT NULL PRIMARY KEY AUTOINCREMENT, "image_id" integer NOT NULL REFERENCES "posts_image" ("id") DEFERRABLE INITIALLY DEFERRED, "post_id" integer NOT NULL REFERENCES "posts_post" ("id") DEFERRABLE INITIALLY DEFERRED);
+CREATE INDEX "posts_postimage_image_id_ace4b757" ON "posts_postimage" ("image_id");
+CREATE INDEX "posts_postimage_post_id_a2f20392" ON "posts_postimage" ("post_id");
+CREATE TABLE "posts_mediablob" ("id" integer NOT NULL PRIMARY KEY AUTOINCREMENT, "name" varchar(255) NOT NULL UNIQUE, "refcount" integer unsigned NOT NULL CHECK ("refcount" >= 0), "updated" datetime NOT NULL);
+CREATE TABLE "posts_image" ("id" integer NOT NULL PRIMARY KEY AUTOINCREMENT, "Image" varchar(100) NOT NULL);
+CREATE INDEX "posts_mediablob_updated_2a80ae1e" ON "posts_mediablob" ("updated");
+CREATE TABLE "posts_postrank" ("post_id" integer NOT NULL PRIMARY KEY REFERENCES "posts_post" ("id") DEFERRABLE INITIALLY DEFERRED, "score" real NOT NULL, "computed" datetime NOT NULL);
+CREATE INDEX "posts_postrank_score_a6696851" ON "posts_postrank" ("score");
+CREATE TABLE "posts_groupstats" ("group_id" integer NOT NULL PRIMARY KEY REFERENCES "posts_group" ("id") DEFERRABLE INITIALLY DEFERRED, "post_count" integer unsigned NOT NULL CHECK ("post_count" >= 0), "last_post_date" datetime NULL, "top_authors" text NOT NULL);
+CREATE TABLE "posts_groupauthorstats" ("id" integer NOT NULL PRIMARY KEY AUTOINCREMENT, "post_count" integer unsigned NOT NULL CHECK ("post_count" >= 0), "author_id" integer NOT NULL REFERENCES "auth_user" ("id") DEFERRABLE INITIALLY DEFERRED, "group_id" integer NOT NULL REFERENCES "posts_group" ("id") DEFERRABLE INITIALLY DEFERRED, CONSTRAINT "unique_group_author" UNIQUE ("group_id", "author_id"));
+CREATE INDEX "posts_groupstats_post_count_b0511105" ON "posts_groupstats" ("post_count");
+CREATE INDEX "posts_groupauthorstats_author_id_47ff288b" ON "posts_groupauthorstats" ("author_id");
+CREATE INDEX "posts_groupauthorstats_group_id_8716af43" ON "posts_groupauthorstats" ("group_id");
+CREATE INDEX "group_top_authors" ON "posts_groupauthorstats" ("group_id", "post_count" DESC);
+CREATE TABLE "posts_post" ("id" integer NOT NULL PRIMARY KEY AUTOINCREMENT, "text" text NOT NULL, "pub_date" datetime NOT NULL, "author_id" integer NOT NULL REFERENCES "auth_user" ("id") DEFERRABLE INITIALLY DEFERRED, "group_id" integer NULL REFERENCES "posts_group" ("id") DEFERRABLE INITIALLY DEFERRED, "image" varchar(100) NOT NULL, "updated" datetime NOT NULL, "is_deleted" bool NOT NULL);
+CREATE INDEX "posts_post_pub_date_131c7f8d" ON "posts_post" ("pub_date");
+CREATE INDEX "posts_post_author_id_fe5487bf" ON "posts_post" ("author_id");
+CREATE INDEX "posts_post_group_id_c91a8485" ON "posts_post" ("group_id");
+CREATE TABLE "django_session" ("session_key" varchar(40) NOT NULL PRIMARY KEY, "session_data" text NOT NULL, "expire_date" datetime NOT NULL);
+CREATE INDEX "django_session_expire_date_a5c62663" ON "django_session" ("expire_date");
+CREATE TABLE "thumbnail_kvstore" ("key" varchar(200) NOT NULL PRIMARY KEY, "value" text NOT NULL);
+CREATE TABLE "users_contact" ("id" integer NOT NULL PRIMARY KEY AUTOINCREMENT, "name" varchar(100) NOT NULL, "email" varchar(254) NOT NULL, "subject" varchar(100) NOT NULL, "body" text NOT NULL, "is_answered" bool NOT NULL, "created" datetime NOT NULL);
+CREATE INDEX "contact_unanswered" ON "users_contact" ("created") WHERE NOT "is_answered";
+CREATE TABLE "users_deleteduser" ("user_id" integer NOT NULL PRIMARY KEY REFERENCES "auth_user" ("id") DEFERRABLE INITIALLY DEFERRED, "deleted_at" datetime NOT NULL);
@@ -0,0 +1,50 @@
+// Бесконечная прокрутка: когда пользователь доходит до конца списка,
+// следующая порция карточек подгружается с fragment-адреса ленты
+// и дописывается в #posts. Пагинатор остаётся для браузеров без JS.
+(function () {
+  var script = document.currentScript;
+  var posts = document.getElementById('posts');
+  if (!script || !posts || !window.fetch || !window.IntersectionObserver) {
+    return;
+  }
+  var cursor = script.dataset.cursor;
+  var loading = false;
+  var sentinel = document.createElement('div');
+  posts.parentNode.insertBefore(sentinel, posts.nextSibling);
+  var pagination = document.querySelector('.pagination');
+  if (pagination) {
+    pagination.parentNode.hidden = true;
+  }
+
+  var observer = new IntersectionObserver(function (entries) {
+    if (!entries[0].isIntersecting || loading || !cursor) {
+      return;
+    }
+    loading = true;
+    var url = script.dataset.fragmentUrl +
+      '?per_page=' + script.dataset.perPage +
+      '&cursor=' + encodeURIComponent(cursor);
+    fetch(url, {credentials: 'same-origin'})
+      .then(function (response) {
+        if (!response.ok) {
+          throw new Error(response.statusText);
+        }
+        cursor = response.headers.get('X-Next-Cursor');
+        return response.text();
+      })
+      .then(function (html) {
+        posts.insertAdjacentHTML('beforeend', html);
+        loading = false;
+        if (!cursor) {
+          observer.disconnect();
+        }
+      })
+      .catch(function () {
+        observer.disconnect();
+        if (pagination) {
+          pagination.parentNode.hidden = false;
+        }
+      });
+  }, {rootMargin: '600px'});
+  observer.observe(sentinel);
+})();
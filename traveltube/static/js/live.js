@@ -0,0 +1,31 @@
+// Живые обновления: подписка на канал server-sent events.
+// Новые комментарии приходят готовым HTML, о новых постах
+// показывается счётчик со ссылкой на обновление страницы.
+(function () {
+  var script = document.currentScript;
+  if (!script || !window.EventSource) {
+    return;
+  }
+  var source = new EventSource(script.dataset.liveUrl);
+  var newPosts = 0;
+  var notice = null;
+
+  source.addEventListener('post', function () {
+    newPosts += 1;
+    if (!notice) {
+      notice = document.createElement('a');
+      notice.className = 'btn btn-light my-2 d-block';
+      notice.href = window.location.pathname;
+      var main = document.querySelector('main');
+      main.insertBefore(notice, main.firstChild);
+    }
+    notice.textContent = 'Новых записей: ' + newPosts + '. Обновить';
+  });
+
+  source.addEventListener('comment', function (event) {
+    var comments = document.getElementById('comments');
+    if (comments) {
+      comments.insertAdjacentHTML('afterbegin', JSON.parse(event.data).html);
+    }
+  });
+})();
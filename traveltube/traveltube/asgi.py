@@ -0,0 +1,33 @@
+"""
+ASGI config for traveltube project.
+
+It exposes the ASGI callable as a module-level variable named ``application``.
+Requests under LIVE_URL_PREFIX are served by the server-sent events endpoint,
+everything else goes to Django, with the async feed views enabled by
+ASYNC_VIEWS.
+
+For more information on this file, see
+https://docs.djangoproject.com/en/3.2/howto/deployment/asgi/
+"""
+
+import os
+
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'traveltube.settings')
+os.environ.setdefault('ASYNC_VIEWS', 'True')
+
+django_application = get_asgi_application()
+
+from django.conf import settings  # noqa: E402
+
+from posts.live import LiveUpdatesApp  # noqa: E402
+
+live_application = LiveUpdatesApp()
+
+
+async def application(scope, receive, send):
+    if (scope['type'] == 'http'
+            and scope['path'].startswith(settings.LIVE_URL_PREFIX)):
+        return await live_application(scope, receive, send)
+    return await django_application(scope, receive, send)
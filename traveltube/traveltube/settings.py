@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/2.2/ref/settings/
 """
 
 import os
+from importlib.util import find_spec
 
 # Build paths inside the project like this: os.path.join(BASE_DIR, ...)
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -23,7 +24,7 @@ BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 SECRET_KEY = 'p5jo)(oujp^oe$q&yq2mj6bg7fb7n16m=p6&kwzuy!m^_dhj9r'
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = False
+DEBUG = os.getenv('DEBUG', 'False') == 'True'
 
 ALLOWED_HOSTS = [
     'localhost',
@@ -45,20 +46,19 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
-    'debug_toolbar',
     'users.apps.UsersConfig',
     'sorl.thumbnail',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'core.compression.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
-    'debug_toolbar.middleware.DebugToolbarMiddleware',
 ]
 
 ROOT_URLCONF = 'traveltube.urls'
@@ -75,11 +75,45 @@ TEMPLATES = [
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
                 'core.context_processors.year.year',
+                'core.context_processors.live.live_updates',
             ],
         },
     },
 ]
 
+# Режим производительности шаблонов: явный кешируемый загрузчик и
+# встраивание частых include при загрузке (core.template_loaders)
+TEMPLATE_PERFORMANCE_MODE = (
+    os.getenv('TEMPLATE_PERFORMANCE_MODE', 'False') == 'True'
+)
+TEMPLATE_INLINE_INCLUDES = (
+    'posts/includes/switcher.html',
+    'posts/includes/paginator.html',
+    'posts/includes/comment.html',
+)
+if TEMPLATE_PERFORMANCE_MODE:
+    TEMPLATES[0]['APP_DIRS'] = False
+    TEMPLATES[0]['OPTIONS']['loaders'] = [
+        ('django.template.loaders.cached.Loader', [
+            ('core.template_loaders.Loader', [
+                'django.template.loaders.filesystem.Loader',
+                'django.template.loaders.app_directories.Loader',
+            ]),
+        ]),
+    ]
+
+# Движок для карточек постов в лентах: django или jinja2 (нужен Jinja2)
+FEED_TEMPLATE_ENGINE = os.getenv('FEED_TEMPLATE_ENGINE', 'django')
+if FEED_TEMPLATE_ENGINE == 'jinja2':
+    TEMPLATES.append({
+        'BACKEND': 'django.template.backends.jinja2.Jinja2',
+        'DIRS': [os.path.join(BASE_DIR, 'templates', 'jinja2')],
+        'APP_DIRS': False,
+        'OPTIONS': {
+            'environment': 'core.jinja2.environment',
+        },
+    })
+
 WSGI_APPLICATION = 'traveltube.wsgi.application'
 
 
@@ -92,6 +126,8 @@ DATABASES = {
         'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
     }
 }
+# Существующие таблицы созданы с целочисленным AutoField
+DEFAULT_AUTO_FIELD = 'django.db.models.AutoField'
 
 
 # Password validation
@@ -112,6 +148,29 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Хеширование паролей (core.hashers): argon2 (нужен argon2-cffi),
+# bcrypt (нужен bcrypt) или pbkdf2. Новые пароли хешируются выбранным
+# алгоритмом, старые хеши пересчитываются им при следующем входе.
+PASSWORD_HASHER = os.getenv(
+    'PASSWORD_HASHER', 'argon2' if find_spec('argon2') else 'pbkdf2')
+_PASSWORD_HASHERS = {
+    'argon2': 'core.hashers.Argon2PasswordHasher',
+    'bcrypt': 'core.hashers.BCryptSHA256PasswordHasher',
+    'pbkdf2': 'core.hashers.PBKDF2PasswordHasher',
+}
+PASSWORD_HASHERS = [_PASSWORD_HASHERS[PASSWORD_HASHER]] + [
+    path for name, path in _PASSWORD_HASHERS.items()
+    if name != PASSWORD_HASHER
+]
+# Параметры по рекомендациям OWASP: память argon2 — в КиБ
+PASSWORD_ARGON2 = {'time_cost': 2, 'memory_cost': 19 * 1024,
+                   'parallelism': 1}
+PASSWORD_BCRYPT_ROUNDS = 10
+PASSWORD_PBKDF2_ITERATIONS = 150000
+# Сколько хешей считается одновременно, остальные входы ждут очереди
+PASSWORD_HASH_WORKERS = int(
+    os.getenv('PASSWORD_HASH_WORKERS', os.cpu_count() or 1))
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/2.2/topics/i18n/
@@ -142,6 +201,97 @@ STATICFILES_DIRS = [
 ]
 
 NUMBER_POSTS = 5
+NUMBER_GROUPS = 20
+# Верхняя граница для ?per_page=
+MAX_POSTS_PER_PAGE = 100
+
+# Кеш HTML-карточек постов в лентах (posts.cards).
+# Увеличьте версию, чтобы сбросить все карточки сразу.
+POST_CARD_CACHE_TIMEOUT = 24 * 60 * 60
+POST_CARD_CACHE_VERSION = 1
+# Сводки пользователей для профилей и подписок (users.cache)
+USER_SUMMARY_CACHE_TIMEOUT = 10 * 60
+# Сколько первых постов профиля хранится в сводке автора
+PROFILE_SNAPSHOT_POSTS = 20
+# Порции бесконечной прокрутки общих лент кешируются по курсору.
+# Кеш сервера сбрасывается при изменении постов (posts.fragments), а
+# браузеры и прокси могут показывать удалённый пост ещё до
+# FEED_FRAGMENT_MAX_AGE секунд
+FEED_FRAGMENT_CACHE_TIMEOUT = 60
+FEED_FRAGMENT_MAX_AGE = 5
+
+# Картинки постов проверяются по мере получения данных: обработчик
+# подключают только представления создания и правки поста
+# (posts.uploadhandlers.image_uploads)
+UPLOAD_MAX_SIZE = 10 * 1024 * 1024
+UPLOAD_MAX_DIMENSIONS = (6000, 6000)
+UPLOAD_IMAGE_FORMATS = ('JPEG', 'PNG', 'WEBP', 'GIF')
+
+# Рейтинг популярных постов (команда rank_posts)
+RANKING_WINDOW_DAYS = 30
+RANKING_HALF_LIFE_HOURS = 24
+RANKING_FOLLOWER_WEIGHT = 0.5
+RANKING_LIMIT = 10000
+
+# Ограничение частоты записей (core.ratelimit):
+# представление -> (запросов, за столько секунд)
+RATELIMITS = {
+    'add_comment': (10, 60),
+    'profile_follow': (30, 60),
+    'create_post': (5, 300),
+    'contact': (5, 3600),
+}
+RATELIMIT_CACHE = 'default'
+# За прокси адрес клиента берётся из заголовка, например HTTP_X_REAL_IP
+RATELIMIT_IP_HEADER = os.getenv('RATELIMIT_IP_HEADER', 'REMOTE_ADDR')
+# Сколько своих прокси дописывают адрес в заголовок (X-Forwarded-For):
+# клиентом считается адрес, добавленный самым внешним из них
+RATELIMIT_TRUSTED_PROXIES = int(os.getenv('RATELIMIT_TRUSTED_PROXIES', 1))
+
+# Сжатие ответов (core.compression): тип содержимого -> уровни для
+# кодирований. brotli используется, если установлен пакет Brotli.
+# Страницы с CSRF-токеном (формы) отдаются несжатыми. В сжатом виде
+# кешируются только фрагменты ленты (/fragment/); кеш страницы ленты
+# ({% cache %} в index.html) хранит несжатую разметку.
+COMPRESSION_LEVELS = {
+    'text/html': {'br': 5, 'gzip': 6},
+    'text/plain': {'br': 5, 'gzip': 6},
+    'text/css': {'br': 9, 'gzip': 9},
+    'application/javascript': {'br': 9, 'gzip': 9},
+    'application/json': {'br': 4, 'gzip': 5},
+}
+COMPRESSION_MIN_SIZE = 200
+
+# Фоновые задачи (core.jobs, команда run_jobs): записей в одной транзакции
+JOB_CHUNK_SIZE = 100
+# Окончательное удаление постов и пользователей (posts.purge): строк
+# в одной транзакции и пауза между транзакциями в секундах. Мягко
+# удалённые посты сразу пропадают из страниц и кеша порций на сервере;
+# порции общих лент, сохранённые браузерами и прокси, живут ещё до
+# FEED_FRAGMENT_MAX_AGE секунд
+PURGE_BATCH_SIZE = 500
+PURGE_PAUSE = 0.05
+
+# Снимок схемы для быстрого создания пустой базы (bootstrap_schema)
+SCHEMA_SNAPSHOT = os.path.join(BASE_DIR, 'schema.sql')
+
+TEST_RUNNER = 'core.runner.TestRunner'
+
+# Бюджет SQL-запросов представлений (core.querybudget): raise —
+# исключение, log — предупреждение в лог, off — не считать. В тестах
+# включается raise (core.runner.TestRunner, фикстура pytest).
+# Запрос, повторённый с разными параметрами больше MAX_REPEATS раз,
+# считается N+1.
+QUERY_BUDGET_ACTION = os.getenv(
+    'QUERY_BUDGET_ACTION', 'log' if DEBUG else 'off')
+QUERY_BUDGET_MAX_REPEATS = 3
+# Суммарное время SQL за представление, если бюджет не задаёт своё
+QUERY_BUDGET_MAX_TIME = 0.5
+# Таблицы, запросы к которым не считаются: сессия читается один раз
+# на запрос, и попадёт ли она в базу, зависит от SESSION_BACKEND.
+# Записи миниатюр sorl считаются: карточки читают их одним запросом
+# (posts.thumbnails)
+QUERY_BUDGET_IGNORE_TABLES = ('django_session',)
 
 LOGIN_URL = 'users:login'
 LOGIN_REDIRECT_URL = 'posts:index'
@@ -156,11 +306,54 @@ EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
 CACHES = {
     'default': {
         'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-    }
+        # Карточки постов кешируются по одной: 300 записей по умолчанию
+        # не хватает даже на одну большую страницу ленты
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    },
+    # Отдельный кеш, чтобы карточки постов не вытесняли сессии.
+    # Задаётся переменными SESSION_CACHE_BACKEND и SESSION_CACHE_LOCATION.
+    'sessions': {
+        'BACKEND': os.getenv('SESSION_CACHE_BACKEND',
+                             'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('SESSION_CACHE_LOCATION', 'sessions'),
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    },
 }
+# LocMemCache у каждого процесса свой: выход из аккаунта в одном воркере
+# не удалил бы сессию из кеша других. Кешировать сессии можно только
+# в общем для всех процессов кеше.
+SESSION_CACHE_SHARED = any(
+    name in CACHES['sessions']['BACKEND'].lower()
+    for name in ('memcached', 'redis')
+)
+
+# Хранилище сессий: db, cached_db (общий кеш с записью в базу, по
+# умолчанию при memcached или redis в кеше sessions) или signed_cookies
+# (сессия целиком в подписанной cookie, без базы)
+SESSION_BACKEND = os.getenv(
+    'SESSION_BACKEND', 'cached_db' if SESSION_CACHE_SHARED else 'db'
+)
+SESSION_ENGINE = f'django.contrib.sessions.backends.{SESSION_BACKEND}'
+SESSION_CACHE_ALIAS = 'sessions'
 
 CSRF_FAILURE_VIEW = 'core.views.csrf_failure'
 
 INTERNAL_IPS = [
     '127.0.0.1',
 ]
+# Панель отладки подключается только при DEBUG=True: в продакшене её
+# импорт (вместе с Jinja2) лишь замедляет запуск воркеров
+if DEBUG:
+    INSTALLED_APPS.append('debug_toolbar')
+    MIDDLEWARE.append('debug_toolbar.middleware.DebugToolbarMiddleware')
+
+# Живые обновления ленты и комментариев (server-sent events).
+# Требуют запуска через ASGI: traveltube.asgi:application
+LIVE_UPDATES = os.getenv('LIVE_UPDATES', 'False') == 'True'
+LIVE_URL_PREFIX = '/live/'
+LIVE_BROKER = 'core.pubsub.LocalBroker'
+
+# Асинхронные страницы ленты (включаются в traveltube.asgi)
+ASYNC_VIEWS = os.getenv('ASYNC_VIEWS', 'False') == 'True'
+# Размер пула потоков для запросов к базе из асинхронных страниц
+ASYNC_DB_WORKERS = int(os.getenv('ASYNC_DB_WORKERS', 8))
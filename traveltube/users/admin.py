@@ -0,0 +1,112 @@
+from django import forms
+from django.contrib import admin, messages
+from django.contrib.admin.helpers import ActionForm
+from django.contrib.auth import get_user_model
+from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from django.urls import reverse
+from django.utils.html import format_html
+
+from core.jobs import enqueue
+from posts.admin import ScalableAdmin
+from posts.purge import soft_delete_user
+
+from .models import Contact
+
+User = get_user_model()
+
+
+class UserAdmin(BaseUserAdmin):
+    """Удаление пользователя мягкое: он скрывается сразу, а его посты,
+    комментарии и подписки вычищает фоновая задача purge_user."""
+    actions = ('delete_in_background',)
+
+    def get_actions(self, request):
+        actions = super().get_actions(request)
+        actions.pop('delete_selected', None)
+        return actions
+
+    def delete_model(self, request, obj):
+        soft_delete_user(obj)
+        enqueue('purge_user', created_by=request.user, user_id=obj.pk)
+
+    def delete_in_background(self, request, queryset):
+        for user in queryset:
+            self.delete_model(request, user)
+        self.message_user(
+            request, f'Пользователей к удалению: {len(queryset)}')
+
+    delete_in_background.short_description = 'Удалить (в фоне)'
+    delete_in_background.allowed_permissions = ('delete',)
+
+
+admin.site.unregister(User)
+admin.site.register(User, UserAdmin)
+
+
+class InboxFilter(admin.SimpleListFilter):
+    """По умолчанию показывает только обращения без ответа."""
+    title = 'статус'
+    parameter_name = 'status'
+
+    def lookups(self, request, model_admin):
+        return (('answered', 'С ответом'), ('all', 'Все'))
+
+    def choices(self, changelist):
+        yield {
+            'selected': self.value() is None,
+            'query_string': changelist.get_query_string(
+                remove=[self.parameter_name]),
+            'display': 'Без ответа',
+        }
+        for lookup, title in self.lookup_choices:
+            yield {
+                'selected': self.value() == lookup,
+                'query_string': changelist.get_query_string(
+                    {self.parameter_name: lookup}),
+                'display': title,
+            }
+
+    def queryset(self, request, queryset):
+        if self.value() is None:
+            return queryset.filter(is_answered=False)
+        if self.value() == 'answered':
+            return queryset.filter(is_answered=True)
+        return queryset
+
+
+class ReplyForm(ActionForm):
+    message = forms.CharField(
+        label='Ответ', required=False,
+        widget=forms.Textarea(attrs={'rows': 2}),
+    )
+
+
+@admin.register(Contact)
+class ContactAdmin(ScalableAdmin):
+    list_display = ('subject', 'name', 'email', 'created', 'is_answered')
+    list_filter = (InboxFilter,)
+    search_fields = ('subject', 'email')
+    readonly_fields = ('name', 'email', 'subject', 'body', 'created')
+    action_form = ReplyForm
+    actions = ('answer',)
+
+    def has_add_permission(self, request):
+        return False
+
+    def answer(self, request, queryset):
+        message = request.POST.get('message', '').strip()
+        if not message:
+            self.message_user(request, 'Введите текст ответа',
+                              messages.ERROR)
+            return
+        ids = list(queryset.values_list('pk', flat=True))
+        job = enqueue('answer_contacts', created_by=request.user, ids=ids,
+                      message=message)
+        url = reverse('admin:core_job_change', args=[job.pk])
+        self.message_user(request, format_html(
+            'Ответ на {} обращений поставлен в очередь: <a href="{}">{}</a>',
+            len(ids), url, job,
+        ))
+
+    answer.short_description = 'Ответить (в фоне)'
+    answer.allowed_permissions = ('change',)
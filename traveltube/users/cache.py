@@ -0,0 +1,99 @@
+"""Кеш сводок пользователей по имени из URL.
+
+Профиль, подписка и отписка находят автора по username на каждый
+запрос. В кеше лежат id пользователя по имени и сводка по id (имя,
+отображаемое имя, счётчики и id первых PROFILE_SNAPSHOT_POSTS постов
+для первой страницы профиля). Сигналы (users.signals) дописывают в
+сводку новый пост автора и сбрасывают её при остальных изменениях
+пользователя, его постов и подписок — им достаточно id. Для фильтров
+и шаблонов из сводки собирается экземпляр User без запроса к auth_user.
+"""
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.http import Http404
+
+User = get_user_model()
+
+
+def name_key(username):
+    return f'user:id:{username}'
+
+
+def summary_key(user_id):
+    return f'user:summary:{user_id}'
+
+
+def load_summary(username):
+    from posts.models import Follow, Post
+
+    user = User.objects.filter(username=username,
+                               deletion__isnull=True).values(
+        'pk', 'username', 'first_name', 'last_name').first()
+    if user is None:
+        return None
+    return {
+        'id': user['pk'],
+        'username': user['username'],
+        'first_name': user['first_name'],
+        'last_name': user['last_name'],
+        'posts_count': Post.objects.filter(author_id=user['pk']).count(),
+        'followers_count': Follow.objects.filter(
+            author_id=user['pk']).count(),
+        'following_count': Follow.objects.filter(
+            user_id=user['pk']).count(),
+        'post_ids': list(Post.objects.filter(author_id=user['pk'])
+                         .values_list('pk', flat=True)
+                         [:settings.PROFILE_SNAPSHOT_POSTS]),
+    }
+
+
+def user_summary(username):
+    """Сводка неудалённого пользователя или None, если его нет."""
+    user_id = cache.get(name_key(username))
+    summary = user_id and cache.get(summary_key(user_id))
+    if summary is None:
+        summary = load_summary(username)
+        if summary is None:
+            return None
+        cache.set_many({
+            name_key(username): summary['id'],
+            summary_key(summary['id']): summary,
+        }, settings.USER_SUMMARY_CACHE_TIMEOUT)
+    return summary
+
+
+def invalidate(user_id, *usernames):
+    cache.delete_many([summary_key(user_id)] + [
+        name_key(username) for username in usernames if username])
+
+
+def post_added(author_id, post_id):
+    """Дописывает новый пост в начало сводки, если она в кеше.
+
+    Одновременные посты одного автора могут затереть друг друга, но
+    сводка в худшем случае отстанет до истечения таймаута.
+    """
+    key = summary_key(author_id)
+    summary = cache.get(key)
+    if summary is None:
+        return
+    summary['posts_count'] += 1
+    summary['post_ids'] = [post_id] + summary['post_ids'][
+        :settings.PROFILE_SNAPSHOT_POSTS - 1]
+    cache.set(key, summary, settings.USER_SUMMARY_CACHE_TIMEOUT)
+
+
+def get_author_or_404(username):
+    """Автор из сводки без обращения к базе.
+
+    Остальные поля User отложены и загрузятся при первом обращении.
+    """
+    summary = user_summary(username)
+    if summary is None:
+        raise Http404('Пользователь не найден')
+    fields = ('id', 'username', 'first_name', 'last_name')
+    author = User.from_db(
+        None, fields, [summary[field] for field in fields])
+    author.summary = summary
+    return author
@@ -0,0 +1,34 @@
+"""Фоновые задачи для обращений через форму обратной связи."""
+from django.conf import settings
+from django.core.mail import mail_managers, send_mass_mail
+
+from core.jobs import register, run_in_chunks
+
+from .models import Contact
+
+
+@register('contact_received')
+def contact_received(job, contact_id):
+    contact = Contact.objects.filter(pk=contact_id).first()
+    if contact is None:
+        return
+    # Автоответа посетителю нет: адрес и тему вводит кто угодно, и
+    # форма стала бы рассылкой писем на чужие адреса
+    mail_managers(f'Новое обращение: {contact.subject}',
+                  f'{contact.name} <{contact.email}>\n\n{contact.body}')
+
+
+@register('answer_contacts')
+def answer_contacts(job, ids, message):
+    def handler(chunk):
+        contacts = list(Contact.objects.filter(pk__in=chunk,
+                                               is_answered=False))
+        # Одно соединение с почтовым сервером на пачку писем
+        send_mass_mail(
+            (f'Re: {contact.subject}', message, None, [contact.email])
+            for contact in contacts
+        )
+        Contact.objects.filter(pk__in=[contact.pk for contact in contacts]
+                               ).update(is_answered=True)
+
+    run_in_chunks(job, ids, handler, settings.JOB_CHUNK_SIZE)
@@ -0,0 +1,51 @@
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='contact',
+            options={'ordering': ('-created',), 'verbose_name': 'Обращение', 'verbose_name_plural': 'Обращения'},
+        ),
+        migrations.AddField(
+            model_name='contact',
+            name='created',
+            field=models.DateTimeField(auto_now_add=True, default=django.utils.timezone.now, verbose_name='получено'),
+            preserve_default=False,
+        ),
+        migrations.AlterField(
+            model_name='contact',
+            name='body',
+            field=models.TextField(verbose_name='сообщение'),
+        ),
+        migrations.AlterField(
+            model_name='contact',
+            name='email',
+            field=models.EmailField(max_length=254, verbose_name='почта'),
+        ),
+        migrations.AlterField(
+            model_name='contact',
+            name='is_answered',
+            field=models.BooleanField(default=False, verbose_name='есть ответ'),
+        ),
+        migrations.AlterField(
+            model_name='contact',
+            name='name',
+            field=models.CharField(max_length=100, verbose_name='имя'),
+        ),
+        migrations.AlterField(
+            model_name='contact',
+            name='subject',
+            field=models.CharField(max_length=100, verbose_name='тема'),
+        ),
+        migrations.AddIndex(
+            model_name='contact',
+            index=models.Index(condition=models.Q(is_answered=False), fields=['created'], name='contact_unanswered'),
+        ),
+    ]
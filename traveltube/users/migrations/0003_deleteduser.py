@@ -0,0 +1,27 @@
+# Generated by Django 3.2.25 on 2026-10-19 15:59
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('users', '0002_contact_inbox'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DeletedUser',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='deletion', serialize=False, to=settings.AUTH_USER_MODEL, verbose_name='пользователь')),
+                ('deleted_at', models.DateTimeField(auto_now_add=True, verbose_name='удалён')),
+            ],
+            options={
+                'verbose_name': 'Удалённый пользователь',
+                'verbose_name_plural': 'Удалённые пользователи',
+            },
+        ),
+    ]
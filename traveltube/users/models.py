@@ -1,9 +1,48 @@
+from django.conf import settings
 from django.db import models
+from django.db.models import Q
 
 
 class Contact(models.Model):
-    name = models.CharField(max_length=100)
-    email = models.EmailField()
-    subject = models.CharField(max_length=100)
-    body = models.TextField()
-    is_answered = models.BooleanField(default=False)
+    name = models.CharField('имя', max_length=100)
+    email = models.EmailField('почта')
+    subject = models.CharField('тема', max_length=100)
+    body = models.TextField('сообщение')
+    is_answered = models.BooleanField('есть ответ', default=False)
+    created = models.DateTimeField('получено', auto_now_add=True)
+
+    class Meta:
+        ordering = ('-created',)
+        verbose_name = 'Обращение'
+        verbose_name_plural = 'Обращения'
+        # Входящие без ответа читаются по маленькому частичному индексу,
+        # а не сканированием всех обращений
+        indexes = [models.Index(fields=['created'], name='contact_unanswered',
+                                condition=Q(is_answered=False))]
+
+    def __str__(self):
+        return f'{self.subject} ({self.email})'
+
+
+class DeletedUser(models.Model):
+    """Отметка об удалении пользователя (posts.purge.soft_delete_user).
+
+    Удаление — отдельная строка, а не is_active: пользователь,
+    отключённый по другой причине, не теряет посты, а purge_user
+    вычищает только отмеченных.
+    """
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='deletion',
+        verbose_name='пользователь',
+    )
+    deleted_at = models.DateTimeField('удалён', auto_now_add=True)
+
+    class Meta:
+        verbose_name = 'Удалённый пользователь'
+        verbose_name_plural = 'Удалённые пользователи'
+
+    def __str__(self):
+        return str(self.user_id)
@@ -0,0 +1,43 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from posts.models import Follow, Post
+
+from . import cache
+from .cache import User
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user(sender, instance, **kwargs):
+    # _saved_username запоминает posts.signals.remember_username
+    cache.invalidate(instance.pk, instance.username,
+                     getattr(instance, '_saved_username', None))
+
+
+@receiver(post_save, sender=Post)
+def update_author_snapshot(sender, instance, created, **kwargs):
+    if created:
+        if not instance.is_deleted:
+            cache.post_added(instance.author_id, instance.pk)
+        return
+    # Правка текста не меняет сводку: карточки кешируются по updated
+    saved = getattr(instance, '_saved_state', {})
+    if saved.get('is_deleted', instance.is_deleted) != instance.is_deleted:
+        cache.invalidate(instance.author_id)
+    if saved.get('author_id', instance.author_id) != instance.author_id:
+        cache.invalidate(instance.author_id)
+        cache.invalidate(saved['author_id'])
+
+
+@receiver(post_delete, sender=Post)
+def invalidate_author(sender, instance, **kwargs):
+    if not instance.is_deleted:
+        cache.invalidate(instance.author_id)
+
+
+@receiver(post_save, sender=Follow)
+@receiver(post_delete, sender=Follow)
+def invalidate_follow(sender, instance, **kwargs):
+    cache.invalidate(instance.user_id)
+    cache.invalidate(instance.author_id)
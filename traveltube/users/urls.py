@@ -1,5 +1,6 @@
 from django.contrib.auth.views import LoginView, LogoutView
 from django.urls import path
+from django.views.generic.base import TemplateView
 
 from . import views
 
@@ -17,4 +18,10 @@ urlpatterns = [
         LoginView.as_view(template_name='users/login.html'),
         name='login'
     ),
+    path('contact/', views.ContactView.as_view(), name='contact'),
+    path(
+        'contact/done/',
+        TemplateView.as_view(template_name='users/contact_done.html'),
+        name='contact_done'
+    ),
 ]
@@ -1,12 +1,17 @@
 # Импортируем CreateView, чтобы создать ему наследника
 # Функция reverse_lazy позволяет получить URL по параметрам функции path()
 # Берём, тоже пригодится
+from django.db import transaction
 from django.urls import reverse_lazy
+from django.utils.decorators import method_decorator
 from django.views.generic import CreateView
 from django.views.generic.base import TemplateView
 
+from core.jobs import enqueue
+from core.ratelimit import ratelimit
+
 # Импортируем класс формы, чтобы сослаться на неё во view-классе
-from .forms import CreationForm
+from .forms import ContactForm, CreationForm
 
 
 class SignUp(CreateView):
@@ -16,5 +21,19 @@ class SignUp(CreateView):
     template_name = 'users/signup.html'
 
 
+@method_decorator(ratelimit('contact'), name='dispatch')
+class ContactView(CreateView):
+    form_class = ContactForm
+    success_url = reverse_lazy('users:contact_done')
+    template_name = 'users/contact.html'
+
+    def form_valid(self, form):
+        # Письма отправляет фоновая задача, а не запрос пользователя
+        with transaction.atomic():
+            response = super().form_valid(form)
+            enqueue('contact_received', contact_id=self.object.pk)
+        return response
+
+
 class JustStaticPage(TemplateView):
     template_name = 'about/author.html'